@@ -0,0 +1,71 @@
+"""
+Benchmark: streaming DOCX extraction vs the python-docx object model
+
+Times read_docx_text (one iterparse pass over word/document.xml) against the
+previous python-docx extraction on the same files and reports how much text
+each path recovers:
+
+    python -m benchmarks.bench_docx --sample CVs
+    python -m benchmarks.bench_docx --files 200 --lines 150
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+
+from utils.document_processor import read_docx_text
+from benchmarks.synthetic_cvs import write_docx
+
+def python_docx_text(path: str) -> str:
+    """The former extraction path: paragraphs first, then every table cell"""
+    doc = Document(path)
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                text += cell.text + " "
+            text += "\n"
+    return text.strip()
+
+def time_path(extract, paths) -> tuple:
+    start = time.perf_counter()
+    words = sum(len(extract(path).split()) for path in paths)
+    return time.perf_counter() - start, words
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sample", help="Directory of real CVs (default: synthetic DOCX files)")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=150, help="Text lines per synthetic CV")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.sample:
+            paths = sorted(os.path.join(root, name) for root, _, names in os.walk(args.sample)
+                           for name in names if name.lower().endswith(".docx"))[:args.files]
+        else:
+            paths = [os.path.join(tmp, f"cv_{i:04d}.docx") for i in range(args.files)]
+            for i, path in enumerate(paths):
+                write_docx(path, i, args.lines)
+        if not paths:
+            print(f"No DOCX files found in {args.sample}")
+            return
+
+        baseline, baseline_words = time_path(python_docx_text, paths)
+        streaming, streaming_words = time_path(read_docx_text, paths)
+
+    print(f"{len(paths)} DOCX files")
+    print(f"python-docx {baseline:7.2f}s  {len(paths) / baseline:7.1f} files/s  {baseline_words} words")
+    print(f"iterparse   {streaming:7.2f}s  {len(paths) / streaming:7.1f} files/s  {streaming_words} words  "
+          f"speed-up x{baseline / streaming:.2f}")
+
+if __name__ == "__main__":
+    main()
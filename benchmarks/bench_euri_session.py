@@ -0,0 +1,70 @@
+"""
+Benchmark: per-call latency of EuriClient with a pooled keep-alive session
+versus a fresh connection per call (the old module-level requests.post).
+
+Runs against a local stand-in for the Euriai chat completions endpoint, so no
+API key or network access is needed:
+
+    python -m benchmarks.bench_euri_session --calls 200
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import os
+import time
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Measure round trips to the stand-in server, not the rate limiter or response cache
+os.environ.setdefault("EURI_RPM", "0")
+os.environ.setdefault("LLM_CACHE_DISABLED", "1")
+
+from benchmarks.stand_in_server import StandInServer
+from utils.euri_client import EuriClient
+
+def time_calls(call, calls: int) -> list:
+    """Return per-call latencies in milliseconds"""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def summarize(label: str, latencies: list, connections: int):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<28} mean {statistics.mean(latencies):7.3f} ms   "
+          f"p50 {statistics.median(latencies):7.3f} ms   p95 {p95:7.3f} ms   "
+          f"connections {connections}")
+    return statistics.mean(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="Requests per variant")
+    args = parser.parse_args()
+
+    server = StandInServer([json.dumps({"overall_score": 75})])
+    url = server.url
+    messages = [{"role": "user", "content": "Analyze this CV"}]
+    payload = {"model": "gpt-4.1-nano", "messages": messages, "temperature": 0.1, "max_tokens": 2000}
+    headers = {"Authorization": "Bearer benchmark", "Content-Type": "application/json"}
+
+    fresh = time_calls(lambda: requests.post(url, headers=headers, json=payload, timeout=60).json(), args.calls)
+    fresh_mean = summarize("requests.post (no pooling)", fresh, len(server.connections))
+
+    client = EuriClient(api_key="benchmark", base_url=url)
+    server.reset()
+    pooled = time_calls(lambda: client.chat_completion(messages, temperature=0.1, max_tokens=2000), args.calls)
+    pooled_mean = summarize("EuriClient (pooled session)", pooled, len(server.connections))
+    client.close()
+
+    print(f"\nPer-call latency reduced by {(1 - pooled_mean / fresh_mean) * 100:.1f}% "
+          f"over {args.calls} calls (local loopback; TLS to api.euron.one adds more per handshake)")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
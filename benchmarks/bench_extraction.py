@@ -0,0 +1,55 @@
+"""
+Benchmark: DocumentProcessor.process_directory with 1..N extraction processes
+
+Generates a folder of synthetic PDF/DOCX CVs and times a full directory pass
+for each worker count, checking that every run returns identical results:
+
+    python -m benchmarks.bench_extraction --files 200 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.document_processor import DocumentProcessor
+from utils.extraction_cache import ExtractionCache
+from benchmarks.synthetic_cvs import make_cv_directory
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=150, help="Text lines per CV")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    print(f"CPU cores: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        make_cv_directory(tmp, args.files, args.lines)
+        # Measure parsing, not the extraction cache
+        processor = DocumentProcessor(cache=ExtractionCache(":memory:", 0, enabled=False))
+
+        baseline = None
+        reference = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            results = processor.process_directory(tmp, workers=workers)
+            elapsed = time.perf_counter() - start
+
+            texts = [(r["filename"], r["text"]) for r in results]
+            if reference is None:
+                reference = texts
+            assert texts == reference, "parallel extraction changed results"
+
+            baseline = baseline or elapsed
+            print(f"workers={workers:<3} {elapsed:7.2f}s  {args.files / elapsed:7.1f} files/s  "
+                  f"speed-up x{baseline / elapsed:.2f}")
+
+if __name__ == "__main__":
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
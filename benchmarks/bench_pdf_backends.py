@@ -0,0 +1,63 @@
+"""
+Benchmark: PDF extraction backends on a sample of CVs
+
+Measures pages per second and the empty-text rate of every installed backend
+(PyPDF2, pypdf, PyMuPDF, pdfminer.six), then selects the fastest backend whose
+empty-text rate is within the quality threshold of the best one. With --save
+the choice is stored for PDF_BACKEND=auto:
+
+    python -m benchmarks.bench_pdf_backends --sample CVs --files 50 --save
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pdf_backends import available_backends, benchmark_backends, save_selection, select_backend
+from benchmarks.synthetic_cvs import write_pdf
+
+def sample_pdfs(directory: str, files: int) -> list:
+    paths = sorted(os.path.join(root, name) for root, _, names in os.walk(directory)
+                   for name in names if name.lower().endswith(".pdf"))
+    return random.Random(0).sample(paths, min(files, len(paths)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sample", help="Directory of real CVs (default: synthetic PDFs)")
+    parser.add_argument("--files", type=int, default=50, help="PDFs to sample")
+    parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--max-empty-rate", type=float, default=None,
+                        help="Allowed empty-text rate above the best backend (default PDF_BACKEND_MAX_EMPTY_RATE)")
+    parser.add_argument("--save", action="store_true", help="Store the selection for PDF_BACKEND=auto")
+    args = parser.parse_args()
+
+    print(f"Installed backends: {', '.join(available_backends())}")
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.sample:
+            sample = sample_pdfs(args.sample, args.files)
+        else:
+            sample = [os.path.join(tmp, f"cv_{i:04d}.pdf") for i in range(args.files)]
+            for i, path in enumerate(sample):
+                write_pdf(path, i)
+        if not sample:
+            print(f"No PDFs found in {args.sample}")
+            return
+
+        results = benchmark_backends(sample, max_pages=args.max_pages)
+
+    for row in results:
+        print(f"{row['backend']:<10} {row['pages_per_second']:8.1f} pages/s  "
+              f"empty {row['empty_rate']:6.1%}  errors {row['errors']}")
+    choice = select_backend(results, args.max_empty_rate)
+    print(f"Selected: {choice}")
+    if args.save:
+        print(f"Saved to {save_selection(choice, results)}")
+
+if __name__ == "__main__":
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
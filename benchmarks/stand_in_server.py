@@ -0,0 +1,85 @@
+"""
+Local stand-in for the Euriai chat completions endpoint, shared by the tests
+and benchmarks
+
+The server replays a scripted list of replies (the last one repeats) and
+records requests, client connections and peak concurrency. Callers switch
+off the rate limits and on-disk caches they don't want (EURI_RPM=0,
+LLM_CACHE_DISABLED, ANALYSIS_CACHE_DISABLED) before the first client is built.
+"""
+
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def completion(content: str) -> str:
+    """Chat completions body carrying one message"""
+    return json.dumps({"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, headers, body = self.server.stand_in.next_reply(self.client_address)
+        body = body.encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StandInServer:
+    """
+    Scripted chat completions server on a free local port
+
+    Each reply is either message content (sent as a 200 completion) or a raw
+    (status, headers, body) tuple. delay holds every response open that long.
+    """
+
+    def __init__(self, script=None, delay: float = 0.0):
+        self.script = list(script or ["ok"])
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.reset()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.stand_in = self
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/chat/completions"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.requests = 0
+            self.connections = set()
+            self.in_flight = 0
+            self.peak_in_flight = 0
+
+    def next_reply(self, client_address):
+        with self.lock:
+            reply = self.script[min(self.requests, len(self.script) - 1)]
+            self.requests += 1
+            self.connections.add(client_address)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        if isinstance(reply, str):
+            return 200, {"Content-Type": "application/json"}, completion(reply)
+        return reply
+
+    def shutdown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
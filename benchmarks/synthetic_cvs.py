@@ -0,0 +1,96 @@
+"""
+Synthetic CV documents for the extraction benchmarks and tests
+
+Builds text PDFs (hand-written PDF objects, no extra dependencies) and DOCX
+files (python-docx) with realistic CV-like content.
+"""
+
+import os
+import random
+from typing import List
+
+from docx import Document
+
+WORDS = (
+    "monitoring evaluation learning framework indicators baseline endline survey design data quality "
+    "assessment DHIS2 Stata SPSS R Python Power BI dashboard logframe theory of change community health "
+    "programme management donor reporting USAID DFID capacity building Kenya Uganda impact analysis "
+    "household sampling qualitative quantitative research supervision team leadership stakeholder "
+    "and the with for of in"
+).split()
+
+def cv_lines(seed: int, lines: int) -> List[str]:
+    rng = random.Random(seed)
+    header = [f"Candidate {seed}", "Curriculum Vitae", "Education",
+              f"MSc Statistics, University of Nairobi, {2000 + seed % 20}",
+              "Professional Experience", f"MEL Officer, {2005 + seed % 15} - 2024"]
+    return header + [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(lines)]
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def make_pdf_bytes(lines: List[str], lines_per_page: int = 50) -> bytes:
+    """Minimal multi-page text PDF"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = []  # object bodies; object number = index + 1
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(b"")  # pages tree, filled in below
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_numbers = []
+    for page_lines in pages:
+        text = "BT /F1 10 Tf 50 780 Td 14 TL " + " ".join(f"({_pdf_escape(line)}) '" for line in page_lines) + " ET"
+        stream = text.encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_number = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_number)
+        page_numbers.append(len(objects))
+
+    kids = " ".join(f"{n} 0 R" for n in page_numbers).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_numbers)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+def write_pdf(path: str, seed: int, lines: int = 150) -> None:
+    with open(path, "wb") as f:
+        f.write(make_pdf_bytes(cv_lines(seed, lines)))
+
+def write_docx(path: str, seed: int, lines: int = 150) -> None:
+    """DOCX with a skills table between the header and the experience lines"""
+    doc = Document()
+    text = cv_lines(seed, lines)
+    for line in text[:6]:
+        doc.add_paragraph(line)
+    rng = random.Random(seed)
+    table = doc.add_table(rows=4, cols=2)
+    for row in table.rows:
+        row.cells[0].text = rng.choice(WORDS)
+        row.cells[1].text = rng.choice(["Expert", "Advanced", "Intermediate"])
+    for line in text[6:]:
+        doc.add_paragraph(line)
+    doc.save(path)
+
+def make_cv_directory(directory: str, count: int, lines: int = 150) -> List[str]:
+    """Write count CVs (three PDFs for every DOCX) and return their paths"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(count):
+        if i % 4 == 3:
+            path = os.path.join(directory, f"cv_{i:04d}.docx")
+            write_docx(path, i, lines)
+        else:
+            path = os.path.join(directory, f"cv_{i:04d}.pdf")
+            write_pdf(path, i, lines)
+        paths.append(path)
+    return paths
@@ -158,3 +158,28 @@ SECTOR_KEYWORDS = [
     "health", "education", "agriculture", "governance", "gender", "youth",
     "poverty", "sustainability", "capacity building", "community development"
 ]
+
+COMMUNICATION_KEYWORDS = [
+    "report writing", "reports", "presentation", "presentations", "published", "publication", "publications",
+    "journal", "communication", "communications", "facilitated", "facilitation", "workshop", "workshops",
+    "training", "trained", "dissemination", "policy brief", "stakeholder", "writing"
+]
+
+REGIONAL_KEYWORDS = [
+    "east africa", "kenya", "uganda", "tanzania", "rwanda", "burundi", "ethiopia", "somalia",
+    "south sudan", "nairobi", "kampala", "dar es salaam", "kigali", "addis ababa", "africa",
+    "sub-saharan africa", "malawi", "zambia", "mozambique"
+]
+
+LEADERSHIP_KEYWORDS = [
+    "led", "lead", "managed", "manager", "supervised", "supervisor", "head of", "director", "team leader",
+    "coordinated", "coordinator", "mentored", "oversaw", "line management", "chief", "principal"
+]
+
+# Highest degree mentioned -> education points (0-30, as in the scoring guide)
+DEGREE_LEVELS = {
+    "phd": 28, "doctorate": 28, "doctoral": 28, "dphil": 28,
+    "master": 22, "masters": 22, "msc": 22, "ma": 22, "mba": 22, "mph": 22, "mphil": 22,
+    "bachelor": 14, "bachelors": 14, "bsc": 14, "ba": 14, "degree": 12,
+    "diploma": 8, "certificate": 6
+}
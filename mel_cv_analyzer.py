@@ -17,6 +17,12 @@ from utils.flexible_analyzer import FlexibleCVAnalyzer, FlexibleAnalysisResult
 from utils.report_generator import ReportGenerator
 from utils.living_goods_branding import LivingGoodsBranding
 from utils.results_table import ResultsTable
+from utils.job_journal import JobJournal, job_name_for
+from utils.admission import admit_documents
+from utils.dedup import dedupe_documents, fan_out
+from utils.keyword_screen import KEYWORD_TOP_K, prescreen_documents
+from utils.local_scorer import LOCAL_PROVIDER
+from utils.cv_index import CV_INDEX_SHORTLIST, get_cv_index
 
 # Page configuration - Living Goods Brand Compliant
 st.set_page_config(
@@ -35,7 +41,8 @@ class MELCVAnalysisSystem:
     """Professional MEL CV Analysis System"""
     
     def __init__(self, euriai_api_key: str = "", groq_api_key: str = ""):
-        self.processor = DocumentProcessor()
+        # CVs processed here join the searchable pool used by Custom Job Analysis
+        self.processor = DocumentProcessor(index=get_cv_index())
         self.analyzer = ProfessionalCVAnalyzer(euriai_api_key, groq_api_key)
         self.report_generator = ReportGenerator()
         self.results_dir = "results"
@@ -43,8 +50,9 @@ class MELCVAnalysisSystem:
         # Create results directory
         os.makedirs(self.results_dir, exist_ok=True)
     
-    def process_and_analyze_cvs(self, cv_directory: str = "CVs", batch_size: int = 50) -> List[CVAnalysisResult]:
-        """Complete CV processing and analysis pipeline"""
+    def process_and_analyze_cvs(self, cv_directory: str = "CVs", batch_size: int = 50,
+                                resume: bool = True, top_k: int = 0) -> List[CVAnalysisResult]:
+        """Complete CV processing and analysis pipeline (journaled; resumes previous runs by default)"""
         
         # Apply Living Goods branding
         LivingGoodsBranding.apply_branding()
@@ -76,25 +84,45 @@ class MELCVAnalysisSystem:
         if stats['errors'] > 0:
             st.warning(f"⚠️ {stats['errors']} files had processing errors")
         
-        # Filter valid CVs
-        valid_cvs = [cv for cv in cv_data if not cv.get('error') and cv.get('text')]
+        # Filter valid CVs; unusable documents are held back for manual review
+        valid_cvs, review = admit_documents(cv_data)
+        show_review_bucket(review)
+        # Repeat submissions are analyzed once and share the result
+        valid_cvs, duplicates = dedupe_documents(valid_cvs)
+        # Optional local keyword ranking; only the top K go to the AI
+        valid_cvs, ranking = prescreen_documents(valid_cvs, top_k=top_k)
+        show_keyword_ranking(ranking)
         
         if not valid_cvs:
             st.error("❌ No valid CV files found for analysis")
             return []
         
         st.success(f"✅ {len(valid_cvs)} CVs ready for AI analysis")
+        if duplicates:
+            st.info(f"🔁 {len(duplicates)} repeat submissions will share their original's analysis")
         
         # Step 2: AI Analysis
         LivingGoodsBranding.create_accent_divider()
         st.header("🤖 Step 2: AI Analysis")
         
-        # Progress tracking
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        # Run analysis
-        results = asyncio.run(self._analyze_with_progress(valid_cvs, progress_bar, status_text))
+        # Every finished CV is journaled so an interrupted run can resume
+        with JobJournal(job_name_for(cv_directory), CVAnalysisResult) as journal:
+            if not resume:
+                journal.reset()
+            pending = journal.pending(valid_cvs)
+            if len(pending) < len(valid_cvs):
+                st.info(f"♻️ Resuming: {len(valid_cvs) - len(pending)} CVs already analyzed, {len(pending)} remaining")
+            
+            # Progress tracking
+            progress_bar = st.progress(0)
+            status_text = st.empty()
+            
+            # Run analysis
+            if pending:
+                asyncio.run(self._analyze_with_progress(pending, progress_bar, status_text, journal))
+            else:
+                progress_bar.progress(1.0)
+            results = fan_out(journal.analyzed(valid_cvs), duplicates)
         
         if not results:
             st.error("❌ No CVs were successfully analyzed")
@@ -115,37 +143,40 @@ class MELCVAnalysisSystem:
         
         return results
     
-    async def _analyze_with_progress(self, cv_data: List[Dict], progress_bar, status_text) -> List[CVAnalysisResult]:
-        """Analyze CVs with real-time progress updates"""
+    async def _analyze_with_progress(self, cv_data: List[Dict], progress_bar, status_text,
+                                     journal: JobJournal = None) -> List[CVAnalysisResult]:
+        """Analyze CVs concurrently with real-time progress updates"""
         total = len(cv_data)
-        results = []
+        completed = 0
         
         status_text.text("🚀 Starting AI analysis...")
         
-        for i, cv_item in enumerate(cv_data, 1):
-            if cv_item.get("error") or not cv_item.get("text"):
-                continue
-            
-            status_text.text(f"🔍 Analyzing {i}/{total}: {cv_item['filename']}")
-            
-            result = await self.analyzer.analyze_cv(cv_item['text'], cv_item['filename'])
-            
+        def on_result(index: int, cv_item: Dict, result):
+            nonlocal completed
+            completed += 1
+            if journal:
+                journal.record(cv_item, result)
             if result:
-                results.append(result)
-                status_text.text(f"✅ {i}/{total}: {result.filename} - Score: {result.overall_score:.1f} ({result.ai_provider})")
+                status_text.text(f"✅ {completed}/{total}: {result.filename} - Score: {result.overall_score:.1f} ({result.ai_provider})")
             else:
-                status_text.text(f"❌ {i}/{total}: Failed to analyze {cv_item['filename']}")
+                status_text.text(f"❌ {completed}/{total}: Failed to analyze {cv_item['filename']}")
             
             # Update progress
-            progress = i / total
-            progress_bar.progress(progress)
-            
-            # Rate limiting
-            await asyncio.sleep(1)
+            progress_bar.progress(completed / total)
+        
+        results = await self.analyzer.analyze_batch(cv_data, on_result=on_result)
         
         status_text.text(f"🎉 Analysis complete! {len(results)}/{total} CVs analyzed successfully")
         return results
     
+    def rebuild_reports(self, cv_directory: str = "CVs") -> List[CVAnalysisResult]:
+        """Write Excel/JSON reports from the journal of a previous run, without calling the LLM"""
+        with JobJournal(job_name_for(cv_directory), CVAnalysisResult) as journal:
+            results = journal.results()
+        if results:
+            self._save_results(results)
+        return results
+    
     def _save_results(self, results: List[CVAnalysisResult]):
         """Save analysis results"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -347,16 +378,27 @@ def handle_directory_analysis(euriai_key: str, groq_key: str):
     # Initialize the system
     system = MELCVAnalysisSystem(euriai_key, groq_key)
 
+    resume = st.checkbox("♻️ Resume previous run", value=True,
+                         help="Skip CVs already analyzed in an earlier (possibly interrupted) run and retry failed ones")
+    top_k = keyword_prescreen_option()
+
     # Analysis button
     if st.button("🚀 Start Directory Analysis", type="primary"):
         with st.spinner("Analyzing CVs from directory..."):
-            results = system.process_and_analyze_cvs()
+            results = system.process_and_analyze_cvs(resume=resume, top_k=top_k)
 
         if results:
             display_analysis_results(results, "MEL Manager Analysis")
         else:
             st.error("❌ No CVs were successfully analyzed. Please check your files and API keys.")
 
+    if st.button("📒 Rebuild Reports from Last Run"):
+        results = system.rebuild_reports()
+        if results:
+            display_analysis_results(results, "MEL Manager Analysis")
+        else:
+            st.warning("No journaled results found for the CVs directory.")
+
 def handle_upload_analysis(euriai_key: str, groq_key: str):
     """Handle uploaded CV analysis"""
     LivingGoodsBranding.create_branded_header(
@@ -374,17 +416,31 @@ def handle_upload_analysis(euriai_key: str, groq_key: str):
 
     if uploaded_files:
         st.success(f"✅ {len(uploaded_files)} file(s) uploaded successfully")
+        top_k = keyword_prescreen_option()
 
         if st.button("🚀 Analyze Uploaded CVs", type="primary"):
             with st.spinner("Processing uploaded files..."):
                 # Process uploaded files
-                processor = DocumentProcessor()
-                cv_data = processor.process_uploaded_files(uploaded_files)
+                processor = DocumentProcessor(index=get_cv_index())
+                cv_data, review = admit_documents(processor.process_uploaded_files(uploaded_files))
+                show_review_bucket(review)
+                cv_data, duplicates = dedupe_documents(cv_data)
+                cv_data, ranking = prescreen_documents(cv_data, top_k=top_k)
+                show_keyword_ranking(ranking)
 
                 if cv_data:
                     # Analyze with MEL criteria
                     analyzer = ProfessionalCVAnalyzer(euriai_api_key=euriai_key, groq_api_key=groq_key)
-                    results = analyzer.batch_analyze(cv_data)
+                    progress_bar = st.progress(0)
+                    analyzed = []
+
+                    def on_progress(completed: int, total: int, cv: Dict, result):
+                        if result:
+                            analyzed.append((cv, result))
+                        progress_bar.progress(completed / total)
+
+                    analyzer.batch_analyze(cv_data, progress_callback=on_progress)
+                    results = fan_out(analyzed, duplicates)
 
                     if results:
                         display_analysis_results(results, "Uploaded CV Analysis")
@@ -406,7 +462,7 @@ def handle_custom_job_analysis(euriai_key: str, groq_key: str):
         <h4 style="color: #005084; margin-bottom: 1rem;">📋 How it works:</h4>
         <ol style="margin: 0;">
             <li><strong>Step 1:</strong> Paste the complete job description below</li>
-            <li><strong>Step 2:</strong> Upload CV files (PDF, DOCX, DOC, or ZIP)</li>
+            <li><strong>Step 2:</strong> Upload CV files (PDF, DOCX, DOC, or ZIP) or search the CV pool</li>
             <li><strong>Step 3:</strong> AI analyzes CVs specifically against your job requirements</li>
             <li><strong>Step 4:</strong> Get role-specific rankings and insights</li>
         </ol>
@@ -628,8 +684,19 @@ Examples work for:
 
         LivingGoodsBranding.create_accent_divider()
 
-        # CV upload
-        st.subheader("📤 Step 2: Upload CVs")
+        # CVs: a new upload, or candidates already extracted in earlier sessions
+        st.subheader("📤 Step 2: Choose CVs")
+        cv_source = st.radio(
+            "Where should the candidates come from?",
+            ["📤 Upload CVs", "🗂️ Search the CV pool"],
+            horizontal=True,
+            help="The CV pool holds every CV extracted before; a job description search needs no uploads or API calls"
+        )
+
+        if cv_source == "🗂️ Search the CV pool":
+            handle_pool_search(job_description, euriai_key, groq_key)
+            return
+
         uploaded_files = st.file_uploader(
             "Upload CV files for this specific role",
             type=['pdf', 'docx', 'doc', 'zip'],
@@ -661,31 +728,13 @@ Examples work for:
             if st.button("🚀 Analyze CVs Against This Job Description", type="primary", help="Start role-specific CV analysis"):
                 with st.spinner("🤖 AI is analyzing CVs against your job description..."):
                     # Process uploaded files
-                    processor = DocumentProcessor()
-                    cv_data = processor.process_uploaded_files(uploaded_files)
+                    processor = DocumentProcessor(index=get_cv_index())
+                    cv_data, review = admit_documents(processor.process_uploaded_files(uploaded_files))
+                    show_review_bucket(review)
+                    cv_data, duplicates = dedupe_documents(cv_data)
 
                     if cv_data:
-                        # Show processing progress
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-
-                        # Analyze with custom job description
-                        analyzer = FlexibleCVAnalyzer(euriai_api_key=euriai_key, groq_api_key=groq_key)
-
-                        # Update progress
-                        progress_bar.progress(25)
-                        status_text.text("🔍 Initializing AI analysis...")
-
-                        results = analyzer.batch_analyze(cv_data, job_description)
-
-                        progress_bar.progress(100)
-                        status_text.text("✅ Analysis complete!")
-
-                        if results:
-                            st.balloons()
-                            display_analysis_results(results, "Custom Job Analysis", job_description)
-                        else:
-                            st.error("❌ Analysis failed. Please check your API keys.")
+                        run_custom_analysis(cv_data, duplicates, job_description, euriai_key, groq_key)
                     else:
                         st.error("❌ No valid CVs found in uploaded files.")
     else:
@@ -734,6 +783,102 @@ Examples work for:
             ```
             """)
 
+def handle_pool_search(job_description: str, euriai_key: str, groq_key: str):
+    """Shortlist previously extracted CVs for a job description (BM25, local) and analyze the shortlist"""
+    index = get_cv_index()
+    pool_size = len(index)
+    if not pool_size:
+        st.info("🗂️ The CV pool is empty. CVs are added automatically whenever they are uploaded or processed.")
+        return
+
+    limit = int(st.number_input("Shortlist size", min_value=1, max_value=pool_size,
+                                value=min(CV_INDEX_SHORTLIST, pool_size),
+                                help="Number of best-matching candidates sent to the AI for full analysis"))
+    shortlist = index.search(job_description, limit=limit)
+    if not shortlist:
+        st.warning("No CVs in the pool share any terms with this job description.")
+        return
+
+    st.success(f"🔎 {len(shortlist)} best matches from a pool of {pool_size} CVs")
+    st.dataframe(pd.DataFrame([
+        {"CV": cv["filename"], "Match Score": cv["bm25_score"], "Words": cv["word_count"]} for cv in shortlist
+    ]), use_container_width=True)
+
+    with st.expander("🗂️ Manage the CV pool"):
+        documents = index.documents()
+        selected = st.multiselect("Remove CVs from the pool", sorted({doc["filename"] for doc in documents}))
+        if st.button("Remove Selected CVs", disabled=not selected):
+            removed = sum(index.remove(filename) for filename in selected)
+            st.success(f"Removed {removed} CV(s) from the pool")
+            st.rerun()
+        st.caption(f"CVs not seen for {index.max_age_days:g} days are dropped automatically; "
+                   f"the pool keeps at most {index.max_docs or 'unlimited'} CVs.")
+
+    if st.button("🚀 Analyze Shortlist Against This Job Description", type="primary"):
+        with st.spinner("🤖 AI is analyzing the shortlisted CVs..."):
+            cv_data, review = admit_documents(shortlist)
+            show_review_bucket(review)
+            cv_data, duplicates = dedupe_documents(cv_data)
+            run_custom_analysis(cv_data, duplicates, job_description, euriai_key, groq_key)
+
+def run_custom_analysis(cv_data: List[Dict], duplicates: List, job_description: str, euriai_key: str, groq_key: str):
+    """Analyze CVs against a job description with live progress, then show the results"""
+    # Show processing progress
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    partial_table = st.empty()
+    status_text.text("🔍 Initializing AI analysis...")
+
+    # Analyze with custom job description
+    analyzer = FlexibleCVAnalyzer(euriai_api_key=euriai_key, groq_api_key=groq_key)
+    analyzed = []
+
+    def on_progress(completed: int, total: int, cv: Dict, result):
+        # Runs in this script thread, so Streamlit updates are safe
+        if result:
+            analyzed.append((cv, result))
+        progress_bar.progress(completed / total)
+        status_text.text(f"🔍 Analyzed {completed}/{total}: {cv['filename']}")
+        leaders = sorted((r for _, r in analyzed), key=lambda r: r.overall_score, reverse=True)
+        partial_table.dataframe(pd.DataFrame([
+            {"CV": r.filename, "Score": r.overall_score, "Tier": r.tier} for r in leaders
+        ]), use_container_width=True)
+
+    analyzer.batch_analyze(cv_data, job_description, progress_callback=on_progress)
+    results = fan_out(analyzed, duplicates)
+
+    progress_bar.progress(1.0)
+    status_text.text("✅ Analysis complete!")
+    partial_table.empty()
+
+    if results:
+        st.balloons()
+        display_analysis_results(results, "Custom Job Analysis", job_description)
+    else:
+        st.error("❌ Analysis failed. Please check your API keys.")
+
+def keyword_prescreen_option() -> int:
+    """Top-K input for the two-stage MEL screening mode (0 sends every CV to the AI)"""
+    return int(st.number_input(
+        "🔎 Keyword pre-screen: analyze only the top K CVs (0 = all)",
+        min_value=0, value=KEYWORD_TOP_K, step=10,
+        help="CVs are first ranked locally by MEL education, experience, technical and sector keywords; "
+             "only the best K are sent to the AI providers"
+    ))
+
+def show_keyword_ranking(ranking: List[Dict]):
+    """Provisional keyword ranking, including CVs the pre-screen kept from the AI"""
+    if ranking:
+        shortlisted = sum(row["shortlisted"] for row in ranking)
+        with st.expander(f"🔎 Keyword pre-screen: {shortlisted} of {len(ranking)} CVs sent for AI analysis"):
+            st.dataframe(pd.DataFrame(ranking), use_container_width=True)
+
+def show_review_bucket(review: List[Dict]):
+    """List documents that admission control kept away from the AI providers"""
+    if review:
+        with st.expander(f"📋 {len(review)} document(s) need manual review (not sent for AI analysis)"):
+            st.dataframe(pd.DataFrame(review), use_container_width=True)
+
 def display_analysis_results(results: List, analysis_type: str, job_description: str = None):
     """Display comprehensive analysis results with filtering and export"""
 
@@ -747,6 +892,10 @@ def display_analysis_results(results: List, analysis_type: str, job_description:
         """, unsafe_allow_html=True)
 
     st.success(f"✅ {analysis_type} complete! Analyzed {len(results)} CVs")
+    local = sum(1 for result in results if result.provider_used == LOCAL_PROVIDER)
+    if local:
+        st.warning(f"🧮 {local} CV(s) were scored locally from keywords because no AI provider answered. "
+                   "These scores are provisional; analyze again once the providers are back.")
 
     # Analysis method confirmation
     if job_description:
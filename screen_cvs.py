@@ -0,0 +1,275 @@
+"""
+Headless batch CV screening
+
+Runs extraction and AI analysis from the command line, without Streamlit.
+Results are journaled as they complete, so an interrupted run resumes where
+it stopped when started again with the same CVs (and job description).
+
+    python screen_cvs.py CVs
+    python screen_cvs.py cvs.zip --jd job_description.txt --workers 8 --output results
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+import zipfile
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+import pandas as pd
+
+from utils.document_processor import DocumentProcessor, ZipLimitError
+from utils.ai_analyzer_clean import ProfessionalCVAnalyzer, CVAnalysisResult
+from utils.flexible_analyzer import FlexibleCVAnalyzer, FlexibleAnalysisResult
+from utils.job_journal import JobJournal, content_key, job_name_for
+from utils.admission import ADMISSION_ENABLED, AdmissionControl, review_item
+from utils.dedup import DEDUP_ENABLED, DuplicateIndex, document_key, fan_out
+from utils.cv_index import get_cv_index
+from utils.keyword_screen import KEYWORD_MIN_SCORE, KEYWORD_TOP_K, KeywordPrescreen
+from utils.local_scorer import LOCAL_PROVIDER
+from utils.results_table import ResultsTable
+
+logger = logging.getLogger(__name__)
+
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+def load_job_description(path: str, processor: DocumentProcessor) -> str:
+    """Read a JD from .txt/.md, or extract it from .pdf/.docx"""
+    if os.path.splitext(path)[1].lower() in processor.supported_formats:
+        result = processor.process_single_file(path, index=False)
+        if result.get("error") or not result["text"]:
+            raise ValueError(f"Could not extract job description from {path}")
+        return result["text"]
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def extract_cvs(source: str, processor: DocumentProcessor) -> Iterator[Dict]:
+    """Stream extracted CVs from a directory or zip archive"""
+    if source.lower().endswith(".zip"):
+        return processor.iter_zip(source)
+    return processor.iter_directory(source)
+
+def count_cvs(source: str, processor: DocumentProcessor) -> int:
+    """Number of supported files (for the ETA), without parsing them"""
+    if source.lower().endswith(".zip"):
+        with zipfile.ZipFile(source) as archive:
+            return len(processor.list_zip_members(archive))
+    return len(processor.list_files(source))
+
+def write_reports(results: List, output_dir: str, prefix: str) -> List[str]:
+    """Write ranked Excel and JSON reports; returns the file paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    ranked = sorted(results, key=lambda r: r.overall_score, reverse=True)
+
+    excel_path = os.path.join(output_dir, f"{prefix}_{timestamp}.xlsx")
+    ResultsTable().create_results_dataframe(ranked).to_excel(excel_path, index=False)
+
+    json_path = os.path.join(output_dir, f"{prefix}_{timestamp}.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump([asdict(r) for r in ranked], f, indent=2, ensure_ascii=False)
+    return [excel_path, json_path]
+
+def write_review(review: List[Dict], output_dir: str, prefix: str) -> str:
+    """CSV of the documents held back by admission control"""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"review_{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    pd.DataFrame(review).to_csv(path, index=False)
+    return path
+
+def write_ranking(ranking: List[Dict], output_dir: str, prefix: str) -> str:
+    """CSV of the provisional keyword ranking, including CVs not sent to the AI"""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"keyword_ranking_{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    pd.DataFrame(ranking).to_csv(path, index=False)
+    return path
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Screen a directory or zip of CVs without the web app")
+    parser.add_argument("source", help="CV directory or .zip archive")
+    parser.add_argument("--jd", help="Job description file (.txt, .md, .pdf, .docx); default: MEL Manager criteria")
+    parser.add_argument("--output", default=os.getenv("RESULTS_DIRECTORY", "results"), help="Output directory")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("MAX_CONCURRENT_REQUESTS", "5")),
+                        help="Concurrent analysis requests")
+    parser.add_argument("--extract-workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes used to extract text from CVs")
+    parser.add_argument("--max-chars", type=int, default=None,
+                        help="Stop extracting each CV after this many characters (e.g. 3000, the analyzer's cut)")
+    parser.add_argument("--max-pages", type=int, default=None, help="Pages read per PDF (default: PDF_MAX_PAGES)")
+    parser.add_argument("--no-admission", action="store_true",
+                        help="Send every extracted document to the AI, skipping the local admission checks")
+    parser.add_argument("--top-k", type=int, default=KEYWORD_TOP_K,
+                        help="Rank CVs by MEL keywords locally and send only the best K to the AI (0 = all)")
+    parser.add_argument("--min-keyword-score", type=float, default=KEYWORD_MIN_SCORE,
+                        help="Send only CVs with at least this local keyword score (0-100) to the AI")
+    parser.add_argument("--index-pool", action="store_true",
+                        help="Add the extracted CVs to the searchable CV pool used by Custom Job Analysis")
+    parser.add_argument("--fresh", action="store_true", help="Ignore (and discard) the journal of a previous run")
+    parser.add_argument("--report-only", action="store_true", help="Rebuild reports from the journal without analyzing")
+    parser.add_argument("--euriai-key", default=os.getenv("EURI_API_KEY", ""), help="Euriai API key")
+    parser.add_argument("--groq-key", default=os.getenv("GROQ_API_KEY", ""), help="Groq API key")
+    parser.add_argument("--verbose", action="store_true", help="Show analyzer logging")
+    args = parser.parse_args(argv)
+    if args.jd and (args.top_k or args.min_keyword_score):
+        parser.error("the keyword pre-screen uses the MEL Manager keyword lists and cannot be combined with --jd")
+    return args
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(argv)
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+
+    if not os.path.exists(args.source):
+        print(f"❌ Not found: {args.source}")
+        return 1
+
+    processor = DocumentProcessor(workers=args.extract_workers, max_chars=args.max_chars, max_pages=args.max_pages,
+                                  index=get_cv_index() if args.index_pool else None)
+    job_description = load_job_description(args.jd, processor) if args.jd else None
+    if job_description:
+        kind = f"jd_{hashlib.sha256(job_description.encode('utf-8')).hexdigest()[:8]}"
+        result_type, prefix = FlexibleAnalysisResult, "custom_job_analysis"
+    else:
+        kind, result_type, prefix = "mel", CVAnalysisResult, "mel_cv_analysis"
+
+    start = time.time()
+    try:
+        total = count_cvs(args.source, processor)
+    except (zipfile.BadZipFile, ZipLimitError) as e:
+        print(f"❌ Cannot read {args.source}: {str(e)}")
+        return 1
+    counts = {"skipped": 0, "resumed": 0, "failed": 0, "analyzed": 0, "local": 0}
+    extracted = []  # filename + content key of every CV sent for analysis, in extraction order
+    # Scanned pages, cover letters and placeholders go to review instead of the AI
+    admission = AdmissionControl() if ADMISSION_ENABLED and not args.no_admission else None
+    review = []
+    # Repeat submissions are analyzed once; their copies reuse the representative's result
+    dedup = DuplicateIndex() if DEDUP_ENABLED else None
+    representatives = {}  # dedup key -> representative filename and path
+    duplicates = []       # (duplicate, representative) filenames and paths
+    # Optional two-stage mode: a local keyword ranking decides which CVs reach the AI
+    prescreen = KeywordPrescreen(args.top_k, args.min_keyword_score)
+
+    with JobJournal(job_name_for(args.source, kind), result_type, os.path.join(args.output, "jobs")) as journal:
+        if args.fresh:
+            journal.reset()
+
+        def admitted_documents() -> Iterator[Dict]:
+            """Usable, admitted, first-seen CVs"""
+            for cv in extract_cvs(args.source, processor):
+                if cv.get("error") or not cv.get("text"):
+                    counts["skipped"] += 1
+                    continue
+                if admission:
+                    decision = admission.check(cv)
+                    if not decision.admitted:
+                        review.append(review_item(cv, decision))
+                        continue
+                if dedup:
+                    key = document_key(cv)
+                    representative = dedup.add(key, cv["text"])
+                    if representative is not None:
+                        duplicates.append(({"filename": cv["filename"], "file_path": cv.get("file_path")},
+                                           representatives[representative]))
+                        continue
+                    representatives[key] = {"filename": cv["filename"], "file_path": cv.get("file_path")}
+                yield cv
+
+        def pending_documents() -> Iterator[Dict]:
+            """Extracted CVs still needing analysis; parsing runs ahead of the analyzers"""
+            documents = admitted_documents()
+            if prescreen.enabled:
+                # With --top-k nothing is analyzed until every CV has been ranked
+                documents = prescreen.filter(documents)
+            for cv in documents:
+                extracted.append({"filename": cv["filename"], "file_path": cv.get("file_path"),
+                                  "content_key": content_key(cv)})
+                if journal.is_done(cv):
+                    counts["resumed"] += 1
+                    continue
+                if not args.report_only:
+                    yield cv
+
+        if args.report_only:
+            for _ in pending_documents():
+                pass
+        else:
+            if job_description:
+                analyzer = FlexibleCVAnalyzer(euriai_api_key=args.euriai_key, groq_api_key=args.groq_key)
+                stream = analyzer.stream_analyze(pending_documents(), job_description, max_workers=args.workers)
+            else:
+                analyzer = ProfessionalCVAnalyzer(euriai_api_key=args.euriai_key, groq_api_key=args.groq_key)
+                stream = analyzer.stream_analyze(pending_documents(), max_workers=args.workers)
+
+            # Extraction and analysis overlap: CVs are analyzed while later files are still being parsed
+            print(f"🤖 Screening {total} CVs from {args.source} with {args.workers} analysis workers ...")
+            for completed, (cv, result) in enumerate(stream, 1):
+                # The flexible analyzer returns a placeholder when every provider failed
+                # and the local scorer is off
+                if result is not None and getattr(result, "provider_used", None) == "Fallback":
+                    result = None
+                journal.record(cv, result)
+                counts["analyzed" if result else "failed"] += 1
+                if result is not None and result.provider_used == LOCAL_PROVIDER:
+                    counts["local"] += 1
+
+                elapsed = time.time() - start
+                rate = completed / elapsed if elapsed else 0.0
+                screened_out = sum(not row["shortlisted"] for row in prescreen.ranking)
+                remaining = max(0, total - counts["skipped"] - len(review) - len(duplicates) - screened_out
+                                - counts["resumed"] - completed)
+                eta = remaining / rate if rate else 0.0
+                outcome = f"{result.overall_score:.1f}" if result else "FAILED"
+                if result is not None and result.provider_used == LOCAL_PROVIDER:
+                    outcome += " (local)"
+                print(f"   [{completed}/{completed + remaining}] {cv['filename']}: {outcome} | "
+                      f"{rate * 60:.1f} CVs/min | ETA {format_duration(eta)}")
+
+        if prescreen.enabled:
+            # Copies of CVs that were not shortlisted are not analyzed either
+            shortlisted = {document_key(cv) for cv in extracted}
+            duplicates = [(cv, rep) for cv, rep in duplicates if document_key(rep) in shortlisted]
+        results = fan_out(journal.analyzed(extracted), duplicates)
+
+    cache_stats = processor.cache.stats()
+    print(f"📁 {total - counts['skipped']}/{total} files extracted, {counts['skipped']} unusable "
+          f"(extraction cache hit rate {cache_stats['hit_rate']:.0%})")
+    if counts["resumed"]:
+        print(f"♻️ {counts['resumed']} CVs already analyzed in a previous run")
+    if duplicates:
+        print(f"🔁 {len(duplicates)} repeat submissions share their original's analysis")
+    if prescreen.enabled:
+        ranking = prescreen.ranked()
+        print(f"🔎 Keyword pre-screen sent {len(extracted)}/{len(ranking)} CVs to the AI: "
+              f"{write_ranking(ranking, args.output, prefix)}")
+    if counts["local"]:
+        print(f"🧮 {counts['local']} CVs were scored locally because no AI provider answered; "
+              f"the next run retries them")
+    if review:
+        print(f"📋 {len(review)} documents need manual review: {write_review(review, args.output, prefix)}")
+
+    # Step 3: reports
+    if not results:
+        print("❌ No CVs were successfully analyzed")
+        return 1
+    paths = write_reports(results, args.output, prefix)
+
+    elapsed = time.time() - start
+    print(f"🎉 {len(results)}/{len(extracted) + len(duplicates)} CVs analyzed ({counts['resumed']} resumed, "
+          f"{counts['failed']} failed this run) in {format_duration(elapsed)}")
+    attempted = counts["analyzed"] + counts["failed"]
+    if attempted:
+        print(f"📊 Throughput: {attempted / elapsed * 60:.1f} CVs/min")
+    for path in paths:
+        print(f"   - {path}")
+    return 0 if not counts["failed"] else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
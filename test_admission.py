@@ -0,0 +1,34 @@
+"""
+Tests for pre-LLM admission control
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.admission import AdmissionControl
+from benchmarks.synthetic_cvs import cv_lines
+
+def test_unusable_documents_go_to_review():
+    """Placeholders, scans, cover letters and foreign-language text are held back"""
+    cv_text = "\n".join(cv_lines(1, 40))
+    documents = [
+        {"filename": "cv.pdf", "text": cv_text},
+        {"filename": "old.doc", "text": "[DOC file - manual processing required: CVs/old.doc]"},
+        {"filename": "scan.pdf", "text": "|| ~ . ,, 1 l |  ' ."},
+        {"filename": "letter.pdf", "text": "Dear Hiring Manager, I am writing to apply for the role. " * 10
+                                           + "Yours sincerely, A. Candidate"},
+        {"filename": "cv_ar.pdf", "text": "خبرة في الرصد والتقييم وتحليل البيانات " * 30},
+    ]
+    admitted, review = AdmissionControl().split(documents)
+
+    assert [cv["filename"] for cv in admitted] == ["cv.pdf"]
+    reasons = {item["filename"]: item["reasons"] for item in review}
+    assert "manual conversion" in reasons["old.doc"]
+    assert "too little text" in reasons["scan.pdf"]
+    assert "cover letter" in reasons["letter.pdf"]
+    assert "not in English" in reasons["cv_ar.pdf"]
+
+if __name__ == "__main__":
+    test_unusable_documents_go_to_review()
+    print("🎉 All admission tests passed!")
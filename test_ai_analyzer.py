@@ -0,0 +1,188 @@
+"""
+Tests for ProfessionalCVAnalyzer batch behaviour against a local stand-in Euriai server
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# The stand-in server needs no rate limit, and repeated prompts must reach it rather than the caches
+os.environ.setdefault("EURI_RPM", "0")
+os.environ.setdefault("LLM_CACHE_DISABLED", "1")
+os.environ.setdefault("ANALYSIS_CACHE_DISABLED", "1")
+
+from benchmarks.stand_in_server import StandInServer
+from utils.ai_analyzer_clean import ProfessionalCVAnalyzer
+from utils.analysis_cache import AnalysisCache
+from utils.response_cache import ResponseCache
+from utils.batch_runner import CancellationToken, iter_concurrent
+from utils.pipeline import run_pipeline
+
+ANALYSIS = {
+    "overall_score": 78.0,
+    "category_scores": {"education": 24, "experience": 25},
+    "ranking_tier": "Good"
+}
+
+def start_server() -> StandInServer:
+    """Stand-in that answers every request with ANALYSIS after 0.2s"""
+    return StandInServer([json.dumps(ANALYSIS)], delay=0.2)
+
+def make_analyzer(url: str, cache: AnalysisCache = None) -> ProfessionalCVAnalyzer:
+    os.environ["EURI_BASE_URL"] = url
+    try:
+        analyzer = ProfessionalCVAnalyzer(euriai_api_key="test", cache=cache)
+    finally:
+        del os.environ["EURI_BASE_URL"]
+    # Let the background health probe finish so it does not overlap the batch
+    analyzer.euriai_client.test_connection(timeout=5)
+    return analyzer
+
+def sample_cvs(count: int):
+    return [{"filename": f"cv_{i}.pdf", "text": f"Candidate {i} MEL experience"} for i in range(count)]
+
+def test_analyze_batch_runs_concurrently():
+    """Requests overlap up to max_concurrency and results keep input order"""
+    with start_server() as server:
+        analyzer = make_analyzer(server.url)
+        server.reset()
+        completed = []
+
+        start = time.time()
+        results = asyncio.run(analyzer.analyze_batch(
+            sample_cvs(10), max_concurrency=5,
+            on_result=lambda index, cv, result: completed.append(index)
+        ))
+        elapsed = time.time() - start
+
+        assert [r.filename for r in results] == [f"cv_{i}.pdf" for i in range(10)]
+        assert all(r.ai_provider == "Euriai" for r in results)
+        assert sorted(completed) == list(range(10))
+        assert server.peak_in_flight == 5
+        # Two waves of 0.2s rather than ten sequential calls
+        assert elapsed < 1.5
+
+def test_analyze_batch_skips_unusable_items():
+    with start_server() as server:
+        analyzer = make_analyzer(server.url)
+        cv_data = sample_cvs(2) + [{"filename": "broken.pdf", "text": "", "error": "Processing error"}]
+        results = asyncio.run(analyzer.analyze_batch(cv_data))
+        assert [r.filename for r in results] == ["cv_0.pdf", "cv_1.pdf"]
+        # The batch's event loop is gone; its connections were closed with it
+        assert not analyzer.euriai_client._async_clients
+
+def test_batch_analyze_threads_keep_order_and_report_progress():
+    """The synchronous batch runs on worker threads and reports progress per CV"""
+    with start_server() as server:
+        analyzer = make_analyzer(server.url)
+        server.reset()
+        progress = []
+        main_thread = threading.current_thread()
+
+        def on_progress(completed, total, cv, result):
+            assert threading.current_thread() is main_thread
+            progress.append((completed, total))
+
+        cv_data = sample_cvs(8) + [{"filename": "broken.pdf", "text": "", "error": "Processing error"}]
+        results = analyzer.batch_analyze(cv_data, max_workers=4, progress_callback=on_progress)
+
+        assert [r.filename for r in results] == [f"cv_{i}.pdf" for i in range(8)]
+        assert progress == [(i, 8) for i in range(1, 9)]
+        assert server.peak_in_flight == 4
+
+def test_cancellation_stops_new_work():
+    token = CancellationToken()
+    started = []
+
+    def work(item):
+        started.append(item)
+        time.sleep(0.05)
+        return item
+
+    seen = []
+    for index, item, result in iter_concurrent(work, list(range(20)), max_workers=2, cancel_token=token):
+        seen.append(result)
+        if len(seen) == 3:
+            token.cancel()
+    assert len(seen) < 20
+    assert len(started) <= len(seen) + 2
+
+def test_analysis_cache_keys_on_content():
+    """A renamed copy of a CV is served from cache; a different model is a miss"""
+    with start_server() as server:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = AnalysisCache(os.path.join(tmp, "analysis.sqlite"), max_bytes=1024 * 1024)
+            analyzer = make_analyzer(server.url, cache)
+            server.reset()
+
+            first = analyzer.analyze_cv_sync("Candidate MEL experience", "original.pdf")
+            again = asyncio.run(analyzer.analyze_cv("Candidate MEL experience", "renamed.pdf"))
+            assert server.requests == 1
+            assert again.filename == "renamed.pdf"
+            assert again.overall_score == first.overall_score
+
+            analyzer.models = ["Euriai:another-model"]
+            analyzer.analyze_cv_sync("Candidate MEL experience", "original.pdf")
+            assert server.requests == 2
+            cache.close()
+
+def test_unusable_replies_are_not_cached():
+    """A refusal is not replayed from the response cache; the next call asks the provider again"""
+    with StandInServer(["Sorry, busy", json.dumps(ANALYSIS)]) as server:
+        with tempfile.TemporaryDirectory() as tmp:
+            analyzer = make_analyzer(server.url)
+            cache = analyzer.euriai_client.cache = ResponseCache(os.path.join(tmp, "responses.sqlite"),
+                                                                  max_bytes=1024 * 1024)
+            server.reset()
+
+            assert analyzer.analyze_cv_sync("Candidate MEL experience", "cv.pdf").ai_provider == "Local"
+            assert cache.stats()["entries"] == 0
+            assert analyzer.analyze_cv_sync("Candidate MEL experience", "cv.pdf").ai_provider == "Euriai"
+            assert server.requests == 2
+
+            # The usable reply is cached, and served from the cache without being written again
+            writes = []
+            put_response = cache.put_response
+            cache.put_response = lambda *args: writes.append(args) or put_response(*args)
+            assert asyncio.run(analyzer.analyze_cv("Candidate MEL experience", "cv.pdf")).ai_provider == "Euriai"
+            assert server.requests == 2 and writes == []
+            cache.close()
+
+def test_pipeline_overlaps_extraction_with_analysis():
+    """Analysis starts before the source is exhausted, and the source is throttled by the queue"""
+    produced = []
+
+    def documents():
+        for i in range(12):
+            produced.append(i)
+            time.sleep(0.01)
+            yield {"filename": f"cv_{i}.pdf", "text": "" if i == 5 else f"CV {i}"}
+
+    def analyze(document):
+        time.sleep(0.05)
+        if document["filename"] == "cv_7.pdf":
+            raise RuntimeError("provider down")
+        return document["text"].upper()
+
+    stream = run_pipeline(documents(), analyze, max_workers=2, queue_size=2)
+    first_document, first_result = next(stream)
+    assert len(produced) < 12
+    results = dict([(first_document["filename"], first_result)] + [(doc["filename"], result) for doc, result in stream])
+
+    assert len(results) == 12
+    assert results["cv_5.pdf"] is None and results["cv_7.pdf"] is None
+    assert results["cv_0.pdf"] == "CV 0"
+
+if __name__ == "__main__":
+    test_analyze_batch_runs_concurrently()
+    test_analyze_batch_skips_unusable_items()
+    test_batch_analyze_threads_keep_order_and_report_progress()
+    test_cancellation_stops_new_work()
+    test_analysis_cache_keys_on_content()
+    test_unusable_replies_are_not_cached()
+    test_pipeline_overlaps_extraction_with_analysis()
+    print("🎉 All analyzer tests passed!")
@@ -0,0 +1,77 @@
+"""
+Tests for the BM25 candidate index
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("EXTRACTION_CACHE_DISABLED", "1")
+
+from docx import Document
+
+from config.job_description import MEL_MANAGER_JOB_DESCRIPTION
+from utils.cv_index import CVIndex
+from utils.document_processor import DocumentProcessor
+from benchmarks.synthetic_cvs import write_docx
+
+ENGINEER_CV = [
+    "Curriculum Vitae", "Senior Software Engineer, 2014 - 2024",
+    "Backend services in Go and Java, Kubernetes clusters on AWS, PostgreSQL and Kafka pipelines.",
+    "Led a team of six engineers building payment APIs; code review, CI/CD and on-call.",
+    "BSc Computer Science, University of Lagos"
+]
+
+def test_extracted_cvs_are_searchable_by_job_description():
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(3):
+            write_docx(os.path.join(tmp, f"mel_{i}.docx"), i, lines=30)
+        engineer = Document()
+        for line in ENGINEER_CV:
+            engineer.add_paragraph(line)
+        engineer.save(os.path.join(tmp, "engineer.docx"))
+
+        index = CVIndex(os.path.join(tmp, "index.sqlite"))
+        processor = DocumentProcessor(workers=1, isolation=False, index=index)
+        processor.process_directory(tmp)
+        # Extracting the same files again does not add them twice
+        processor.process_directory(tmp)
+        assert len(index) == 4
+
+        shortlist = index.search(MEL_MANAGER_JOB_DESCRIPTION, limit=3)
+        assert sorted(cv["filename"] for cv in shortlist) == ["mel_0.docx", "mel_1.docx", "mel_2.docx"]
+        assert shortlist[0]["bm25_score"] >= shortlist[-1]["bm25_score"] > 0
+        assert "Curriculum Vitae" in shortlist[0]["text"]
+
+        job = "Backend Software Engineer: Kubernetes, AWS, Kafka, Go or Java microservices, PostgreSQL"
+        assert index.search(job)[0]["filename"] == "engineer.docx"
+        assert index.search("astrophysics telescope") == []
+
+        # The index persists across sessions
+        assert len(CVIndex(os.path.join(tmp, "index.sqlite"))) == 4
+
+        # Only processors given an index add to the pool
+        DocumentProcessor(workers=1, isolation=False).process_single_file(os.path.join(tmp, "engineer.docx"))
+        assert DocumentProcessor().index is None
+
+def test_pool_is_bounded_and_documents_can_be_removed():
+    index = CVIndex(":memory:", max_docs=3, max_age_days=0)
+    for i in range(5):
+        assert index.add({"filename": f"cv_{i}.pdf", "text": f"Candidate {i} monitoring evaluation"})
+    # The least recently seen CVs are evicted, with their postings
+    assert [doc["filename"] for doc in index.documents()] == ["cv_4.pdf", "cv_3.pdf", "cv_2.pdf"]
+    assert index.conn.execute("SELECT COUNT(DISTINCT doc_id) FROM postings").fetchone()[0] == 3
+
+    assert index.remove("cv_3.pdf") == 1
+    assert [cv["filename"] for cv in index.search("monitoring")] == ["cv_2.pdf", "cv_4.pdf"]
+
+    # CVs not seen within max_age_days are dropped when the index is opened
+    index.conn.execute("UPDATE documents SET added = added - 2 * 86400 WHERE filename = 'cv_2.pdf'")
+    index.max_age_days = 1
+    index.add({"filename": "cv_5.pdf", "text": "Candidate 5 monitoring evaluation"})
+    assert sorted(doc["filename"] for doc in index.documents()) == ["cv_4.pdf", "cv_5.pdf"]
+
+if __name__ == "__main__":
+    test_extracted_cvs_are_searchable_by_job_description()
+    test_pool_is_bounded_and_documents_can_be_removed()
+    print("🎉 All CV index tests passed!")
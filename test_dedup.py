@@ -0,0 +1,51 @@
+"""
+Tests for near-duplicate CV detection
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.ai_analyzer_clean import CVAnalysisResult
+from utils.dedup import dedupe_documents, fan_out
+from benchmarks.synthetic_cvs import cv_lines
+
+def test_repeat_submissions_are_analyzed_once():
+    """Resubmitted and lightly edited copies cluster with the first submission; others stay separate"""
+    original = "\n".join(cv_lines(1, 60))
+    documents = [{"filename": "Abubakar, Abdulmalik - 2025-04-16 12-39-31.pdf", "text": original}]
+    documents += [{"filename": f"cv_{i}.pdf", "text": "\n".join(cv_lines(i, 60))} for i in range(2, 6)]
+    documents.append({"filename": "Abubakar, Abdulmalik - 2025-04-18 09-02-11.pdf", "text": original})
+    documents.append({"filename": "Abubakar, Abdulmalik - 2025-04-20 17-45-03.pdf",
+                      "text": original.replace("Curriculum Vitae", "CV") + "\nReferences available on request"})
+
+    unique, duplicates = dedupe_documents(documents)
+    assert [cv["filename"] for cv in unique] == [cv["filename"] for cv in documents[:5]]
+    assert [(cv["filename"], rep["filename"]) for cv, rep in duplicates] == [
+        (documents[5]["filename"], documents[0]["filename"]),
+        (documents[6]["filename"], documents[0]["filename"]),
+    ]
+
+    result = CVAnalysisResult(documents[0]["filename"], 81.0, {}, [], [], [], {}, "", "", [], "", "Very Good", "Euriai")
+    fanned = fan_out([(documents[0], result)], duplicates)
+    assert [r.filename for r in fanned] == [documents[0]["filename"], documents[5]["filename"], documents[6]["filename"]]
+    assert all(r.duplicate_of == documents[0]["filename"] and r.overall_score == 81.0 for r in fanned[1:])
+
+def test_fan_out_tells_same_named_files_apart():
+    """CVs sharing a filename in different folders each pass on their own result"""
+    first, second = "\n".join(cv_lines(1, 60)), "\n".join(cv_lines(2, 60))
+    documents = [{"filename": "cv.pdf", "file_path": "2024/cv.pdf", "text": first},
+                 {"filename": "cv.pdf", "file_path": "2025/cv.pdf", "text": second},
+                 {"filename": "cv (copy).pdf", "file_path": "2024/cv (copy).pdf", "text": first}]
+    unique, duplicates = dedupe_documents(documents)
+    assert unique == documents[:2] and duplicates == [(documents[2], documents[0])]
+
+    analyzed = [(cv, CVAnalysisResult(cv["filename"], score, {}, [], [], [], {}, "", "", [], "", "Good", "Euriai"))
+                for cv, score in zip(unique, (75.0, 55.0))]
+    copy = fan_out(analyzed, duplicates)[-1]
+    assert (copy.filename, copy.overall_score, copy.duplicate_of) == ("cv (copy).pdf", 75.0, "cv.pdf")
+
+if __name__ == "__main__":
+    test_repeat_submissions_are_analyzed_once()
+    test_fan_out_tells_same_named_files_apart()
+    print("🎉 All dedup tests passed!")
@@ -0,0 +1,263 @@
+"""
+Tests for DocumentProcessor extraction
+"""
+
+import sys
+import os
+import io
+import time
+import zipfile
+import tempfile
+from docx import Document
+from docx.oxml import parse_xml
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Tests that are not about caching should always parse
+os.environ.setdefault("EXTRACTION_CACHE_DISABLED", "1")
+
+from utils import document_processor
+from utils.document_processor import DocumentProcessor
+from utils import extraction_cache
+from utils.extraction_cache import ExtractionCache
+from utils.pdf_backends import BACKENDS, PDFBackend, select_backend
+from utils import isolated_pool
+from utils.isolated_pool import IsolatedPool
+from benchmarks.synthetic_cvs import make_cv_directory, write_pdf
+
+def test_parallel_extraction_matches_sequential():
+    """Process-pool extraction returns the same results in the same order"""
+    with tempfile.TemporaryDirectory() as tmp:
+        make_cv_directory(tmp, 9, lines=20)
+        processor = DocumentProcessor()
+        sequential = processor.process_directory(tmp, workers=1)
+        parallel = processor.process_directory(tmp, workers=3)
+
+        assert len(sequential) == 9
+        assert all(r["word_count"] > 100 and not r.get("error") for r in sequential)
+        assert parallel == sequential
+
+def test_extraction_cache_skips_unchanged_files():
+    """Warm runs come from the cache; renamed copies hit by content, edited files miss"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cv_dir = os.path.join(tmp, "cvs")
+        paths = make_cv_directory(cv_dir, 4, lines=20)
+        cache = ExtractionCache(os.path.join(tmp, "extraction.sqlite"), max_bytes=10 * 1024 * 1024)
+        processor = DocumentProcessor(cache=cache)
+
+        cold = processor.process_directory(cv_dir)
+        warm = processor.process_directory(cv_dir)
+        assert warm == cold
+        assert cache.stats()["fast_hits"] == 4
+
+        os.rename(paths[0], os.path.join(cv_dir, "renamed.pdf"))
+        with open(paths[1], "ab") as f:
+            f.write(b"\n% edited\n")
+        cache.hits = cache.misses = 0
+        processor.process_directory(cv_dir)
+        stats = cache.stats()
+        assert stats["hits"] == 3 and stats["misses"] == 1
+
+        # Text extracted by another PDF backend or extractor version is not reused
+        cache.hits = cache.misses = 0
+        assert cache.get_file(paths[2], "pypdf") is None
+        assert cache.get_file(paths[2], processor.pdf_backend.name) is not None
+        original = extraction_cache.EXTRACTION_SCHEMA_VERSION
+        extraction_cache.EXTRACTION_SCHEMA_VERSION += 1
+        try:
+            assert cache.get_file(paths[2], processor.pdf_backend.name) is None
+        finally:
+            extraction_cache.EXTRACTION_SCHEMA_VERSION = original
+        cache.close()
+
+def test_pdf_extraction_stops_at_page_and_char_limits():
+    """Budgets stop parsing early and are reported in the result metadata"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "long.pdf")
+        write_pdf(path, 1, lines=394)  # 400 lines, 8 pages
+
+        full = DocumentProcessor(max_pages=0).process_single_file(path)
+        assert full["pages"] == 8 and not full["truncated"]
+
+        capped = DocumentProcessor(max_pages=2).process_single_file(path)
+        assert capped["pages"] == 2 and capped["truncated"]
+        assert full["text"].startswith(capped["text"])
+
+        budget = DocumentProcessor(max_pages=0, max_chars=3000).process_single_file(path)
+        assert budget["char_count"] == 3000 and budget["truncated"]
+        assert budget["pages"] < 8
+        assert budget["text"] == full["text"][:3000]
+
+class BlankBackend(PDFBackend):
+    """Backend that finds no text, like PyPDF2 on some layouts"""
+    name = "blank"
+
+    def available(self) -> bool:
+        return True
+
+    def pages(self, source):
+        return 1, iter([""])
+
+def test_empty_pdf_text_falls_back_to_another_backend():
+    """A backend returning no text is retried with the next one instead of dropping the CV"""
+    BACKENDS["blank"] = BlankBackend()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cv.pdf")
+            write_pdf(path, 2, lines=20)
+            result = DocumentProcessor(pdf_backend="blank").process_single_file(path)
+            assert result["word_count"] > 100 and result["pages"] == 1
+    finally:
+        del BACKENDS["blank"]
+
+    results = [
+        {"backend": "PyPDF2", "pages_per_second": 100.0, "empty_rate": 0.02},
+        {"backend": "fast", "pages_per_second": 900.0, "empty_rate": 0.20},
+        {"backend": "good", "pages_per_second": 300.0, "empty_rate": 0.025},
+    ]
+    assert select_backend(results, max_empty_rate=0.01) == "good"
+
+def test_docx_text_keeps_document_order_for_files_and_bytes():
+    """Paragraphs and table rows come out in document order from both entry points"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cv.docx")
+        doc = Document()
+        doc.add_paragraph("Jane Doe")
+        table = doc.add_table(rows=2, cols=2)
+        table.cell(0, 0).text, table.cell(0, 1).text = "Stata", "Expert"
+        table.cell(1, 0).text, table.cell(1, 1).text = "DHIS2", "Advanced"
+        doc.add_paragraph("Experience\tM&E Officer")
+        doc.save(path)
+
+        processor = DocumentProcessor()
+        expected = "Jane Doe\nStata Expert\nDHIS2 Advanced\nExperience\tM&E Officer"
+        assert processor.extract_text_from_docx(path) == expected
+        with open(path, "rb") as f:
+            assert processor._extract_docx_text_from_bytes(f.read()) == expected
+
+# A Word text box: the DrawingML shape plus the VML copy older readers fall back to
+TEXT_BOX = (
+    '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"><mc:AlternateContent>'
+    '<mc:Choice Requires="wps"><w:drawing><wps:wsp><wps:txbx><w:txbxContent>'
+    '<w:p><w:r><w:t>Certified PMP</w:t></w:r></w:p>'
+    '</w:txbxContent></wps:txbx></wps:wsp></w:drawing></mc:Choice>'
+    '<mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent>'
+    '<w:p><w:r><w:t>Certified PMP</w:t></w:r></w:p>'
+    '</w:txbxContent></v:textbox></v:shape></w:pict></mc:Fallback>'
+    '</mc:AlternateContent></w:r>'
+)
+
+def test_docx_text_boxes_in_table_cells_are_read_once():
+    """A text box anchored in a table cell stays in that cell, after its paragraph, without the VML copy"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cv.docx")
+        doc = Document()
+        doc.add_paragraph("Jane Doe")
+        table = doc.add_table(rows=1, cols=2)
+        table.cell(0, 0).text = "Skills"
+        paragraph = table.cell(0, 1).paragraphs[0]
+        paragraph.add_run("Stata ")
+        paragraph._p.append(parse_xml(TEXT_BOX))
+        paragraph.add_run("expert")
+        doc.add_paragraph("Summary")
+        doc.save(path)
+
+        assert DocumentProcessor().extract_text_from_docx(path) == "Jane Doe\nSkills Stata expert\nCertified PMP\nSummary"
+
+def test_zip_upload_is_parsed_in_memory_within_limits():
+    """Zip members are read from the buffer, filtered by extension and guarded by size limits"""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_cv_directory(tmp, 4, lines=20)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for path in paths:
+                archive.write(path, f"cvs/{os.path.basename(path)}")
+            archive.writestr("cvs/notes.txt", "not a CV")
+            archive.writestr("__MACOSX/cvs/._cv_0000.pdf", b"resource fork")
+        buffer.name = "cvs.zip"
+
+        processor = DocumentProcessor()
+        expected = sorted((r["filename"], r["text"]) for r in processor.process_directory(tmp))
+        results = processor.process_uploaded_files([buffer])
+        assert [(r["filename"], r["text"]) for r in results] == expected
+        assert results[0]["file_path"] == "cvs.zip/cvs/cv_0000.pdf"
+        assert list(DocumentProcessor(workers=2).iter_zip_archive(buffer, "cvs.zip")) == results
+
+        original = document_processor.ZIP_MAX_MEMBERS
+        document_processor.ZIP_MAX_MEMBERS = 3
+        try:
+            rejected = processor.process_uploaded_files([buffer])
+        finally:
+            document_processor.ZIP_MAX_MEMBERS = original
+        assert len(rejected) == 1 and "limit 3" in rejected[0]["error"]
+
+class HangingBackend(PDFBackend):
+    """Backend that never finishes on files named hang*.pdf"""
+    name = "hanging"
+
+    def available(self) -> bool:
+        return True
+
+    def pages(self, source):
+        if os.path.basename(source.name).startswith("hang"):
+            time.sleep(60)
+        return BACKENDS["PyPDF2"].pages(source)
+
+def allocate(megabytes: int) -> int:
+    if megabytes < 0:
+        os._exit(3)  # like a parser segfault
+    return len(bytearray(megabytes * 1024 * 1024))
+
+def echo(value, delay: float):
+    time.sleep(delay)
+    return value
+
+def test_abandoned_imap_does_not_leak_into_the_next_call():
+    """Workers still running an abandoned imap's tasks are stopped, not handed to the next call"""
+    with IsolatedPool(workers=2, timeout=30) as pool:
+        abandoned = pool.imap(echo, [(i, (i, 0.5 if i else 0)) for i in range(4)])
+        assert next(abandoned) == (0, True, 0)
+        abandoned.close()
+        assert not pool._busy
+        tasks = [("a", ("a", 0)), ("b", ("b", 0)), ("c", ("c", 0))]
+        assert list(pool.imap(echo, tasks)) == [("a", True, "a"), ("b", True, "b"), ("c", True, "c")]
+
+def test_pathological_files_become_error_rows():
+    """Timeouts, memory blow-ups and crashes fail one file; the rest of the batch completes"""
+    BACKENDS["hanging"] = HangingBackend()
+    # The stand-in backend is only registered in this process, so workers must be forked from it
+    start_method, isolated_pool.DEFAULT_START_METHOD = isolated_pool.DEFAULT_START_METHOD, "fork"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            make_cv_directory(tmp, 3, lines=20)
+            write_pdf(os.path.join(tmp, "hang.pdf"), 9, lines=20)
+            processor = DocumentProcessor(workers=2, pdf_backend="hanging", timeout=2)
+            start = time.time()
+            results = {r["filename"]: r for r in processor.process_directory(tmp)}
+            assert time.time() - start < 10
+            assert "timed out" in results["hang.pdf"]["error"]
+            assert all(results[f"cv_{i:04d}.pdf"]["word_count"] > 100 for i in range(3))
+    finally:
+        del BACKENDS["hanging"]
+        isolated_pool.DEFAULT_START_METHOD = start_method
+
+    with IsolatedPool(workers=1, timeout=30, memory_mb=256) as pool:
+        tasks = [("small", (8,)), ("huge", (2048,)), ("crash", (-1,)), ("after", (8,))]
+        outcomes = {key: (ok, value) for key, ok, value in pool.imap(allocate, tasks)}
+    assert outcomes["small"] == (True, 8 * 1024 * 1024)
+    assert not outcomes["huge"][0] and "memory" in outcomes["huge"][1]
+    assert not outcomes["crash"][0] and "crashed" in outcomes["crash"][1]
+    assert outcomes["after"] == (True, 8 * 1024 * 1024)
+
+if __name__ == "__main__":
+    test_parallel_extraction_matches_sequential()
+    test_extraction_cache_skips_unchanged_files()
+    test_pdf_extraction_stops_at_page_and_char_limits()
+    test_empty_pdf_text_falls_back_to_another_backend()
+    test_docx_text_keeps_document_order_for_files_and_bytes()
+    test_docx_text_boxes_in_table_cells_are_read_once()
+    test_zip_upload_is_parsed_in_memory_within_limits()
+    test_abandoned_imap_does_not_leak_into_the_next_call()
+    test_pathological_files_become_error_rows()
+    print("🎉 All document processor tests passed!")
@@ -0,0 +1,125 @@
+"""
+Tests for the Euriai client transport layer, run against a local stand-in server
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# The stand-in server needs no rate limit, and repeated prompts must reach it rather than the caches
+os.environ.setdefault("EURI_RPM", "0")
+os.environ.setdefault("LLM_CACHE_DISABLED", "1")
+os.environ.setdefault("ANALYSIS_CACHE_DISABLED", "1")
+
+from benchmarks.stand_in_server import StandInServer
+from utils.euri_client import EuriClient
+from utils.response_cache import ResponseCache, SQLiteLRUCache
+
+def test_session_reuses_connection():
+    """Sequential calls should share one keep-alive connection"""
+    with StandInServer() as server:
+        with EuriClient(api_key="test", base_url=server.url) as client:
+            server.reset()
+            for _ in range(10):
+                assert client.chat_completion([{"role": "user", "content": "Hi"}]) == "ok"
+            assert len(server.connections) == 1
+
+def test_session_pool_bounded_across_threads():
+    """Concurrent workers never open more connections than the pool size"""
+    with StandInServer() as server:
+        with EuriClient(api_key="test", base_url=server.url, pool_size=3) as client:
+            server.reset()
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                responses = list(executor.map(
+                    lambda _: client.chat_completion([{"role": "user", "content": "Hi"}]), range(40)
+                ))
+            assert responses == ["ok"] * 40
+            assert len(server.connections) <= 3
+
+def test_health_probe_is_lazy_and_cached():
+    """Constructing a client makes no request; probes are shared and cached"""
+    with StandInServer() as server:
+        client = EuriClient(api_key="probe-test", base_url=server.url)
+        assert not server.connections
+
+        assert client.test_connection(timeout=5)
+        probes = len(server.connections)
+        assert probes == 1
+
+        # A second client with the same key reads the cached result
+        other = EuriClient(api_key="probe-test", base_url=server.url)
+        assert other.health_status().healthy
+        assert other.test_connection(timeout=5)
+        assert len(server.connections) == probes
+
+def test_response_cache_serves_repeated_requests():
+    """Identical requests hit the server once; use_cache=False bypasses the cache"""
+    with StandInServer() as server:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(os.path.join(tmp, "responses.sqlite"), max_bytes=1024 * 1024)
+            with EuriClient(api_key="test", base_url=server.url, cache=cache) as client:
+                server.reset()
+                messages = [{"role": "user", "content": "Score this CV"}]
+                for _ in range(3):
+                    assert client.chat_completion(messages, temperature=0.1) == "ok"
+                assert server.requests == 1
+
+                # A different temperature is a different request
+                client.chat_completion(messages, temperature=0.2)
+                client.chat_completion(messages, temperature=0.1, use_cache=False)
+                assert server.requests == 3
+
+                stats = cache.stats()
+                assert stats["hits"] == 2 and stats["misses"] == 2 and stats["entries"] == 2
+            cache.close()
+
+def test_async_clients_are_closed_with_their_loop():
+    """aclose() closes the running loop's client; close() closes those of loops still open"""
+    with StandInServer() as server:
+        client = EuriClient(api_key="test", base_url=server.url)
+
+        async def call_and_close():
+            assert await client.achat_completion([{"role": "user", "content": "Hi"}]) == "ok"
+            http = client._get_async_client()
+            await client.aclose()
+            return http
+
+        assert asyncio.run(call_and_close()).is_closed
+        assert not client._async_clients
+
+        loop = asyncio.new_event_loop()
+        assert loop.run_until_complete(client.achat_completion([{"role": "user", "content": "Hi"}])) == "ok"
+        http = client._async_clients[loop]
+        client.close()
+        assert http.is_closed and not client._async_clients
+        loop.close()
+
+def test_lru_cache_evicts_least_recently_used():
+    """Entries are evicted by last access once the size budget is exceeded"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lru.sqlite")
+        cache = SQLiteLRUCache(path, max_bytes=30)
+        cache.put("a", b"x" * 10)
+        cache.put("b", b"x" * 10)
+        cache.put("c", b"x" * 10)
+        assert cache.get("a") is not None     # "b" is now least recently used
+        cache.put("d", b"x" * 10)
+        assert cache.get("b") is None
+        assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+        cache.close()
+
+        # Contents and size accounting survive a reopen
+        reopened = SQLiteLRUCache(path, max_bytes=30)
+        assert reopened.stats()["bytes"] == 30
+        reopened.close()
+
+if __name__ == "__main__":
+    test_session_reuses_connection()
+    test_session_pool_bounded_across_threads()
+    test_health_probe_is_lazy_and_cached()
+    test_response_cache_serves_repeated_requests()
+    test_async_clients_are_closed_with_their_loop()
+    test_lru_cache_evicts_least_recently_used()
+    print("🎉 All Euriai client tests passed!")
@@ -0,0 +1,51 @@
+"""
+Tests for the append-only screening job journal
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.ai_analyzer_clean import CVAnalysisResult
+from utils.job_journal import JobJournal
+
+def make_result(filename: str, score: float) -> CVAnalysisResult:
+    return CVAnalysisResult(
+        filename=filename, overall_score=score, category_scores={"education": 20},
+        strengths=["MEL"], weaknesses=[], recommendations=[], key_qualifications={},
+        experience_summary="", education_summary="", technical_skills=["Stata"],
+        fit_assessment="", ranking_tier="Good", ai_provider="Euriai"
+    )
+
+def test_journal_resumes_and_rebuilds_results():
+    """Completed CVs are skipped on resume, failures retried, results rebuilt without the LLM"""
+    cvs = [{"filename": f"cv_{i}.pdf", "text": f"Candidate {i}"} for i in range(4)]
+    with tempfile.TemporaryDirectory() as tmp:
+        with JobJournal("run", CVAnalysisResult, jobs_dir=tmp) as journal:
+            journal.record(cvs[0], make_result("cv_0.pdf", 80))
+            journal.record(cvs[1], None)
+            journal.record(cvs[2], make_result("cv_2.pdf", 65))
+
+        # Simulate a crash in the middle of writing the next entry
+        with open(os.path.join(tmp, "run.jsonl"), "a") as f:
+            f.write('{"key": "tor')
+
+        renamed = [dict(cvs[0], filename="renamed.pdf")] + cvs[1:]
+        with JobJournal("run", CVAnalysisResult, jobs_dir=tmp) as journal:
+            assert [cv["filename"] for cv in journal.pending(renamed)] == ["cv_1.pdf", "cv_3.pdf"]
+            journal.record(cvs[1], make_result("cv_1.pdf", 70))
+
+            results = journal.results(renamed)
+            assert [r.filename for r in results] == ["renamed.pdf", "cv_1.pdf", "cv_2.pdf"]
+            assert results[0].category_scores == {"education": 20}
+            assert results[1].overall_score == 70
+
+        with JobJournal("run", CVAnalysisResult, jobs_dir=tmp) as journal:
+            assert len(journal.results()) == 3
+            journal.reset()
+            assert len(journal.pending(cvs)) == 4
+
+if __name__ == "__main__":
+    test_journal_resumes_and_rebuilds_results()
+    print("🎉 All job journal tests passed!")
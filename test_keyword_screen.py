@@ -0,0 +1,39 @@
+"""
+Tests for the local keyword pre-screen
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.keyword_screen import AhoCorasick, KeywordPrescreen, KeywordScorer
+from benchmarks.synthetic_cvs import cv_lines
+
+def test_matcher_finds_overlapping_whole_word_phrases():
+    matcher = AhoCorasick(["monitoring", "monitoring and evaluation", "evaluation", "m&e", "ma", "eu"])
+    found = list(matcher.find("Led Monitoring and Evaluation (M&E) for a European mama-and-baby programme"))
+    assert sorted(found) == ["evaluation", "m&e", "monitoring", "monitoring and evaluation"]
+
+def test_prescreen_keeps_top_k_best_first():
+    scorer = KeywordScorer()
+    mel_cv = "\n".join(cv_lines(1, 60))
+    unrelated = ("Chef with ten years in restaurant kitchens. Menu planning, pastry, food safety "
+                 "and staff rotas. Head chef at a hotel in Lisbon.")
+    partial = "Teacher of mathematics. Bachelor degree. Used Excel to track student survey results."
+    assert scorer.score(mel_cv).score > scorer.score(partial).score > scorer.score(unrelated).score
+
+    documents = [{"filename": "chef.pdf", "text": unrelated}, {"filename": "teacher.pdf", "text": partial},
+                 {"filename": "mel.pdf", "text": mel_cv}, {"filename": "mel_copy.pdf", "text": mel_cv}]
+    prescreen = KeywordPrescreen(top_k=2, min_score=0)
+    assert [cv["filename"] for cv in prescreen.filter(documents)] == ["mel.pdf", "mel_copy.pdf"]
+    assert [(row["filename"], row["shortlisted"]) for row in prescreen.ranked()] == [
+        ("mel.pdf", True), ("mel_copy.pdf", True), ("teacher.pdf", False), ("chef.pdf", False)
+    ]
+
+    threshold = KeywordPrescreen(top_k=0, min_score=scorer.score(partial).score)
+    assert [cv["filename"] for cv in threshold.filter(documents)] == ["teacher.pdf", "mel.pdf", "mel_copy.pdf"]
+
+if __name__ == "__main__":
+    test_matcher_finds_overlapping_whole_word_phrases()
+    test_prescreen_keeps_top_k_best_first()
+    print("🎉 All keyword pre-screen tests passed!")
@@ -0,0 +1,94 @@
+"""
+Tests for the local fallback scorer
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# The stand-in server needs no rate limit, and repeated prompts must reach it rather than the caches
+os.environ.setdefault("EURI_RPM", "0")
+os.environ.setdefault("LLM_CACHE_DISABLED", "1")
+os.environ.setdefault("ANALYSIS_CACHE_DISABLED", "1")
+
+from benchmarks.stand_in_server import StandInServer
+from utils.ai_analyzer_clean import CVAnalysisResult, ProfessionalCVAnalyzer
+from utils.flexible_analyzer import FlexibleCVAnalyzer
+from utils.job_journal import JobJournal
+from utils.local_scorer import LocalScorer, get_local_scorer
+from benchmarks.synthetic_cvs import cv_lines
+
+MEL_CV = "\n".join(cv_lines(1, 60))
+CHEF_CV = "Head chef, 2012 - present. Diploma in culinary arts. Menu planning, pastry and food safety in Lisbon."
+
+def test_batch_scores_follow_the_scoring_guides():
+    mel, chef = LocalScorer().score_batch([MEL_CV, CHEF_CV])
+    assert set(mel.category_scores) == {"education", "experience", "technical_skills", "sector_knowledge",
+                                        "communication", "regional_experience"}
+    assert all(0 <= score <= 30 for score in mel.category_scores.values())
+    assert mel.overall_score > chef.overall_score + 30
+    assert mel.highest_degree == "msc" and "stata" in mel.matched["technical_skills"]
+    assert chef.highest_degree == "diploma" and chef.tier == "Poor"
+
+def test_provider_failure_falls_back_to_a_provisional_local_result():
+    # Every reply is text that is not an analysis
+    server = StandInServer(["Sorry, I cannot help with that."])
+    os.environ["EURI_BASE_URL"] = server.url
+    try:
+        analyzer = ProfessionalCVAnalyzer(euriai_api_key="test")
+        result = analyzer.analyze_cv_sync(MEL_CV, "mel.pdf")
+        assert result.ai_provider == "Local"
+        assert result.overall_score == LocalScorer().score(MEL_CV).overall_score
+
+        cv = {"filename": "mel.pdf", "text": MEL_CV}
+        with tempfile.TemporaryDirectory() as tmp:
+            with JobJournal("run", CVAnalysisResult, jobs_dir=tmp) as journal:
+                journal.record(cv, result)
+                # Reported, but analyzed again on the next run
+                assert [r.ai_provider for r in journal.results([cv])] == ["Local"]
+                assert journal.pending([cv]) == [cv]
+    finally:
+        del os.environ["EURI_BASE_URL"]
+        server.shutdown()
+
+def test_batch_failures_are_scored_locally_in_one_pass():
+    """Batch paths collect the CVs every provider failed on and score them with one matrix"""
+    server = StandInServer(["Sorry, I cannot help with that."])
+    os.environ["EURI_BASE_URL"] = server.url
+    scorer = get_local_scorer()
+    batches = []
+    score_batch = scorer.score_batch
+    scorer.score_batch = lambda texts, job_description=None: batches.append(len(texts)) or score_batch(
+        texts, job_description)
+    try:
+        cv_data = [{"filename": "mel.pdf", "text": MEL_CV}, {"filename": "broken.pdf", "text": "", "error": "bad"},
+                   {"filename": "chef.pdf", "text": CHEF_CV}]
+        analyzer = ProfessionalCVAnalyzer(euriai_api_key="test")
+        progress = []
+        results = analyzer.batch_analyze(cv_data, max_workers=2,
+                                         progress_callback=lambda done, total, cv, result: progress.append(done))
+        assert [(r.filename, r.ai_provider) for r in results] == [("mel.pdf", "Local"), ("chef.pdf", "Local")]
+        assert progress == [1, 2] and batches == [2]
+
+        reported = []
+        results = asyncio.run(analyzer.analyze_batch(
+            cv_data, on_result=lambda index, cv, result: reported.append((index, result.ai_provider))))
+        assert [r.filename for r in results] == ["mel.pdf", "chef.pdf"]
+        assert sorted(reported) == [(0, "Local"), (2, "Local")] and batches == [2, 2]
+
+        job_description = "Head chef for a busy restaurant: menu planning, pastry, food safety and kitchen staff."
+        results = FlexibleCVAnalyzer(euriai_api_key="test").batch_analyze(cv_data, job_description, max_workers=2)
+        assert [(r.filename, r.provider_used) for r in results] == [("mel.pdf", "Local"), ("chef.pdf", "Local")]
+        assert "technical_skills" in results[0].category_scores
+        assert results[1].overall_score > results[0].overall_score and batches == [2, 2, 2]
+    finally:
+        del scorer.score_batch
+        del os.environ["EURI_BASE_URL"]
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_batch_scores_follow_the_scoring_guides()
+    test_provider_failure_falls_back_to_a_provisional_local_result()
+    test_batch_failures_are_scored_locally_in_one_pass()
+    print("🎉 All local scorer tests passed!")
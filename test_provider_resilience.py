@@ -0,0 +1,274 @@
+"""
+Tests for the provider resilience layer (rate limiting, retries, circuit breaking, routing, hedging)
+"""
+
+import sys
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# The stand-in server needs no rate limit, and repeated prompts must reach it rather than the caches
+os.environ.setdefault("EURI_RPM", "0")
+os.environ.setdefault("LLM_CACHE_DISABLED", "1")
+os.environ.setdefault("ANALYSIS_CACHE_DISABLED", "1")
+
+from benchmarks.stand_in_server import StandInServer
+from utils.rate_limiter import TokenBucket, ProviderRateLimiter, get_rate_limiter, estimate_tokens
+from utils.retry import (
+    RetryPolicy, RateLimitError, ProviderServerError, ProviderRequestError,
+    MalformedResponseError, parse_retry_after
+)
+from utils.euri_client import EuriClient
+from utils.hedging import HedgeMetrics, hedged_call, hedged_call_sync
+from utils.provider_router import CircuitBreaker, ProviderRouter, ProviderUnavailableError, get_provider_monitor
+
+FAST_RETRIES = RetryPolicy(max_attempts=4, base_delay=0.01, max_delay=0.05)
+
+def test_token_bucket_paces_after_burst():
+    """A bucket allows its capacity immediately, then refills at the configured rate"""
+    bucket = TokenBucket(rate_per_minute=600, capacity=2)   # 10 per second
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    assert abs(bucket.reserve(1) - 0.1) < 0.02
+    assert abs(bucket.reserve(1) - 0.2) < 0.02
+
+def test_limiter_shared_across_threads_and_tasks():
+    """Threads and asyncio tasks draw from the same budget"""
+    limiter = ProviderRateLimiter("Test", requests_per_minute=1200)  # 20 per second
+    limiter.requests.tokens = 0
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: limiter.acquire(), range(4)))
+
+    async def run_tasks():
+        await asyncio.gather(*(limiter.acquire_async() for _ in range(4)))
+    asyncio.run(run_tasks())
+    elapsed = time.monotonic() - start
+
+    # Eight requests at 20/s from an empty bucket take ~0.4s, never much longer
+    assert 0.35 < elapsed < 0.6
+
+def test_token_budget_reconciled_with_usage():
+    limiter = ProviderRateLimiter("Test", tokens_per_minute=6000)
+    limiter.tokens.tokens = 1000
+    assert limiter.acquire(800) == 0.0
+    limiter.record_usage(800, 300)
+    assert 690 < limiter.tokens.tokens < 710
+
+def test_process_wide_registry():
+    assert get_rate_limiter("Euriai") is get_rate_limiter("Euriai")
+    assert get_rate_limiter("Euriai") is not get_rate_limiter("Groq")
+    assert estimate_tokens([{"role": "user", "content": "one two three"}], max_tokens=10) == 13
+
+def test_retry_after_parsing():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+def test_retry_policy_backoff_is_capped_and_honors_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    error = ProviderServerError("boom")
+    assert all(0 <= policy.delay_for(attempt, error) <= 4.0 for attempt in range(1, 10))
+    assert policy.delay_for(1, RateLimitError("slow down", retry_after=7)) == 7
+
+def test_retry_policy_only_retries_transient_errors():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise MalformedResponseError("truncated body")
+        return "done"
+
+    assert FAST_RETRIES.call(flaky) == "done"
+    assert len(calls) == 3
+
+    def rejected():
+        calls.append(1)
+        raise ProviderRequestError("bad key", status_code=401)
+
+    calls.clear()
+    try:
+        FAST_RETRIES.call(rejected)
+        assert False, "expected ProviderRequestError"
+    except ProviderRequestError:
+        pass
+    assert len(calls) == 1
+
+def test_euri_client_recovers_from_transient_errors():
+    """429 with Retry-After and 503 are retried; the call succeeds without fallback"""
+    with StandInServer([
+        (429, {"Retry-After": "0"}, "rate limited"),
+        (503, {}, "unavailable"),
+        (200, {"Content-Type": "application/json"}, "{not json"),
+        "ok",
+    ]) as server:
+        client = EuriClient(api_key="retry-test", base_url=server.url, retry_policy=FAST_RETRIES)
+        assert client.chat_completion([{"role": "user", "content": "Hi"}]) == "ok"
+        assert server.requests == 4
+
+        server.reset()
+        assert asyncio.run(client.achat_completion([{"role": "user", "content": "Hi"}])) == "ok"
+
+def test_euri_client_does_not_retry_client_errors():
+    with StandInServer([(401, {}, "invalid key")]) as server:
+        client = EuriClient(api_key="retry-test", base_url=server.url, retry_policy=FAST_RETRIES)
+        try:
+            client.chat_completion([{"role": "user", "content": "Hi"}])
+            assert False, "expected ProviderRequestError"
+        except ProviderRequestError as e:
+            assert e.status_code == 401
+        assert server.requests == 1
+
+def test_circuit_breaker_opens_and_probes_after_cooldown():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=0.1)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.12)
+    # Exactly one trial request is let through after the cool-down
+    assert breaker.available()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.12)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_router_prefers_primary_until_clearly_worse():
+    primary, secondary = get_provider_monitor("RoutePrimary"), get_provider_monitor("RouteSecondary")
+    router = ProviderRouter(["RoutePrimary", "RouteSecondary"])
+
+    # Unknown statistics keep the configured preference
+    assert router.order() == ["RoutePrimary", "RouteSecondary"]
+
+    primary.record_success(1.0)
+    secondary.record_success(0.9)
+    assert router.order() == ["RoutePrimary", "RouteSecondary"]
+
+    for _ in range(5):
+        primary.record_success(8.0)
+    assert router.order() == ["RouteSecondary", "RoutePrimary"]
+
+def test_router_skips_open_circuit():
+    flaky = get_provider_monitor("RouteFlaky")
+    router = ProviderRouter(["RouteFlaky", "RouteBackup"])
+    for _ in range(flaky.breaker.failure_threshold):
+        flaky.record_failure(0.5)
+    assert router.order() == ["RouteBackup"]
+    try:
+        flaky.claim()
+        assert False, "expected ProviderUnavailableError"
+    except ProviderUnavailableError:
+        pass
+
+def test_open_circuit_fails_fast_without_calling_provider():
+    with StandInServer([(503, {}, "unavailable")]) as server:
+        client = EuriClient(api_key="breaker-test", base_url=server.url, retry_policy=FAST_RETRIES)
+        client.monitor = get_provider_monitor("BreakerTestEuriai")
+        client.monitor.breaker.failure_threshold = 2
+        try:
+            client.chat_completion([{"role": "user", "content": "Hi"}])
+            assert False, "expected ProviderUnavailableError"
+        except ProviderUnavailableError:
+            pass
+        # Two real attempts tripped the breaker; the remaining retries were not sent
+        assert server.requests == 2
+
+def test_cancelled_rate_limit_wait_releases_half_open_trial():
+    """A request cancelled while waiting on the limiter gives its half-open trial back"""
+    with StandInServer() as server:
+        client = EuriClient(api_key="cancel-test", base_url=server.url, retry_policy=FAST_RETRIES)
+        client.monitor = get_provider_monitor("CancelTestEuriai")
+        breaker = client.monitor.breaker
+        breaker.cooldown = 0.05
+        for _ in range(breaker.failure_threshold):
+            client.monitor.record_failure(0.1)
+        time.sleep(0.06)
+        client.rate_limiter = ProviderRateLimiter("CancelTest", requests_per_minute=60)
+        client.rate_limiter.requests.tokens = 0
+
+        async def cancel_while_waiting():
+            task = asyncio.ensure_future(client._asend([{"role": "user", "content": "Hi"}], None, 0.7, 5))
+            await asyncio.sleep(0.05)
+            assert breaker.trial_in_flight
+            task.cancel()
+            try:
+                await task
+                assert False, "expected CancelledError"
+            except asyncio.CancelledError:
+                pass
+
+        asyncio.run(cancel_while_waiting())
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.trial_in_flight and breaker.available()
+        assert ProviderRouter(["CancelTestEuriai"]).order() == ["CancelTestEuriai"]
+        assert server.requests == 0
+
+def test_hedged_call_prefers_first_valid_result():
+    metrics = HedgeMetrics()
+    cancelled = []
+
+    async def slow_primary():
+        try:
+            await asyncio.sleep(1.0)
+            return "primary"
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def fast_secondary():
+        await asyncio.sleep(0.01)
+        return "secondary"
+
+    async def quick_primary():
+        return "primary"
+
+    assert asyncio.run(hedged_call(quick_primary, fast_secondary, delay=0.1, metrics=metrics)) == "primary"
+    start = time.monotonic()
+    assert asyncio.run(hedged_call(slow_primary, fast_secondary, delay=0.05, metrics=metrics)) == "secondary"
+    assert time.monotonic() - start < 0.5
+    assert cancelled == [True]
+    assert metrics.snapshot() == {"requests": 2, "hedges": 1, "hedge_wins": 1,
+                                  "wasted_calls": 1, "hedge_rate": 0.5}
+
+def test_hedged_call_sync_falls_through_failed_hedge():
+    metrics = HedgeMetrics()
+
+    def slow_primary():
+        time.sleep(0.1)
+        return "primary"
+
+    assert hedged_call_sync(slow_primary, lambda: None, delay=0.02, metrics=metrics) == "primary"
+    assert hedged_call_sync(lambda: None, lambda: "secondary", delay=0.5, metrics=metrics) == "secondary"
+    snapshot = metrics.snapshot()
+    assert snapshot["hedges"] == 1 and snapshot["hedge_wins"] == 0 and snapshot["wasted_calls"] == 0
+
+if __name__ == "__main__":
+    test_token_bucket_paces_after_burst()
+    test_limiter_shared_across_threads_and_tasks()
+    test_token_budget_reconciled_with_usage()
+    test_process_wide_registry()
+    test_retry_after_parsing()
+    test_retry_policy_backoff_is_capped_and_honors_retry_after()
+    test_retry_policy_only_retries_transient_errors()
+    test_euri_client_recovers_from_transient_errors()
+    test_euri_client_does_not_retry_client_errors()
+    test_circuit_breaker_opens_and_probes_after_cooldown()
+    test_router_prefers_primary_until_clearly_worse()
+    test_router_skips_open_circuit()
+    test_open_circuit_fails_fast_without_calling_provider()
+    test_cancelled_rate_limit_wait_releases_half_open_trial()
+    test_hedged_call_prefers_first_valid_result()
+    test_hedged_call_sync_falls_through_failed_hedge()
+    print("🎉 All provider resilience tests passed!")
@@ -0,0 +1,66 @@
+"""
+End-to-end test of the headless CLI against a local stand-in Euriai server
+"""
+
+import sys
+import os
+import glob
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# The stand-in server needs no rate limit, and repeated prompts must reach it rather than the caches
+os.environ.setdefault("EURI_RPM", "0")
+os.environ.setdefault("LLM_CACHE_DISABLED", "1")
+os.environ.setdefault("ANALYSIS_CACHE_DISABLED", "1")
+# Extracted text stays out of the on-disk extraction cache
+os.environ.setdefault("EXTRACTION_CACHE_DISABLED", "1")
+
+from docx import Document
+
+import screen_cvs
+from benchmarks.stand_in_server import StandInServer
+from benchmarks.synthetic_cvs import write_docx
+
+ANALYSIS = {"overall_score": 72.0, "category_scores": {"education": 20}, "ranking_tier": "Good"}
+
+def test_cli_analyzes_and_resumes():
+    server = StandInServer([json.dumps(ANALYSIS)])
+    os.environ["EURI_BASE_URL"] = server.url
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cv_dir = os.path.join(tmp, "cvs")
+            os.makedirs(cv_dir)
+            for i in range(3):
+                write_docx(os.path.join(cv_dir, f"cv_{i}.docx"), i, lines=20)
+            # Held back by admission control, never sent to the provider
+            letter = Document()
+            letter.add_paragraph("Dear Hiring Manager, I am writing to apply for the MEL Manager role. "
+                                 "Please find attached my CV. Yours sincerely, A. Candidate")
+            letter.save(os.path.join(cv_dir, "cover_letter.docx"))
+            output = os.path.join(tmp, "out")
+            argv = [cv_dir, "--output", output, "--workers", "2", "--euriai-key", "test", "--groq-key", ""]
+
+            assert screen_cvs.main(argv) == 0
+            assert server.requests >= 3
+            reports = json.load(open(glob.glob(os.path.join(output, "*.json"))[0]))
+            assert sorted(r["filename"] for r in reports) == ["cv_0.docx", "cv_1.docx", "cv_2.docx"]
+            review = open(glob.glob(os.path.join(output, "review_*.csv"))[0], encoding="utf-8").read()
+            assert "cover_letter.docx" in review
+
+            # A second run is served entirely from the journal
+            before = server.requests
+            assert screen_cvs.main(argv) == 0
+            assert server.requests == before
+
+            # Keyword pre-screen: only the best-ranked CV reaches the provider
+            assert screen_cvs.main(argv + ["--fresh", "--top-k", "1"]) == 0
+            assert server.requests == before + 1
+            ranking = open(glob.glob(os.path.join(output, "keyword_ranking_*.csv"))[0], encoding="utf-8").read()
+            assert ranking.count("True") == 1 and ranking.count("False") == 2
+    finally:
+        del os.environ["EURI_BASE_URL"]
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_cli_analyzes_and_resumes()
+    print("🎉 All CLI tests passed!")
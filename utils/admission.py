@@ -0,0 +1,145 @@
+"""
+Pre-LLM admission control for extracted documents
+
+Every extracted document is scored locally before it may cost an API call:
+text density (scanned PDFs extract as a few stray characters), CV-likeness
+(section headings, dates, degree keywords) and language. Documents that fail
+go to a review bucket with the reasons instead of to the analyzers. (Repeat
+submissions are not rejected here: utils.dedup scores them once.)
+"""
+
+import os
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+from config.job_description import EDUCATION_KEYWORDS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() in ("1", "true", "yes")
+
+PLACEHOLDER_PREFIXES = ("[DOC file - manual processing required",)
+
+SECTION_HEADINGS = [
+    "experience", "work experience", "professional experience", "employment", "employment history",
+    "education", "academic", "qualifications", "skills", "competencies", "certifications", "training",
+    "projects", "publications", "references", "referees", "profile", "summary", "objective",
+    "languages", "achievements", "responsibilities", "curriculum vitae", "resume"
+]
+COVER_LETTER_PHRASES = [
+    "dear", "sincerely", "yours faithfully", "yours sincerely", "i am writing to", "to whom it may concern",
+    "hiring manager", "i look forward to", "please find attached", "cover letter"
+]
+ENGLISH_STOPWORDS = {
+    "the", "and", "of", "to", "in", "for", "with", "on", "at", "by", "a", "an", "as", "from", "is",
+    "was", "were", "are", "be", "this", "that", "i", "my", "our", "we", "including", "through", "using"
+}
+
+def _phrase_pattern(phrases: Iterable[str]) -> re.Pattern:
+    alternatives = sorted({re.escape(p) for p in phrases}, key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(alternatives) + r")\b", re.IGNORECASE)
+
+HEADING_PATTERN = _phrase_pattern(SECTION_HEADINGS)
+DEGREE_PATTERN = _phrase_pattern(EDUCATION_KEYWORDS)
+COVER_LETTER_PATTERN = _phrase_pattern(COVER_LETTER_PHRASES)
+DATE_PATTERN = re.compile(
+    r"\b(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+)?(?:19[6-9]\d|20[0-4]\d)\b",
+    re.IGNORECASE
+)
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+@dataclass
+class AdmissionDecision:
+    """Outcome of the local checks for one document"""
+    admitted: bool
+    reasons: List[str] = field(default_factory=list)
+    scores: Dict[str, float] = field(default_factory=dict)
+
+class AdmissionControl:
+    """Scores documents locally and decides which ones go to the LLM"""
+
+    def __init__(self, min_words: int = None, min_letter_ratio: float = None,
+                 min_cv_score: float = None, min_stopword_ratio: float = None):
+        self.min_words = int(os.getenv("ADMISSION_MIN_WORDS", "60")) if min_words is None else min_words
+        self.min_letter_ratio = (float(os.getenv("ADMISSION_MIN_LETTER_RATIO", "0.6"))
+                                 if min_letter_ratio is None else min_letter_ratio)
+        self.min_cv_score = float(os.getenv("ADMISSION_MIN_CV_SCORE", "0.4")) if min_cv_score is None else min_cv_score
+        self.min_stopword_ratio = (float(os.getenv("ADMISSION_MIN_STOPWORD_RATIO", "0.02"))
+                                   if min_stopword_ratio is None else min_stopword_ratio)
+
+    def cv_score(self, text: str) -> float:
+        """0-1 likeness to a CV from headings, dates and degree keywords"""
+        headings = {m.group(0).lower() for m in HEADING_PATTERN.finditer(text)}
+        dates = len(DATE_PATTERN.findall(text))
+        degrees = {m.group(0).lower() for m in DEGREE_PATTERN.finditer(text)}
+        return round(0.4 * min(len(headings) / 3, 1.0) + 0.3 * min(dates / 3, 1.0)
+                     + 0.3 * min(len(degrees) / 2, 1.0), 3)
+
+    def check(self, cv_item: Dict) -> AdmissionDecision:
+        """Assess one document"""
+        text = cv_item.get("text") or ""
+        stripped = text.strip()
+        if not stripped:
+            return AdmissionDecision(False, ["no text extracted"])
+        if stripped.startswith(PLACEHOLDER_PREFIXES):
+            return AdmissionDecision(False, ["legacy .doc file needs manual conversion"])
+
+        reasons = []
+        words = WORD_PATTERN.findall(text)
+        visible = sum(1 for ch in text if not ch.isspace())
+        letters = sum(len(word) for word in words)
+        latin = sum(1 for word in words for ch in word if ch.isascii())
+        stopwords = sum(1 for word in words if word.lower() in ENGLISH_STOPWORDS)
+        scores = {
+            "words": len(words),
+            "letter_ratio": round(letters / visible, 3) if visible else 0.0,
+            "cv_score": self.cv_score(text),
+            "latin_ratio": round(latin / letters, 3) if letters else 0.0,
+            "stopword_ratio": round(stopwords / len(words), 3) if words else 0.0
+        }
+
+        if scores["words"] < self.min_words:
+            reasons.append(f"too little text ({scores['words']} words; scanned or image-only?)")
+        elif scores["letter_ratio"] < self.min_letter_ratio:
+            reasons.append(f"mostly non-text characters ({scores['letter_ratio']:.0%} letters)")
+        if scores["cv_score"] < self.min_cv_score:
+            cover_letter = len({m.group(0).lower() for m in COVER_LETTER_PATTERN.finditer(text)}) >= 2
+            reasons.append("looks like a cover letter" if cover_letter
+                           else f"does not look like a CV (score {scores['cv_score']:.2f})")
+        if scores["latin_ratio"] < 0.8 or scores["stopword_ratio"] < self.min_stopword_ratio:
+            reasons.append("not in English")
+
+        return AdmissionDecision(not reasons, reasons, scores)
+
+    def split(self, cv_data: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """(admitted, review); review items are slim rows listing the reasons"""
+        admitted, review = [], []
+        for cv_item in cv_data:
+            if cv_item.get("error"):
+                continue
+            decision = self.check(cv_item)
+            if decision.admitted:
+                admitted.append(cv_item)
+            else:
+                review.append(review_item(cv_item, decision))
+        if review:
+            logger.info(f"📋 Admission: {len(admitted)} admitted, {len(review)} sent to review")
+        return admitted, review
+
+def review_item(cv_item: Dict, decision: AdmissionDecision) -> Dict:
+    """Slim review-bucket row (no full text)"""
+    return {
+        "filename": cv_item.get("filename", ""),
+        "file_path": cv_item.get("file_path", ""),
+        "word_count": cv_item.get("word_count", 0),
+        "reasons": "; ".join(decision.reasons)
+    }
+
+def admit_documents(cv_data: List[Dict], control: AdmissionControl = None) -> Tuple[List[Dict], List[Dict]]:
+    """Split extracted documents into (admitted, review); everything is admitted when ADMISSION_ENABLED is off"""
+    if not ADMISSION_ENABLED:
+        return [cv for cv in cv_data if not cv.get("error") and cv.get("text")], []
+    return (control or AdmissionControl()).split(cv_data)
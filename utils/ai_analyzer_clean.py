@@ -6,12 +6,19 @@ Supports Euriai (primary) and Groq (fallback) providers
 import os
 import json
 import logging
-import time
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 import asyncio
 from utils.euri_client import EuriClient
-from groq import Groq
+from utils.groq_client import GroqClient
+from utils.provider_router import ProviderRouter
+from utils.hedging import HEDGE_REQUESTS, HedgePolicy, hedge_metrics, hedged_call, hedged_call_sync
+from utils.response_cache import get_response_cache
+from utils.analysis_cache import AnalysisCache, analysis_key, get_analysis_cache
+from utils.batch_runner import CancellationToken, iter_concurrent
+from utils.pipeline import run_pipeline
+from utils.document_processor import truncate_text
+from utils.local_scorer import LOCAL_FALLBACK, LOCAL_PROVIDER, LOCAL_SUMMARY, LocalScore, get_local_scorer
 from config.job_description import (
     MEL_MANAGER_JOB_DESCRIPTION, 
     SCORING_CRITERIA
@@ -21,6 +28,14 @@ from config.job_description import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Concurrent provider requests per batch (overridable per call)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENT_REQUESTS", "5"))
+
+# CVs whose prompt exceeds MAX_PROMPT_TOKENS are cut to TRUNCATED_CV_CHARS;
+# pass the same budget as DocumentProcessor(max_chars=...) to skip parsing the rest
+MAX_PROMPT_TOKENS = 7000
+TRUNCATED_CV_CHARS = int(os.getenv("TRUNCATED_CV_CHARS", "3000"))
+
 @dataclass
 class CVAnalysisResult:
     """Data class for CV analysis results"""
@@ -37,6 +52,7 @@ class CVAnalysisResult:
     fit_assessment: str
     ranking_tier: str
     ai_provider: str
+    duplicate_of: str = ""  # filename of the analyzed copy when this CV is a repeat submission
 
     # Additional properties for compatibility with results table
     @property
@@ -74,10 +90,15 @@ class CVAnalysisResult:
 class ProfessionalCVAnalyzer:
     """Professional CV analyzer with dual AI provider support"""
     
-    def __init__(self, euriai_api_key: str = "", groq_api_key: str = ""):
+    def __init__(self, euriai_api_key: str = "", groq_api_key: str = "",
+                 hedge: bool = None, hedge_percentile: float = None, cache: AnalysisCache = None):
         self.euriai_api_key = euriai_api_key
         self.groq_api_key = groq_api_key
         
+        # Optional hedging: send the prompt to the second provider when the first is slow
+        self.hedge = HEDGE_REQUESTS if hedge is None else hedge
+        self.hedge_policy = HedgePolicy(hedge_percentile)
+        
         # Initialize AI clients
         self.euriai_client = None
         self.groq_client = None
@@ -87,20 +108,39 @@ class ProfessionalCVAnalyzer:
             try:
                 self.euriai_client = EuriClient(euriai_api_key)
                 logger.info("✅ Euriai client initialized (Primary Provider)")
+                status = self.euriai_client.health_status()
+                if status and not status.healthy:
+                    logger.warning(f"⚠️ Euriai last health check failed: {status.error}")
             except Exception as e:
                 logger.warning(f"Failed to initialize Euriai: {str(e)}")
         
         # Initialize Groq (fallback provider)
         if groq_api_key:
             try:
-                self.groq_client = Groq(api_key=groq_api_key)
+                self.groq_client = GroqClient(groq_api_key)
                 logger.info("✅ Groq client initialized (Fallback Provider)")
+                status = self.groq_client.health_status()
+                if status and not status.healthy:
+                    logger.warning(f"⚠️ Groq last health check failed: {status.error}")
             except Exception as e:
                 logger.warning(f"Failed to initialize Groq: {str(e)}")
         
         # Validate at least one provider is available
         if not self.euriai_client and not self.groq_client:
             raise ValueError("❌ No AI providers available. Please provide valid API keys.")
+        
+        # Euriai preferred; routing switches when its circuit opens or it is clearly slower
+        self.router = ProviderRouter(
+            [name for name, client in (("Euriai", self.euriai_client), ("Groq", self.groq_client)) if client]
+        )
+        
+        # Parsed results keyed on CV text, JD, criteria and models
+        self.analysis_cache = cache or get_analysis_cache()
+        self.models = [f"{name}:{client.model}" for name, client in
+                       (("Euriai", self.euriai_client), ("Groq", self.groq_client)) if client]
+    
+    def _analysis_key(self, cv_text: str) -> str:
+        return analysis_key("professional", cv_text, MEL_MANAGER_JOB_DESCRIPTION, SCORING_CRITERIA, self.models)
     
     def count_tokens(self, text: str) -> int:
         """Estimate token count for text"""
@@ -174,38 +214,53 @@ Provide a detailed analysis in the following JSON format:
 IMPORTANT: Respond with ONLY the JSON object, no other text.
 """
     
+    def _build_messages(self, cv_text: str, filename: str) -> List[Dict[str, str]]:
+        """Build chat messages, truncating CVs whose prompt would be too long"""
+        prompt = self.create_analysis_prompt(cv_text)
+        
+        if self.count_tokens(prompt) > MAX_PROMPT_TOKENS:
+            logger.warning(f"Prompt too long for {filename}, truncating")
+            cv_text = truncate_text(cv_text, TRUNCATED_CV_CHARS)
+            prompt = self.create_analysis_prompt(cv_text)
+        
+        return [
+            {"role": "system", "content": "You are an expert HR consultant. Respond with ONLY valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _parse_provider_response(self, content: str, filename: str, provider: str) -> Optional[CVAnalysisResult]:
+        """Parse a provider's JSON reply into an analysis result"""
+        content = self._extract_json_from_response(content.strip())
+        
+        try:
+            result_data = json.loads(content)
+            return self._create_analysis_result(filename, result_data, provider)
+        except json.JSONDecodeError as e:
+            logger.error(f"{provider} JSON error for {filename}: {str(e)}")
+            return None
+    
+    def _accept_response(self, client, messages: List[Dict[str, str]], content: str, filename: str,
+                         provider: str) -> Optional[CVAnalysisResult]:
+        """Parse a reply; only usable analyses go into the response cache"""
+        result = self._parse_provider_response(content, filename, provider)
+        if result is not None:
+            client.cache_response(messages, content, temperature=0.1, max_tokens=2000)
+        return result
+    
     async def analyze_with_euriai(self, cv_text: str, filename: str) -> Optional[CVAnalysisResult]:
         """Analyze CV using Euriai API"""
         if not self.euriai_client:
             return None
         
+        messages = self._build_messages(cv_text, filename)
         try:
-            prompt = self.create_analysis_prompt(cv_text)
-            
-            if self.count_tokens(prompt) > 7000:
-                logger.warning(f"Prompt too long for {filename}, truncating")
-                cv_text = cv_text[:3000] + "...[truncated]"
-                prompt = self.create_analysis_prompt(cv_text)
-            
-            messages = [
-                {"role": "system", "content": "You are an expert HR consultant. Respond with ONLY valid JSON."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            content = self.euriai_client.chat_completion(
+            content = await self.euriai_client.achat_completion(
                 messages=messages,
                 temperature=0.1,
-                max_tokens=2000
+                max_tokens=2000,
+                store=False
             )
-            
-            content = self._extract_json_from_response(content.strip())
-            
-            try:
-                result_data = json.loads(content)
-                return self._create_analysis_result(filename, result_data, "Euriai")
-            except json.JSONDecodeError as e:
-                logger.error(f"Euriai JSON error for {filename}: {str(e)}")
-                return None
+            return self._accept_response(self.euriai_client, messages, content, filename, "Euriai")
                 
         except Exception as e:
             logger.error(f"Euriai analysis error for {filename}: {str(e)}")
@@ -216,32 +271,15 @@ IMPORTANT: Respond with ONLY the JSON object, no other text.
         if not self.groq_client:
             return None
         
+        messages = self._build_messages(cv_text, filename)
         try:
-            prompt = self.create_analysis_prompt(cv_text)
-            
-            if self.count_tokens(prompt) > 7000:
-                cv_text = cv_text[:3000] + "...[truncated]"
-                prompt = self.create_analysis_prompt(cv_text)
-            
-            response = self.groq_client.chat.completions.create(
-                model="llama3-70b-8192",
-                messages=[
-                    {"role": "system", "content": "You are an expert HR consultant. Respond with ONLY valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
+            content = await self.groq_client.achat_completion(
+                messages=messages,
                 temperature=0.1,
-                max_tokens=2000
+                max_tokens=2000,
+                store=False
             )
-            
-            content = response.choices[0].message.content.strip()
-            content = self._extract_json_from_response(content)
-            
-            try:
-                result_data = json.loads(content)
-                return self._create_analysis_result(filename, result_data, "Groq")
-            except json.JSONDecodeError as e:
-                logger.error(f"Groq JSON error for {filename}: {str(e)}")
-                return None
+            return self._accept_response(self.groq_client, messages, content, filename, "Groq")
                 
         except Exception as e:
             logger.error(f"Groq analysis error for {filename}: {str(e)}")
@@ -284,83 +322,274 @@ IMPORTANT: Respond with ONLY the JSON object, no other text.
             ai_provider=provider
         )
     
-    async def analyze_cv(self, cv_text: str, filename: str) -> Optional[CVAnalysisResult]:
-        """Analyze CV using best available provider"""
+    def _create_local_result(self, filename: str, local: LocalScore) -> CVAnalysisResult:
+        """Analysis result from the local keyword scorer"""
+        return CVAnalysisResult(
+            filename=filename,
+            overall_score=local.overall_score,
+            category_scores=local.category_scores,
+            strengths=local.strengths(),
+            weaknesses=local.weaknesses(),
+            recommendations=["Re-run with an AI provider for a full assessment"],
+            key_qualifications={
+                "highest_education": local.highest_degree or "Not detected",
+                "years_of_experience": str(local.years_experience),
+                "mel_experience": ", ".join(local.matched.get("experience", [])),
+                "technical_expertise": ", ".join(local.matched.get("technical_skills", [])),
+                "sector_focus": ", ".join(local.matched.get("sector_knowledge", []))
+            },
+            experience_summary=f"About {local.years_experience} years of experience detected",
+            education_summary=f"Highest degree detected: {local.highest_degree or 'none'}",
+            technical_skills=local.matched.get("technical_skills", []),
+            fit_assessment=LOCAL_SUMMARY,
+            ranking_tier=local.tier,
+            ai_provider=LOCAL_PROVIDER
+        )
+    
+    def _local_fallback(self, cv_text: str, filename: str) -> Optional[CVAnalysisResult]:
+        """Local keyword score when every provider failed (not cached, so the next run retries the AI)"""
+        if not LOCAL_FALLBACK:
+            return None
+        result = self._create_local_result(filename, get_local_scorer().score(cv_text))
+        logger.warning(f"🧮 {filename} scored locally - Score: {result.overall_score:.1f}")
+        return result
+    
+    def score_locally(self, cv_data: List[Dict]) -> List[CVAnalysisResult]:
+        """Score a whole batch with the local scorer, without calling any provider"""
+        valid = [cv_item for _, cv_item in self._analyzable(cv_data)]
+        scores = get_local_scorer().score_batch([cv_item["text"] for cv_item in valid])
+        return [self._create_local_result(cv_item["filename"], local) for cv_item, local in zip(valid, scores)]
+    
+    def _score_failures_locally(self, failed: List[Tuple[int, Dict]]) -> List[Tuple[int, Dict, CVAnalysisResult]]:
+        """(index, cv_item, local result) for the CVs every provider failed on, scored as one batch"""
+        if not failed or not LOCAL_FALLBACK:
+            return []
+        logger.warning(f"🧮 Scoring {len(failed)} CVs locally after provider failures")
+        results = self.score_locally([cv_item for _, cv_item in failed])
+        return [(index, cv_item, result) for (index, cv_item), result in zip(failed, results)]
+    
+    def _hedge_delay(self, order: List[str]) -> Optional[float]:
+        """Seconds to give the first provider before hedging to the second (None = no hedge)"""
+        if not self.hedge or len(order) < 2:
+            return None
+        return self.hedge_policy.delay_for(order[0])
+    
+    async def analyze_cv(self, cv_text: str, filename: str, local_fallback: bool = True) -> Optional[CVAnalysisResult]:
+        """
+        Analyze CV using best available provider, reusing cached results for identical content
+        
+        local_fallback=False returns None when every provider fails, for batch
+        callers that score their failures locally in one pass.
+        """
+        key = self._analysis_key(cv_text)
+        cached = self.analysis_cache.get_result(key, filename)
+        if cached:
+            logger.info(f"♻️ {filename} served from analysis cache - Score: {cached.overall_score:.1f}")
+            return cached
+        
+        result = await self._route_cv(cv_text, filename)
+        if result:
+            self.analysis_cache.put_result(key, result)
+        elif local_fallback:
+            result = self._local_fallback(cv_text, filename)
+        return result
+    
+    async def _route_cv(self, cv_text: str, filename: str) -> Optional[CVAnalysisResult]:
+        """Try providers in router order (with optional hedging)"""
         logger.info(f"Analyzing CV: {filename}")
         
-        # Try Euriai first (primary provider)
-        if self.euriai_client:
-            result = await self.analyze_with_euriai(cv_text, filename)
+        analyzers = {"Euriai": self.analyze_with_euriai, "Groq": self.analyze_with_groq}
+        
+        # Healthiest provider first; providers with an open circuit are skipped
+        order = self.router.order()
+        delay = self._hedge_delay(order)
+        if delay is not None:
+            primary, secondary = order[0], order[1]
+            result = await hedged_call(lambda: analyzers[primary](cv_text, filename),
+                                       lambda: analyzers[secondary](cv_text, filename), delay)
             if result:
-                logger.info(f"✅ {filename} analyzed with Euriai - Score: {result.overall_score:.1f}")
+                logger.info(f"✅ {filename} analyzed with {result.ai_provider} - Score: {result.overall_score:.1f}")
                 return result
-            else:
-                logger.warning(f"⚠️ Euriai failed for {filename}, trying Groq")
+            order = order[2:]
         
-        # Fallback to Groq
-        if self.groq_client:
-            result = await self.analyze_with_groq(cv_text, filename)
+        for provider in order:
+            result = await analyzers[provider](cv_text, filename)
             if result:
-                logger.info(f"✅ {filename} analyzed with Groq - Score: {result.overall_score:.1f}")
+                logger.info(f"✅ {filename} analyzed with {provider} - Score: {result.overall_score:.1f}")
                 return result
-            else:
-                logger.error(f"❌ Groq also failed for {filename}")
+            logger.warning(f"⚠️ {provider} failed for {filename}")
         
         logger.error(f"❌ All providers failed for {filename}")
         return None
     
-    def batch_analyze(self, cv_data: List[Dict]) -> List[CVAnalysisResult]:
-        """Analyze batch of CVs with rate limiting (synchronous version)"""
-        all_results = []
-        total = len(cv_data)
-
-        logger.info(f"Starting professional CV analysis of {total} CVs")
-
-        for i, cv_item in enumerate(cv_data, 1):
+    async def analyze_batch(self, cv_data: List[Dict], max_concurrency: int = None,
+                            on_result: Callable[[int, Dict, Optional[CVAnalysisResult]], None] = None
+                            ) -> List[CVAnalysisResult]:
+        """Analyze CVs concurrently, with at most max_concurrency requests in flight
+        
+        on_result(index, cv_item, result) is called in the event loop as each CV finishes;
+        CVs every provider failed on are scored locally as one batch at the end.
+        Results are returned in input order; failed CVs are omitted.
+        """
+        max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        semaphore = asyncio.Semaphore(max_concurrency)
+        valid = [(i, cv) for i, cv in enumerate(cv_data) if not cv.get("error") and cv.get("text")]
+        
+        logger.info(f"Starting concurrent analysis of {len(valid)} CVs ({max_concurrency} in flight)")
+        
+        async def run(index: int, cv_item: Dict) -> Optional[CVAnalysisResult]:
+            async with semaphore:
+                result = await self.analyze_cv(cv_item["text"], cv_item["filename"], local_fallback=False)
+            if on_result and (result or not LOCAL_FALLBACK):
+                on_result(index, cv_item, result)
+            return result
+        
+        try:
+            results = await asyncio.gather(*(run(i, cv) for i, cv in valid))
+        finally:
+            # Async clients are bound to this loop; close them before asyncio.run discards it
+            await self.aclose()
+        
+        failed = [(position, cv_item) for position, ((_, cv_item), result) in enumerate(zip(valid, results))
+                  if not result]
+        for position, cv_item, result in self._score_failures_locally(failed):
+            results[position] = result
+            if on_result:
+                on_result(valid[position][0], cv_item, result)
+        analyzed = [r for r in results if r]
+        
+        logger.info(f"🎉 Analysis complete: {len(analyzed)}/{len(valid)} CVs analyzed")
+        if self.hedge:
+            logger.info(f"📊 Hedging metrics: {hedge_metrics.snapshot()}")
+        logger.info(f"📊 Response cache: {get_response_cache().stats()}")
+        logger.info(f"📊 Analysis cache: {self.analysis_cache.stats()}")
+        return analyzed
+    
+    async def aclose(self):
+        """Close the providers' async connections for the running event loop"""
+        for client in (self.euriai_client, self.groq_client):
+            if client:
+                await client.aclose()
+    
+    def _analyzable(self, cv_data: List[Dict]) -> List[Tuple[int, Dict]]:
+        """(index, cv_item) pairs with extracted text, logging the ones skipped"""
+        valid = []
+        for i, cv_item in enumerate(cv_data):
             if cv_item.get("error") or not cv_item.get("text"):
                 logger.warning(f"Skipping {cv_item['filename']} due to processing error")
+            else:
+                valid.append((i, cv_item))
+        return valid
+    
+    def iter_analyze(self, cv_data: List[Dict], max_workers: int = None,
+                     cancel_token: CancellationToken = None, local_fallback: bool = True
+                     ) -> Iterator[Tuple[int, Dict, Optional[CVAnalysisResult]]]:
+        """Analyze CVs on worker threads, yielding (index, cv_item, result) as each completes"""
+        valid = self._analyzable(cv_data)
+        
+        def analyze(entry: Tuple[int, Dict]) -> Optional[CVAnalysisResult]:
+            cv_item = entry[1]
+            return self.analyze_cv_sync(cv_item["text"], cv_item["filename"], local_fallback)
+        
+        for _, (index, cv_item), result in iter_concurrent(analyze, valid, max_workers or DEFAULT_MAX_CONCURRENCY,
+                                                           cancel_token):
+            yield index, cv_item, result
+    
+    def stream_analyze(self, documents: Iterable[Dict], max_workers: int = None, queue_size: int = None,
+                       cancel_token: CancellationToken = None
+                       ) -> Iterator[Tuple[Dict, Optional[CVAnalysisResult]]]:
+        """Analyze documents while they are still being extracted, yielding (cv_item, result)"""
+        def analyze(cv_item: Dict) -> Optional[CVAnalysisResult]:
+            return self.analyze_cv_sync(cv_item["text"], cv_item["filename"])
+        
+        return run_pipeline(documents, analyze, max_workers or DEFAULT_MAX_CONCURRENCY, queue_size, cancel_token)
+    
+    def batch_analyze(self, cv_data: List[Dict], max_workers: int = None,
+                      progress_callback: Callable[[int, int, Dict, Optional[CVAnalysisResult]], None] = None,
+                      cancel_token: CancellationToken = None) -> List[CVAnalysisResult]:
+        """
+        Analyze a batch of CVs with max_workers concurrent requests
+        
+        progress_callback(completed, total, cv_item, result) runs in the calling
+        thread after each analyzable CV; CVs every provider failed on are scored
+        locally as one batch at the end. Results are returned in input order;
+        a cancelled batch returns the CVs finished so far.
+        """
+        total = len(cv_data)
+        logger.info(f"Starting professional CV analysis of {total} CVs")
+        analyzable = sum(1 for cv_item in cv_data if not cv_item.get("error") and cv_item.get("text"))
+        
+        results: Dict[int, CVAnalysisResult] = {}
+        failed: List[Tuple[int, Dict]] = []
+        completed = 0
+        for index, cv_item, result in self.iter_analyze(cv_data, max_workers, cancel_token, local_fallback=False):
+            if not result and LOCAL_FALLBACK:
+                failed.append((index, cv_item))
                 continue
-
-            # Use synchronous version
-            result = self.analyze_cv_sync(cv_item["text"], cv_item["filename"])
-
+            completed += 1
             if result:
-                all_results.append(result)
-
+                results[index] = result
+            if progress_callback:
+                progress_callback(completed, analyzable, cv_item, result)
+            
             # Progress logging
-            if i % 10 == 0:
-                success_rate = len(all_results) / i * 100
-                logger.info(f"📊 Progress: {i}/{total} processed, {len(all_results)} successful ({success_rate:.1f}%)")
-
-            # Rate limiting
-            if i < total:
-                import time
-                time.sleep(2)
-
+            if completed % 10 == 0:
+                success_rate = len(results) / completed * 100
+                logger.info(f"📊 Progress: {completed}/{total} processed, {len(results)} successful ({success_rate:.1f}%)")
+        
+        for index, cv_item, result in self._score_failures_locally(failed):
+            completed += 1
+            results[index] = result
+            if progress_callback:
+                progress_callback(completed, analyzable, cv_item, result)
+        
+        all_results = [results[i] for i in sorted(results)]
         logger.info(f"🎉 Analysis complete: {len(all_results)}/{total} CVs analyzed")
+        if self.hedge:
+            logger.info(f"📊 Hedging metrics: {hedge_metrics.snapshot()}")
+        logger.info(f"📊 Response cache: {get_response_cache().stats()}")
+        logger.info(f"📊 Analysis cache: {self.analysis_cache.stats()}")
         return all_results
 
-    def analyze_cv_sync(self, cv_text: str, filename: str) -> Optional[CVAnalysisResult]:
+    def analyze_cv_sync(self, cv_text: str, filename: str, local_fallback: bool = True) -> Optional[CVAnalysisResult]:
         """Synchronous version of CV analysis"""
+        key = self._analysis_key(cv_text)
+        cached = self.analysis_cache.get_result(key, filename)
+        if cached:
+            logger.info(f"♻️ {filename} served from analysis cache - Score: {cached.overall_score:.1f}")
+            return cached
+
+        result = self._route_cv_sync(cv_text, filename)
+        if result:
+            self.analysis_cache.put_result(key, result)
+        elif local_fallback:
+            result = self._local_fallback(cv_text, filename)
+        return result
+
+    def _route_cv_sync(self, cv_text: str, filename: str) -> Optional[CVAnalysisResult]:
+        """Synchronous provider routing for analyze_cv_sync"""
         logger.info(f"Analyzing CV: {filename}")
 
-        # Try Euriai first (primary provider)
-        if self.euriai_client:
-            result = self.analyze_with_euriai_sync(cv_text, filename)
+        analyzers = {"Euriai": self.analyze_with_euriai_sync, "Groq": self.analyze_with_groq_sync}
+
+        # Healthiest provider first; providers with an open circuit are skipped
+        order = self.router.order()
+        delay = self._hedge_delay(order)
+        if delay is not None:
+            primary, secondary = order[0], order[1]
+            result = hedged_call_sync(lambda: analyzers[primary](cv_text, filename),
+                                      lambda: analyzers[secondary](cv_text, filename), delay)
             if result:
-                logger.info(f"✅ {filename} analyzed with Euriai - Score: {result.overall_score:.1f}")
+                logger.info(f"✅ {filename} analyzed with {result.ai_provider} - Score: {result.overall_score:.1f}")
                 return result
-            else:
-                logger.warning(f"⚠️ Euriai failed for {filename}, trying Groq")
+            order = order[2:]
 
-        # Fallback to Groq
-        if self.groq_client:
-            result = self.analyze_with_groq_sync(cv_text, filename)
+        for provider in order:
+            result = analyzers[provider](cv_text, filename)
             if result:
-                logger.info(f"✅ {filename} analyzed with Groq - Score: {result.overall_score:.1f}")
+                logger.info(f"✅ {filename} analyzed with {provider} - Score: {result.overall_score:.1f}")
                 return result
-            else:
-                logger.error(f"❌ Groq also failed for {filename}")
+            logger.warning(f"⚠️ {provider} failed for {filename}")
 
         logger.error(f"❌ All providers failed for {filename}")
         return None
@@ -370,33 +599,15 @@ IMPORTANT: Respond with ONLY the JSON object, no other text.
         if not self.euriai_client:
             return None
 
+        messages = self._build_messages(cv_text, filename)
         try:
-            prompt = self.create_analysis_prompt(cv_text)
-
-            if self.count_tokens(prompt) > 7000:
-                logger.warning(f"Prompt too long for {filename}, truncating")
-                cv_text = cv_text[:3000] + "...[truncated]"
-                prompt = self.create_analysis_prompt(cv_text)
-
-            messages = [
-                {"role": "system", "content": "You are an expert HR consultant. Respond with ONLY valid JSON."},
-                {"role": "user", "content": prompt}
-            ]
-
             content = self.euriai_client.chat_completion(
                 messages=messages,
                 temperature=0.1,
-                max_tokens=2000
+                max_tokens=2000,
+                store=False
             )
-
-            content = self._extract_json_from_response(content.strip())
-
-            try:
-                result_data = json.loads(content)
-                return self._create_analysis_result(filename, result_data, "Euriai")
-            except json.JSONDecodeError as e:
-                logger.error(f"Euriai JSON error for {filename}: {str(e)}")
-                return None
+            return self._accept_response(self.euriai_client, messages, content, filename, "Euriai")
 
         except Exception as e:
             logger.error(f"Euriai analysis error for {filename}: {str(e)}")
@@ -407,32 +618,15 @@ IMPORTANT: Respond with ONLY the JSON object, no other text.
         if not self.groq_client:
             return None
 
+        messages = self._build_messages(cv_text, filename)
         try:
-            prompt = self.create_analysis_prompt(cv_text)
-
-            if self.count_tokens(prompt) > 7000:
-                cv_text = cv_text[:3000] + "...[truncated]"
-                prompt = self.create_analysis_prompt(cv_text)
-
-            response = self.groq_client.chat.completions.create(
-                model="llama3-70b-8192",
-                messages=[
-                    {"role": "system", "content": "You are an expert HR consultant. Respond with ONLY valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
+            content = self.groq_client.chat_completion(
+                messages=messages,
                 temperature=0.1,
-                max_tokens=2000
+                max_tokens=2000,
+                store=False
             )
-
-            content = response.choices[0].message.content.strip()
-            content = self._extract_json_from_response(content)
-
-            try:
-                result_data = json.loads(content)
-                return self._create_analysis_result(filename, result_data, "Groq")
-            except json.JSONDecodeError as e:
-                logger.error(f"Groq JSON error for {filename}: {str(e)}")
-                return None
+            return self._accept_response(self.groq_client, messages, content, filename, "Groq")
 
         except Exception as e:
             logger.error(f"Groq analysis error for {filename}: {str(e)}")
@@ -0,0 +1,74 @@
+"""
+Cache of parsed CV analysis results
+
+A result is keyed on a hash of the extracted CV text, the job description, the
+scoring criteria and the provider models, so renamed files and re-uploads of
+the same document are hits, while any change to the JD, criteria or models
+produces a new key (old entries simply age out of the LRU).
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import logging
+import threading
+from dataclasses import replace
+from typing import Any, Dict, Iterable, Optional
+
+from utils.response_cache import CACHE_DIR, SQLiteLRUCache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump when CVAnalysisResult / FlexibleAnalysisResult or the prompts change shape
+ANALYSIS_SCHEMA_VERSION = 1
+
+def analysis_key(kind: str, cv_text: str, job_description: str, criteria: Dict[str, Any],
+                 models: Iterable[str]) -> str:
+    """Content hash identifying one analysis"""
+    fingerprint = json.dumps({
+        "kind": kind,
+        "schema": ANALYSIS_SCHEMA_VERSION,
+        "cv": hashlib.sha256(cv_text.encode("utf-8")).hexdigest(),
+        "job_description": hashlib.sha256(job_description.encode("utf-8")).hexdigest(),
+        "criteria": criteria,
+        "models": sorted(models)
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+class AnalysisCache(SQLiteLRUCache):
+    """Pickled analysis results, returned under the caller's filename"""
+
+    def get_result(self, key: str, filename: str, **changes) -> Optional[Any]:
+        value = self.get(key)
+        if value is None:
+            return None
+        try:
+            result = pickle.loads(value)
+        except Exception as e:
+            # Written by an incompatible version of the result class
+            logger.warning(f"⚠️ Dropping unreadable cached analysis: {str(e)}")
+            self.delete(key)
+            return None
+        return replace(result, filename=filename, **changes)
+
+    def put_result(self, key: str, result: Any) -> None:
+        self.put(key, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+
+_analysis_cache = None
+_analysis_cache_lock = threading.Lock()
+
+def get_analysis_cache() -> AnalysisCache:
+    """Process-wide analysis cache (ANALYSIS_CACHE_PATH, ANALYSIS_CACHE_MAX_MB, ANALYSIS_CACHE_DISABLED)"""
+    global _analysis_cache
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            enabled = os.getenv("ANALYSIS_CACHE_DISABLED", "false").lower() not in ("1", "true", "yes")
+            path = os.getenv("ANALYSIS_CACHE_PATH", os.path.join(CACHE_DIR, "analysis_results.sqlite"))
+            _analysis_cache = AnalysisCache(
+                path if enabled else ":memory:",
+                max_bytes=int(float(os.getenv("ANALYSIS_CACHE_MAX_MB", "100")) * 1024 * 1024),
+                enabled=enabled
+            )
+        return _analysis_cache
@@ -0,0 +1,71 @@
+"""
+Concurrent batch execution with streaming results
+
+Work items run on a thread pool; results are yielded to the caller as they
+complete, so progress callbacks (and Streamlit updates) always run in the
+consuming thread. Closing the iterator early, or cancelling its token, stops
+submitting new work and cancels everything still queued.
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterator, Optional, Sequence, Tuple, TypeVar
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_WORKERS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "5"))
+
+class CancellationToken:
+    """Thread-safe flag for stopping a running batch"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+def iter_concurrent(fn: Callable[[T], R], items: Sequence[T], max_workers: int = None,
+                    cancel_token: CancellationToken = None) -> Iterator[Tuple[int, T, Optional[R]]]:
+    """Yield (index, item, fn(item)) in completion order, with at most max_workers calls in flight"""
+    max_workers = max(1, max_workers or DEFAULT_MAX_WORKERS)
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch")
+    pending = {}
+    next_index = 0
+
+    def call(item: T) -> Optional[R]:
+        try:
+            return fn(item)
+        except Exception as e:
+            logger.error(f"❌ Batch item failed: {str(e)}")
+            return None
+
+    try:
+        while True:
+            # Keep the pool busy without queueing the whole batch up front
+            while next_index < len(items) and len(pending) < max_workers and not (cancel_token and cancel_token.cancelled):
+                pending[executor.submit(call, items[next_index])] = next_index
+                next_index += 1
+            if not pending:
+                break
+
+            done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                yield index, items[index], future.result()
+
+            if cancel_token and cancel_token.cancelled and next_index < len(items):
+                logger.info(f"🛑 Batch cancelled: {len(items) - next_index} items not started")
+                next_index = len(items)
+    finally:
+        # In-flight calls finish in the background; their results are discarded
+        executor.shutdown(wait=False, cancel_futures=True)
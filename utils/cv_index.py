@@ -0,0 +1,222 @@
+"""
+Persistent BM25 index over every CV the document processor has extracted
+
+Each extracted CV is stored once (keyed by a hash of its text) with its
+term frequencies in an SQLite inverted index. A job description is then a
+query: search ranks the whole candidate pool with Okapi BM25 in
+milliseconds and without network calls, and the shortlist (text included)
+can go straight to FlexibleCVAnalyzer.batch_analyze.
+
+The pool is bounded: CVs not seen for CV_INDEX_MAX_AGE_DAYS are dropped, and
+beyond CV_INDEX_MAX_DOCS the least recently seen CVs are evicted.
+"""
+
+import os
+import math
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from utils.admission import ENGLISH_STOPWORDS, PLACEHOLDER_PREFIXES
+from utils.keyword_screen import tokenize
+from utils.response_cache import CACHE_DIR
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CV_INDEX_SHORTLIST = int(os.getenv("CV_INDEX_SHORTLIST", "25"))
+CV_INDEX_MAX_DOCS = int(os.getenv("CV_INDEX_MAX_DOCS", "5000"))
+CV_INDEX_MAX_AGE_DAYS = float(os.getenv("CV_INDEX_MAX_AGE_DAYS", "180"))
+
+# Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+def index_terms(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords and one-letter noise"""
+    return [token for token in tokenize(text) if len(token) > 1 and token not in ENGLISH_STOPWORDS]
+
+class CVIndex:
+    """Thread-safe SQLite inverted index of extracted CVs with BM25 search"""
+
+    def __init__(self, path: str, enabled: bool = True, max_docs: int = None, max_age_days: float = None):
+        self.path = path
+        self.enabled = enabled
+        # 0 = unbounded
+        self.max_docs = CV_INDEX_MAX_DOCS if max_docs is None else max_docs
+        self.max_age_days = CV_INDEX_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        self.lock = threading.Lock()
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "doc_id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL, filename TEXT NOT NULL, file_path TEXT, "
+            "text TEXT NOT NULL, length INTEGER NOT NULL, added REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "term TEXT NOT NULL, doc_id INTEGER NOT NULL, tf INTEGER NOT NULL, PRIMARY KEY (term, doc_id)"
+            ") WITHOUT ROWID"
+        )
+        # Eviction and remove() delete postings by document
+        self.conn.execute("CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS documents_added ON documents (added)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS documents_filename ON documents (filename)")
+        with self.lock:
+            self._evict()
+            self.conn.commit()
+
+    def add(self, cv_item: Dict) -> bool:
+        """
+        Index an extracted CV; returns False when it is unusable, truncated or already indexed
+
+        Re-adding an indexed CV marks it as recently seen.
+        """
+        text = cv_item.get("text") or ""
+        if not self.enabled or cv_item.get("error") or cv_item.get("truncated") or not text.strip():
+            return False
+        if text.lstrip().startswith(PLACEHOLDER_PREFIXES):
+            return False
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM documents WHERE key = ?", (key,)).fetchone():
+                self.conn.execute("UPDATE documents SET added = ? WHERE key = ?", (time.time(), key))
+                self.conn.commit()
+                return False
+            terms = Counter(index_terms(text))
+            cursor = self.conn.execute(
+                "INSERT INTO documents (key, filename, file_path, text, length, added) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, cv_item.get("filename", ""), cv_item.get("file_path", ""), text,
+                 sum(terms.values()), time.time())
+            )
+            self.conn.executemany("INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                                  [(term, cursor.lastrowid, tf) for term, tf in terms.items()])
+            self._evict()
+            self.conn.commit()
+        return True
+
+    def _delete(self, doc_ids: List[int]) -> int:
+        """Drop documents and their postings (caller holds the lock and commits)"""
+        for start in range(0, len(doc_ids), 500):
+            chunk = doc_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            self.conn.execute(f"DELETE FROM postings WHERE doc_id IN ({placeholders})", chunk)
+            self.conn.execute(f"DELETE FROM documents WHERE doc_id IN ({placeholders})", chunk)
+        return len(doc_ids)
+
+    def _evict(self) -> None:
+        """Drop CVs not seen within max_age_days, then the least recently seen beyond max_docs"""
+        evicted = 0
+        if self.max_age_days:
+            cutoff = time.time() - self.max_age_days * 86400
+            evicted += self._delete([row[0] for row in self.conn.execute(
+                "SELECT doc_id FROM documents WHERE added < ?", (cutoff,)
+            )])
+        if self.max_docs:
+            excess = self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0] - self.max_docs
+            if excess > 0:
+                evicted += self._delete([row[0] for row in self.conn.execute(
+                    "SELECT doc_id FROM documents ORDER BY added, doc_id LIMIT ?", (excess,)
+                )])
+        if evicted:
+            logger.info(f"🗂️ CV index: evicted {evicted} CVs")
+
+    def search(self, query: str, limit: int = None) -> List[Dict]:
+        """
+        Rank indexed CVs against a query (e.g. a job description)
+
+        Returns up to limit CV dicts (filename, file_path, text, word_count,
+        bm25_score), best first; CVs sharing no term with the query are left out.
+        """
+        limit = limit or CV_INDEX_SHORTLIST
+        terms = sorted(set(index_terms(query)))
+        if not self.enabled or not terms:
+            return []
+        placeholders = ",".join("?" * len(terms))
+        with self.lock:
+            total, average_length = self.conn.execute("SELECT COUNT(*), AVG(length) FROM documents").fetchone()
+            if not total:
+                return []
+            frequencies = dict(self.conn.execute(
+                f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term", terms
+            ))
+            postings = self.conn.execute(
+                f"SELECT p.term, p.doc_id, p.tf, d.length FROM postings p JOIN documents d USING (doc_id) "
+                f"WHERE p.term IN ({placeholders})", terms
+            ).fetchall()
+
+        if not postings:
+            return []
+        # One vectorized BM25 pass over all matching postings
+        idf = {term: math.log(1 + (total - df + 0.5) / (df + 0.5)) for term, df in frequencies.items()}
+        term_idf = np.fromiter((idf[row[0]] for row in postings), dtype=np.float64, count=len(postings))
+        doc_ids, tf, length = (np.array(column, dtype=np.float64) for column in list(zip(*postings))[1:])
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (average_length or 1))
+        contributions = term_idf * tf * (BM25_K1 + 1) / (tf + norm)
+        unique_ids, positions = np.unique(doc_ids.astype(np.int64), return_inverse=True)
+        scores = np.bincount(positions, weights=contributions)
+        order = np.lexsort((unique_ids, -scores))[:limit]
+        best = [(int(unique_ids[i]), float(scores[i])) for i in order]
+
+        ids = [doc_id for doc_id, _ in best]
+        with self.lock:
+            rows = {row[0]: row[1:] for row in self.conn.execute(
+                f"SELECT doc_id, filename, file_path, text FROM documents WHERE doc_id IN ({','.join('?' * len(ids))})",
+                ids
+            )}
+        return [
+            {"filename": rows[doc_id][0], "file_path": rows[doc_id][1], "text": rows[doc_id][2],
+             "word_count": len(rows[doc_id][2].split()), "bm25_score": round(score, 3)}
+            for doc_id, score in best
+        ]
+
+    def documents(self) -> List[Dict]:
+        """Indexed CVs (filename, file_path, added timestamp), most recently seen first"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT filename, file_path, added FROM documents ORDER BY added DESC, doc_id DESC"
+            ).fetchall()
+        return [{"filename": filename, "file_path": file_path, "added": added} for filename, file_path, added in rows]
+
+    def remove(self, filename: str) -> int:
+        """Remove every indexed CV with this filename; returns how many were removed"""
+        with self.lock:
+            doc_ids = [row[0] for row in self.conn.execute("SELECT doc_id FROM documents WHERE filename = ?",
+                                                           (filename,))]
+            removed = self._delete(doc_ids)
+            self.conn.commit()
+        return removed
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.conn.execute("DELETE FROM postings")
+            self.conn.execute("DELETE FROM documents")
+            self.conn.commit()
+
+_cv_index = None
+_cv_index_lock = threading.Lock()
+
+def get_cv_index() -> CVIndex:
+    """Process-wide CV index (CV_INDEX_PATH, CV_INDEX_DISABLED, CV_INDEX_MAX_DOCS, CV_INDEX_MAX_AGE_DAYS)"""
+    global _cv_index
+    with _cv_index_lock:
+        if _cv_index is None:
+            enabled = os.getenv("CV_INDEX_DISABLED", "false").lower() not in ("1", "true", "yes")
+            path = os.getenv("CV_INDEX_PATH", os.path.join(CACHE_DIR, "cv_index.sqlite"))
+            _cv_index = CVIndex(path if enabled else ":memory:", enabled=enabled)
+        return _cv_index
@@ -0,0 +1,136 @@
+"""
+Near-duplicate CV detection with MinHash and LSH
+
+Applicants often submit the same CV several times. Each document gets a
+MinHash signature over its word 5-gram shingles; LSH banding finds candidate
+matches without comparing every pair, and matches above the similarity
+threshold are merged with union-find. One representative per cluster is
+analyzed and its result is copied to the duplicates with duplicate_of set.
+"""
+
+import os
+import re
+import zlib
+import logging
+import dataclasses
+from collections import defaultdict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() in ("1", "true", "yes")
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.9"))
+
+_PRIME = np.uint64((1 << 61) - 1)
+_WORDS = re.compile(r"\w+")
+
+class MinHasher:
+    """MinHash signatures over word shingles"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        # a * x + b stays below 2**64 for 32-bit shingle hashes
+        self.a = rng.randint(1, 1 << 31, num_perm).astype(np.uint64)
+        self.b = rng.randint(0, 1 << 31, num_perm).astype(np.uint64)
+        self.shingle_size = shingle_size
+
+    def shingles(self, text: str) -> np.ndarray:
+        words = _WORDS.findall(text.lower())
+        k = self.shingle_size
+        grams = {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))}
+        return np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = self.shingles(text)
+        return ((np.outer(hashes, self.a) + self.b) % _PRIME).min(axis=0)
+
+class DuplicateIndex:
+    """Incremental near-duplicate index; the first document of a cluster is its representative"""
+
+    def __init__(self, threshold: float = None, num_perm: int = 128, bands: int = 16):
+        self.threshold = DEDUP_THRESHOLD if threshold is None else threshold
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(bands)]
+        self.signatures: Dict[Hashable, np.ndarray] = {}
+        self.parent: Dict[Hashable, Hashable] = {}
+        self.order: Dict[Hashable, int] = {}
+
+    def find(self, key: Hashable) -> Hashable:
+        root = key
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[key] != root:
+            self.parent[key], key = root, self.parent[key]
+        return root
+
+    def _union(self, a: Hashable, b: Hashable) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # The earliest document stays the representative
+            if self.order[rb] < self.order[ra]:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+    def add(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """Index a document; returns its cluster representative, or None when it has no near-duplicate"""
+        signature = self.hasher.signature(text)
+        band_keys = [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+        candidates = set()
+        for band, band_key in zip(self.buckets, band_keys):
+            candidates.update(band.get(band_key, ()))
+
+        self.signatures[key] = signature
+        self.parent[key] = key
+        self.order[key] = len(self.order)
+        for band, band_key in zip(self.buckets, band_keys):
+            band[band_key].append(key)
+
+        for candidate in candidates:
+            if np.mean(signature == self.signatures[candidate]) >= self.threshold:
+                self._union(key, candidate)
+        representative = self.find(key)
+        return None if representative == key else representative
+
+def dedupe_documents(cv_data: List[Dict], index: DuplicateIndex = None) -> Tuple[List[Dict], List[Tuple[Dict, Dict]]]:
+    """
+    Split documents into (unique, duplicates)
+
+    Each duplicate is paired with its cluster representative, which is in
+    unique. Everything is unique when DEDUP_ENABLED is off.
+    """
+    if not DEDUP_ENABLED:
+        return list(cv_data), []
+    index = index or DuplicateIndex()
+    unique, duplicates = [], []
+    for position, cv_item in enumerate(cv_data):
+        representative = index.add(position, cv_item.get("text", ""))
+        if representative is None:
+            unique.append(cv_item)
+        else:
+            duplicates.append((cv_item, cv_data[representative]))
+    if duplicates:
+        logger.info(f"🔁 {len(duplicates)} near-duplicate CVs will reuse their representative's analysis")
+    return unique, duplicates
+
+def document_key(cv_item: Dict) -> str:
+    """Identifies a document within a batch; zip members and files in different folders can share a filename"""
+    return cv_item.get("file_path") or cv_item["filename"]
+
+def fan_out(analyzed: List[Tuple[Dict, Any]], duplicates: List[Tuple[Dict, Dict]]) -> List[Any]:
+    """
+    Results for (cv_item, result) pairs plus a copy of each representative's
+    result for its duplicates, linked through duplicate_of
+    """
+    by_document = {document_key(cv_item): result for cv_item, result in analyzed}
+    fanned = [result for _, result in analyzed]
+    for cv_item, representative in duplicates:
+        result = by_document.get(document_key(representative))
+        if result is not None:
+            fanned.append(dataclasses.replace(result, filename=cv_item["filename"],
+                                              duplicate_of=representative["filename"]))
+    return fanned
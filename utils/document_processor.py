@@ -3,56 +3,261 @@ Document processing utilities for extracting text from various file formats
 """
 
 import os
+import io
 import logging
 import zipfile
-import tempfile
-import shutil
-from typing import Dict, List, Optional
-import PyPDF2
-from docx import Document
+from xml.etree import ElementTree
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 import pandas as pd
-import streamlit as st
 from pathlib import Path
+from utils.extraction_cache import ExtractionCache, get_extraction_cache
+from utils.pdf_backends import PDFBackend, available_backends, get_backend
+from utils.isolated_pool import IsolatedPool
+from utils.cv_index import CVIndex
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Extraction processes used by process_directory (1 = extract in this process)
+DEFAULT_EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "1"))
+
+# Parse in separate processes (EXTRACTION_TIMEOUT, EXTRACTION_MEMORY_MB) even with one worker,
+# so a pathological file becomes an error row instead of hanging or crashing the batch
+EXTRACTION_ISOLATION = os.getenv("EXTRACTION_ISOLATION", "true").lower() in ("1", "true", "yes")
+
+# Per-document extraction limits (0 = unlimited); CVs rarely run past a few pages
+DEFAULT_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+DEFAULT_MAX_CHARS = int(os.getenv("EXTRACTION_MAX_CHARS", "0"))
+
+# Retry PDFs that come back empty with the other installed backends
+PDF_FALLBACK = os.getenv("PDF_FALLBACK", "true").lower() in ("1", "true", "yes")
+
+# Zip archive guards: CVs per archive, total and per-file uncompressed size
+ZIP_MAX_MEMBERS = int(os.getenv("ZIP_MAX_MEMBERS", "2000"))
+ZIP_MAX_TOTAL_MB = float(os.getenv("ZIP_MAX_TOTAL_MB", "1024"))
+ZIP_MAX_MEMBER_MB = float(os.getenv("ZIP_MAX_MEMBER_MB", "50"))
+
+TRUNCATION_MARKER = "...[truncated]"
+
+class ZipLimitError(ValueError):
+    """Zip archive exceeds the configured member count or size limits"""
+
+def truncate_text(text: str, max_chars: int, marker: str = TRUNCATION_MARKER) -> str:
+    """Cut text to a character budget, marking the cut"""
+    if not max_chars or len(text) <= max_chars:
+        return text
+    return text[:max_chars] + marker
+
+def read_pdf_pages(source: Union[str, BinaryIO], max_chars: int = None, max_pages: int = None,
+                   backend: PDFBackend = None) -> Tuple[str, int, int, bool]:
+    """
+    Extract PDF text page by page, stopping once a budget is met
+    
+    Returns (text, pages_read, page_count, truncated). Page texts are joined
+    once at the end, and pages past max_pages or after max_chars characters
+    have been collected are never parsed.
+    """
+    page_count, page_texts = (backend or get_backend()).pages(source)
+    limit = min(page_count, max_pages) if max_pages else page_count
+    parts = []
+    collected = 0
+    pages_read = 0
+    for page_text in page_texts:
+        if pages_read >= limit:
+            break
+        parts.append(page_text)
+        collected += len(page_text) + 1
+        pages_read += 1
+        if max_chars and collected >= max_chars:
+            break
+    text = "\n".join(parts).strip()
+    truncated = pages_read < page_count or bool(max_chars and len(text) > max_chars)
+    if max_chars:
+        text = text[:max_chars]
+    return text, pages_read, page_count, truncated
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_NS = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+def iter_docx_blocks(source: Union[str, BinaryIO]) -> Iterator[str]:
+    """
+    Stream the text of a DOCX body in document order
+    
+    Reads word/document.xml with a single iterparse pass instead of building
+    the python-docx object model. Each top-level paragraph is one block; each
+    table row is one block with its cells separated by spaces (nested tables
+    are flattened into their cell). Text box paragraphs follow the paragraph
+    that anchors them, in the same cell when it is in a table; the legacy
+    VML copy Word stores alongside each text box (mc:Fallback) is skipped.
+    """
+    with zipfile.ZipFile(source) as archive, archive.open("word/document.xml") as xml:
+        runs = []   # run texts of each open paragraph (a text box paragraph nests in its anchor's)
+        rows = []   # cell texts of each open table row (innermost last)
+        cells = []  # paragraph texts of each open table cell (innermost last)
+        boxed = []  # text box blocks waiting for their anchoring paragraph to end
+        in_properties = 0
+        in_text_box = 0
+        in_fallback = 0
+        for event, element in ElementTree.iterparse(xml, events=("start", "end")):
+            tag = element.tag
+            if tag == MC_NS + "Fallback":
+                in_fallback += 1 if event == "start" else -1
+                continue
+            if in_fallback:
+                continue
+            if event == "start":
+                if tag == W_NS + "p":
+                    runs.append([])
+                elif tag == W_NS + "tr":
+                    rows.append([])
+                elif tag == W_NS + "tc":
+                    cells.append([])
+                elif tag == W_NS + "pPr":
+                    # Tab stops are declared as w:tab inside paragraph properties
+                    in_properties += 1
+                elif tag == W_NS + "txbxContent":
+                    in_text_box += 1
+                continue
+            
+            if tag == W_NS + "t":
+                runs[-1].append(element.text or "")
+            elif tag == W_NS + "tab" and not in_properties:
+                runs[-1].append("\t")
+            elif tag in (W_NS + "br", W_NS + "cr"):
+                runs[-1].append("\n")
+            elif tag == W_NS + "pPr":
+                in_properties -= 1
+            elif tag == W_NS + "txbxContent":
+                in_text_box -= 1
+            elif tag == W_NS + "p":
+                text = "".join(runs.pop())
+                element.clear()
+                if in_text_box:
+                    boxed.append(text)
+                    continue
+                blocks = [text] + boxed
+                boxed.clear()
+                if cells:
+                    cells[-1].extend(blocks)
+                else:
+                    yield from blocks
+            elif tag == W_NS + "tc":
+                rows[-1].append("\n".join(cells.pop()))
+            elif tag == W_NS + "tr":
+                row = " ".join(rows.pop())
+                if cells:
+                    cells[-1].append(row)
+                elif in_text_box:
+                    boxed.append(row)
+                else:
+                    yield row
+                element.clear()
+
+def read_docx_text(source: Union[str, BinaryIO], max_chars: int = None) -> str:
+    """DOCX body text in document order; stops reading once max_chars are collected (callers cut)"""
+    blocks = []
+    collected = 0
+    for block in iter_docx_blocks(source):
+        blocks.append(block)
+        collected += len(block) + 1
+        if max_chars and collected >= max_chars:
+            break
+    return "\n".join(blocks).strip()
+
+_worker_processor = None
+
+def _get_worker_processor(max_chars: int, max_pages: int, pdf_backend: str) -> "DocumentProcessor":
+    """Each worker process keeps one DocumentProcessor, configured like the parent's"""
+    global _worker_processor
+    if _worker_processor is None:
+        # The parent looks up and stores cached results; workers only parse
+        _worker_processor = DocumentProcessor(cache=ExtractionCache(":memory:", 0, enabled=False))
+    _worker_processor.max_chars = max_chars
+    _worker_processor.max_pages = max_pages
+    _worker_processor.pdf_backend = get_backend(pdf_backend)
+    return _worker_processor
+
+def _process_file_in_worker(file_path: str, max_chars: int = None, max_pages: int = None,
+                            pdf_backend: str = None) -> Dict[str, str]:
+    """Process-pool entry point for files on disk"""
+    processor = _get_worker_processor(max_chars, max_pages, pdf_backend)
+    return processor._extract_file(file_path)
+
+def _process_content_in_worker(filename: str, file_path: str, data: bytes, max_chars: int = None,
+                               max_pages: int = None, pdf_backend: str = None) -> Dict[str, str]:
+    """Process-pool entry point for in-memory content (zip members)"""
+    processor = _get_worker_processor(max_chars, max_pages, pdf_backend)
+    return processor._extract_content(filename, file_path, data)
+
 class DocumentProcessor:
     """Process various document formats and extract text content"""
     
-    def __init__(self):
+    def __init__(self, workers: int = None, cache: ExtractionCache = None,
+                 max_chars: int = None, max_pages: int = None, pdf_backend: str = None,
+                 timeout: float = None, memory_mb: int = None, isolation: bool = None, index: CVIndex = None):
         self.supported_formats = ['.pdf', '.docx', '.doc']
+        self.workers = workers or DEFAULT_EXTRACTION_WORKERS
+        # Extraction budget, e.g. the analyzer's truncation length; 0 = unlimited
+        self.max_chars = DEFAULT_MAX_CHARS if max_chars is None else max_chars
+        self.max_pages = DEFAULT_MAX_PAGES if max_pages is None else max_pages
+        # PDF_BACKEND (default PyPDF2), or "auto" for the benchmark's choice
+        self.pdf_backend = get_backend(pdf_backend)
+        # Per-file limits for isolated extraction (None = EXTRACTION_TIMEOUT / EXTRACTION_MEMORY_MB)
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.isolation = EXTRACTION_ISOLATION if isolation is None else isolation
+        # Persistent text cache; unchanged files are not parsed again
+        self.cache = cache or get_extraction_cache()
+        # Optional searchable candidate pool (e.g. get_cv_index()); extracted CVs are added in this process
+        self.index = index
     
-    def extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
+    def _seen(self, result: Dict[str, str]) -> Dict[str, str]:
+        """Add an extraction result to the CV index (if any) and pass it through"""
+        if self.index is None:
+            return result
         try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text.strip()
+            self.index.add(result)
         except Exception as e:
-            logger.error(f"Error extracting text from PDF {file_path}: {str(e)}")
-            return ""
+            logger.warning(f"⚠️ Could not index {result.get('filename')}: {str(e)}")
+        return result
+    
+    def extract_text_from_pdf(self, file_path: str, max_chars: int = None, max_pages: int = None) -> str:
+        """Extract text from PDF file (limits default to the processor's)"""
+        return self._extract_pdf(file_path, max_chars, max_pages)[0]
+    
+    def _extract_pdf(self, source: Union[str, BinaryIO], max_chars: int = None,
+                     max_pages: int = None) -> Tuple[str, int, int, bool]:
+        """PDF text with (pages_read, page_count, truncated); empty on error"""
+        max_chars = self.max_chars if max_chars is None else max_chars
+        max_pages = self.max_pages if max_pages is None else max_pages
+        backends = [self.pdf_backend]
+        if PDF_FALLBACK:
+            backends += [get_backend(name) for name in available_backends() if name != self.pdf_backend.name]
+        
+        name = getattr(source, 'name', source)
+        for backend in backends:
+            try:
+                if isinstance(source, str):
+                    with open(source, 'rb') as file:
+                        extracted = read_pdf_pages(file, max_chars, max_pages, backend)
+                else:
+                    source.seek(0)
+                    extracted = read_pdf_pages(source, max_chars, max_pages, backend)
+            except Exception as e:
+                logger.error(f"Error extracting text from PDF {name} with {backend.name}: {str(e)}")
+                continue
+            if extracted[0]:
+                if backend is not self.pdf_backend:
+                    logger.info(f"📄 {backend.name} recovered text from {name}")
+                return extracted
+            logger.warning(f"⚠️ {backend.name} found no text in {name}")
+        return "", 0, 0, False
     
     def extract_text_from_docx(self, file_path: str) -> str:
         """Extract text from DOCX file"""
         try:
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += cell.text + " "
-                    text += "\n"
-            
-            return text.strip()
+            return read_docx_text(file_path, self.max_chars)
         except Exception as e:
             logger.error(f"Error extracting text from DOCX {file_path}: {str(e)}")
             return ""
@@ -71,8 +276,37 @@ class DocumentProcessor:
             logger.error(f"Error extracting text from DOC {file_path}: {str(e)}")
             return ""
     
-    def process_single_file(self, file_path: str) -> Dict[str, str]:
-        """Process a single file and return extracted text with metadata"""
+    def process_single_file(self, file_path: str, index: bool = True) -> Dict[str, str]:
+        """Process a single file and return extracted text with metadata (index=False for non-CVs, e.g. a JD)"""
+        result = self._cached_result(file_path)
+        if not result:
+            result = self._extract_file(file_path)
+            self._cache_result(file_path, result)
+        return self._seen(result) if index else result
+    
+    def _cached_result(self, file_path: str) -> Optional[Dict[str, str]]:
+        path = Path(file_path)
+        if not path.is_file() or path.suffix.lower() not in self.supported_formats:
+            return None
+        return self._within_limits(self.cache.get_file(str(path), self.pdf_backend.name))
+    
+    def _within_limits(self, result: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        """Apply this processor's limits to a cached (complete) result"""
+        if result is None:
+            return None
+        if self.max_pages and result.get("pages", 0) > self.max_pages:
+            return None
+        if self.max_chars and result["char_count"] > self.max_chars:
+            result["text"] = result["text"][:self.max_chars]
+            result.update(word_count=len(result["text"].split()), char_count=len(result["text"]), truncated=True)
+        return result
+    
+    def _cache_result(self, file_path: str, result: Dict[str, str]) -> None:
+        if not result.get("error") and not result.get("truncated"):
+            self.cache.put_file(str(file_path), result, self.pdf_backend.name)
+    
+    def _extract_file(self, file_path: str) -> Dict[str, str]:
+        """Parse a file (no cache)"""
         file_path = Path(file_path)
         
         if not file_path.exists():
@@ -87,8 +321,10 @@ class DocumentProcessor:
             return {"error": f"Unsupported format: {file_extension}", "text": "", "filename": filename}
         
         # Extract text based on file type
+        pages = None
+        truncated = False
         if file_extension == '.pdf':
-            text = self.extract_text_from_pdf(str(file_path))
+            text, pages, _, truncated = self._extract_pdf(str(file_path))
         elif file_extension == '.docx':
             text = self.extract_text_from_docx(str(file_path))
         elif file_extension == '.doc':
@@ -96,45 +332,228 @@ class DocumentProcessor:
         else:
             text = ""
         
-        return {
+        return self._build_result(filename, str(file_path), text, file_path.stat().st_size,
+                                  file_extension, pages, truncated)
+    
+    def _extract_content(self, filename: str, file_path: str, data: bytes) -> Dict[str, str]:
+        """Parse in-memory file content (no cache)"""
+        file_extension = os.path.splitext(filename)[1].lower()
+        if file_extension not in self.supported_formats:
+            return {"error": f"Unsupported format: {file_extension}", "text": "", "filename": filename}
+        
+        pages = None
+        truncated = False
+        if file_extension == '.pdf':
+            text, pages, _, truncated = self._extract_pdf(io.BytesIO(data))
+        else:
+            try:
+                text = read_docx_text(io.BytesIO(data), self.max_chars)
+            except Exception as e:
+                logger.error(f"Error extracting text from DOCX {file_path}: {str(e)}")
+                text = ""
+        
+        return self._build_result(filename, file_path, text, len(data), file_extension, pages, truncated)
+    
+    def _build_result(self, filename: str, file_path: str, text: str, file_size: int,
+                      extension: str, pages: Optional[int], truncated: bool) -> Dict[str, str]:
+        if self.max_chars and len(text) > self.max_chars:
+            text = text[:self.max_chars]
+            truncated = True
+        
+        result = {
             "filename": filename,
-            "file_path": str(file_path),
+            "file_path": file_path,
             "text": text,
             "word_count": len(text.split()) if text else 0,
             "char_count": len(text) if text else 0,
-            "file_size": file_path.stat().st_size,
-            "extension": file_extension
+            "file_size": file_size,
+            "extension": extension,
+            "truncated": truncated
         }
+        if pages is not None:
+            result["pages"] = pages
+        return result
+    
+    def process_directory(self, directory_path: str, workers: int = None) -> List[Dict[str, str]]:
+        """
+        Process all supported files in a directory
+        
+        Files are parsed in isolated worker processes (PDF parsing is
+        CPU-bound, and a bad file must not take the batch down with it).
+        Results keep the directory walk order.
+        """
+        results = list(self.iter_directory(directory_path, workers))
+        
+        processed_count = 0
+        error_count = 0
+        for result in results:
+            if result.get("error"):
+                error_count += 1
+                logger.error(f"Error processing {result['filename']}: {result['error']}")
+            else:
+                processed_count += 1
+                logger.info(f"Successfully processed: {result['filename']} ({result['word_count']} words)")
+        
+        logger.info(f"Processing complete: {processed_count} successful, {error_count} errors")
+        logger.info(f"📊 Extraction cache: {self.cache.stats()}")
+        return results
     
-    def process_directory(self, directory_path: str) -> List[Dict[str, str]]:
-        """Process all supported files in a directory"""
+    def list_files(self, directory_path: str) -> List[str]:
+        """Supported files under a directory, in walk order"""
         directory_path = Path(directory_path)
         
         if not directory_path.exists():
             logger.error(f"Directory not found: {directory_path}")
             return []
         
-        results = []
-        processed_count = 0
-        error_count = 0
-        
         # Get all files with supported extensions
-        for file_path in directory_path.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in self.supported_formats:
-                logger.info(f"Processing: {file_path.name}")
-                result = self.process_single_file(str(file_path))
-                
-                if result.get("error"):
-                    error_count += 1
-                    logger.error(f"Error processing {file_path.name}: {result['error']}")
+        return [str(file_path) for file_path in directory_path.rglob('*')
+                if file_path.is_file() and file_path.suffix.lower() in self.supported_formats]
+    
+    def iter_directory(self, directory_path: str, workers: int = None) -> Iterator[Dict[str, str]]:
+        """
+        Yield extraction results in directory walk order as they are parsed
+        
+        Submission is bounded: IsolatedPool.imap pulls file paths lazily and
+        keeps at most two files per worker in flight, so a slow consumer holds
+        back parsing instead of letting extracted texts pile up in memory.
+        """
+        file_paths = self.list_files(directory_path)
+        workers = min(workers or self.workers, len(file_paths))
+        if workers <= 1 and not self.isolation:
+            for file_path in file_paths:
+                logger.info(f"Processing: {os.path.basename(file_path)}")
+                yield self.process_single_file(file_path)
+            return
+        if not file_paths:
+            return
+        
+        logger.info(f"Processing {len(file_paths)} files with {workers} worker processes")
+        limits = (self.max_chars, self.max_pages, self.pdf_backend.name)
+        
+        def tasks():
+            for file_path in file_paths:
+                # Unchanged files come from the extraction cache; only misses are parsed
+                cached = self._cached_result(file_path)
+                yield (file_path, cached), None if cached else (file_path, *limits)
+        
+        with self._pool(workers) as pool:
+            for (file_path, cached), ok, value in pool.imap(_process_file_in_worker, tasks()):
+                if cached:
+                    yield self._seen(cached)
+                elif ok:
+                    self._cache_result(file_path, value)
+                    yield self._seen(value)
                 else:
-                    processed_count += 1
-                    logger.info(f"Successfully processed: {file_path.name} ({result['word_count']} words)")
-                
-                results.append(result)
+                    yield self._failure(os.path.basename(file_path), file_path, value)
+    
+    def _pool(self, workers: int) -> IsolatedPool:
+        return IsolatedPool(max(1, workers), self.timeout, self.memory_mb)
+    
+    def _failure(self, filename: str, file_path: str, message: str) -> Dict[str, str]:
+        """Error row for a file whose extraction timed out, ran out of memory or crashed"""
+        logger.error(f"❌ Extraction failed for {file_path}: {message}")
+        return {"filename": filename, "file_path": file_path, "text": "", "word_count": 0,
+                "error": f"Extraction failed: {message}"}
+    
+    def iter_zip(self, zip_path: str, workers: int = None) -> Iterator[Dict[str, str]]:
+        """Yield extraction results for a zip archive on disk (see iter_zip_archive)"""
+        try:
+            yield from self.iter_zip_archive(zip_path, os.path.basename(zip_path), workers)
+        except Exception as e:
+            logger.error(f"Error processing zip file {zip_path}: {str(e)}")
+            yield {"filename": os.path.basename(zip_path), "text": "", "word_count": 0,
+                   "error": f"Zip processing error: {str(e)}"}
+    
+    def list_zip_members(self, archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+        """
+        Supported CV members of an archive, checked against the zip limits
         
-        logger.info(f"Processing complete: {processed_count} successful, {error_count} errors")
-        return results
+        Only the central directory is read. Raises ZipLimitError when the
+        archive holds more than ZIP_MAX_MEMBERS CVs or declares more than
+        ZIP_MAX_TOTAL_MB of uncompressed CV data.
+        """
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and os.path.splitext(info.filename)[1].lower() in self.supported_formats
+            # macOS resource forks (__MACOSX/._cv.pdf) are not documents
+            and not os.path.basename(info.filename).startswith("._")
+        ]
+        if len(members) > ZIP_MAX_MEMBERS:
+            raise ZipLimitError(f"Archive holds {len(members)} CVs (limit {ZIP_MAX_MEMBERS})")
+        total_mb = sum(info.file_size for info in members) / (1024 * 1024)
+        if total_mb > ZIP_MAX_TOTAL_MB:
+            raise ZipLimitError(f"Archive expands to {total_mb:.0f} MB (limit {ZIP_MAX_TOTAL_MB:.0f} MB)")
+        return members
+    
+    def _read_member(self, archive: zipfile.ZipFile, info: zipfile.ZipInfo,
+                     archive_name: str) -> Tuple[str, str, bytes, Optional[Dict[str, str]]]:
+        """(filename, file_path, data, result); result is set for cache hits and unreadable members"""
+        filename = os.path.basename(info.filename)
+        file_path = f"{archive_name}/{info.filename}"
+        if info.file_size > ZIP_MAX_MEMBER_MB * 1024 * 1024:
+            logger.warning(f"⚠️ Skipping {file_path}: {info.file_size / (1024 * 1024):.0f} MB uncompressed")
+            return filename, file_path, b"", {"filename": filename, "file_path": file_path, "text": "", "word_count": 0,
+                                              "error": f"File too large (limit {ZIP_MAX_MEMBER_MB:.0f} MB)"}
+        try:
+            # zipfile stops at the declared size and checks the CRC, so this read is bounded
+            data = archive.read(info)
+        except Exception as e:
+            logger.error(f"Error reading {file_path}: {str(e)}")
+            return filename, file_path, b"", {"filename": filename, "file_path": file_path, "text": "", "word_count": 0,
+                                              "error": f"Unreadable zip member: {str(e)}"}
+        cached = self.cache.get_content(data, filename, file_path, self.pdf_backend.name)
+        return filename, file_path, data, self._within_limits(cached)
+    
+    def _cache_content(self, data: bytes, result: Dict[str, str]) -> None:
+        if not result.get("error") and not result.get("truncated"):
+            self.cache.put_content(data, result, self.pdf_backend.name)
+    
+    def iter_zip_archive(self, source: Union[str, BinaryIO], archive_name: str, workers: int = None,
+                         pool: IsolatedPool = None) -> Iterator[Dict[str, str]]:
+        """
+        Yield extraction results for the CVs in a zip, in archive order
+        
+        Members are read straight from the archive (a path or an in-memory
+        buffer), filtered by extension before anything is decompressed, and
+        parsed in isolated worker processes (pass pool to share one across
+        archives). At most two members per worker are held in memory, and
+        nothing is written to disk.
+        """
+        with zipfile.ZipFile(source) as archive:
+            members = self.list_zip_members(archive)
+            workers = min(workers or self.workers, len(members))
+            loaded = (self._read_member(archive, info, archive_name) for info in members)
+            if pool is None and workers <= 1 and not self.isolation:
+                for filename, file_path, data, result in loaded:
+                    if result is None:
+                        result = self._extract_content(filename, file_path, data)
+                        self._cache_content(data, result)
+                    yield self._seen(result)
+                return
+            if not members:
+                return
+            
+            logger.info(f"Processing {len(members)} files from {archive_name} with {workers} worker processes")
+            limits = (self.max_chars, self.max_pages, self.pdf_backend.name)
+            tasks = (((filename, file_path, data, result), None if result else (filename, file_path, data, *limits))
+                     for filename, file_path, data, result in loaded)
+            
+            own_pool = pool is None
+            pool = pool or self._pool(workers)
+            try:
+                for (filename, file_path, data, result), ok, value in pool.imap(_process_content_in_worker, tasks):
+                    if result:
+                        yield self._seen(result)
+                    elif ok:
+                        self._cache_content(data, value)
+                        yield self._seen(value)
+                    else:
+                        yield self._failure(filename, file_path, value)
+            finally:
+                if own_pool:
+                    pool.close()
     
     def save_extracted_text(self, results: List[Dict[str, str]], output_path: str) -> None:
         """Save extracted text results to Excel file"""
@@ -162,50 +581,41 @@ class DocumentProcessor:
     def process_uploaded_files(self, uploaded_files) -> List[Dict]:
         """Process uploaded files from Streamlit file uploader"""
         cv_data = []
+        # One set of isolated workers for the whole upload
+        pool = self._pool(self.workers) if self.isolation else None
 
-        for uploaded_file in uploaded_files:
-            try:
-                # Handle zip files
-                if uploaded_file.name.lower().endswith('.zip'):
-                    cv_data.extend(self._process_zip_file(uploaded_file))
-                else:
-                    # Process individual file
-                    result = self._process_uploaded_file(uploaded_file)
-                    cv_data.append(result)
-            except Exception as e:
-                logger.error(f"Error processing uploaded file {uploaded_file.name}: {str(e)}")
-                cv_data.append({
-                    'filename': uploaded_file.name,
-                    'text': '',
-                    'word_count': 0,
-                    'error': f"Processing error: {str(e)}"
-                })
+        try:
+            for uploaded_file in uploaded_files:
+                try:
+                    # Handle zip files
+                    if uploaded_file.name.lower().endswith('.zip'):
+                        cv_data.extend(self._process_zip_file(uploaded_file, pool))
+                    else:
+                        # Process individual file
+                        result = self._process_uploaded_file(uploaded_file, pool)
+                        cv_data.append(self._seen(result))
+                except Exception as e:
+                    logger.error(f"Error processing uploaded file {uploaded_file.name}: {str(e)}")
+                    cv_data.append({
+                        'filename': uploaded_file.name,
+                        'text': '',
+                        'word_count': 0,
+                        'error': f"Processing error: {str(e)}"
+                    })
+        finally:
+            if pool:
+                pool.close()
 
         return cv_data
 
-    def _process_zip_file(self, zip_file) -> List[Dict]:
-        """Extract and process files from a zip archive"""
+    def _process_zip_file(self, zip_file, pool: IsolatedPool = None) -> List[Dict]:
+        """Process the files of an uploaded zip archive in memory"""
         cv_data = []
 
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Save uploaded zip file
-                zip_path = os.path.join(temp_dir, zip_file.name)
-                with open(zip_path, 'wb') as f:
-                    f.write(zip_file.getbuffer())
-
-                # Extract zip file
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(temp_dir)
-
-                # Process extracted files
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        if file.lower().endswith(('.pdf', '.docx', '.doc')):
-                            file_path = os.path.join(root, file)
-                            result = self.process_single_file(file_path)
-                            cv_data.append(result)
-
+            zip_file.seek(0)
+            for result in self.iter_zip_archive(zip_file, zip_file.name, pool=pool):
+                cv_data.append(result)
         except Exception as e:
             logger.error(f"Error processing zip file {zip_file.name}: {str(e)}")
             cv_data.append({
@@ -217,12 +627,19 @@ class DocumentProcessor:
 
         return cv_data
 
-    def _process_uploaded_file(self, uploaded_file) -> Dict:
-        """Process a single uploaded file"""
+    def _process_uploaded_file(self, uploaded_file, pool: IsolatedPool = None) -> Dict:
+        """Process a single uploaded file (in an isolated worker when a pool is given)"""
         try:
             file_extension = os.path.splitext(uploaded_file.name)[1].lower()
 
-            if file_extension == '.pdf':
+            if pool and file_extension in self.supported_formats:
+                task = (None, (uploaded_file.name, uploaded_file.name, uploaded_file.getvalue(),
+                               self.max_chars, self.max_pages, self.pdf_backend.name))
+                (_, ok, value), = pool.imap(_process_content_in_worker, [task])
+                if not ok:
+                    return self._failure(uploaded_file.name, uploaded_file.name, value)
+                text = value["text"]
+            elif file_extension == '.pdf':
                 text = self._extract_pdf_text_from_bytes(uploaded_file.getvalue())
             elif file_extension in ['.docx', '.doc']:
                 text = self._extract_docx_text_from_bytes(uploaded_file.getvalue())
@@ -254,32 +671,13 @@ class DocumentProcessor:
 
     def _extract_pdf_text_from_bytes(self, pdf_bytes) -> str:
         """Extract text from PDF bytes"""
-        try:
-            import io
-            pdf_file = io.BytesIO(pdf_bytes)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-
-            return text.strip()
-        except Exception as e:
-            logger.error(f"Error extracting PDF text: {str(e)}")
-            return ""
+        return self._extract_pdf(io.BytesIO(pdf_bytes))[0]
 
     def _extract_docx_text_from_bytes(self, docx_bytes) -> str:
         """Extract text from DOCX bytes"""
         try:
-            import io
-            docx_file = io.BytesIO(docx_bytes)
-            doc = Document(docx_file)
-
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-
-            return text.strip()
+            text = read_docx_text(io.BytesIO(docx_bytes), self.max_chars)
+            return text[:self.max_chars] if self.max_chars else text
         except Exception as e:
             logger.error(f"Error extracting DOCX text: {str(e)}")
             return ""
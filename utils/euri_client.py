@@ -3,9 +3,23 @@ Euriai API client using the correct endpoint
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import httpx
+import asyncio
+import weakref
 import os
 from dotenv import load_dotenv
 import logging
+import hashlib
+from typing import Optional
+from utils.provider_health import health_registry, ProviderHealth
+from utils.rate_limiter import get_rate_limiter, estimate_tokens
+from utils.provider_router import get_provider_monitor
+from utils.response_cache import CachedResponse, ResponseCache, get_response_cache
+from utils.retry import (
+    DEFAULT_RETRY_POLICY, RetryPolicy, ProviderTimeoutError, ProviderConnectionError,
+    MalformedResponseError, error_for_status
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -13,13 +27,19 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+DEFAULT_BASE_URL = "https://api.euron.one/api/v1/euri/alpha/chat/completions"
+DEFAULT_POOL_SIZE = 10
+
 class EuriClient:
     """Euriai API client with proper endpoint"""
     
-    def __init__(self, api_key: str = None, model: str = "gpt-4.1-nano"):
+    def __init__(self, api_key: str = None, model: str = "gpt-4.1-nano",
+                 base_url: str = None, pool_size: int = None, retry_policy: RetryPolicy = None,
+                 cache: ResponseCache = None):
         self.api_key = api_key or os.getenv("EURI_API_KEY")
         self.model = model
-        self.base_url = "https://api.euron.one/api/v1/euri/alpha/chat/completions"
+        self.base_url = base_url or os.getenv("EURI_BASE_URL", DEFAULT_BASE_URL)
+        self.pool_size = pool_size or int(os.getenv("EURI_POOL_SIZE", DEFAULT_POOL_SIZE))
         
         if not self.api_key:
             raise Exception("EURI_API_KEY not found in environment variables or parameters.")
@@ -29,58 +49,208 @@ class EuriClient:
             "Content-Type": "application/json"
         }
         
-        # Test connection
-        self._test_connection()
+        # Keep-alive session shared by all calls (and worker threads) of this client
+        self.session = self._create_session()
+        # httpx async clients are bound to the event loop that created them
+        self._async_clients = weakref.WeakKeyDictionary()
+        # Shared with every other Euriai client in the process
+        self.rate_limiter = get_rate_limiter("Euriai")
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        # Circuit breaker and latency/error statistics shared process-wide
+        self.monitor = get_provider_monitor("Euriai")
+        # On-disk response cache shared by all clients (see utils/response_cache.py)
+        self.cache = cache or get_response_cache()
+        
+        # Connection test runs lazily through the shared health registry
+        fingerprint = hashlib.sha256(self.api_key.encode()).hexdigest()[:12]
+        self.health_key = f"Euriai:{self.base_url}:{fingerprint}"
+        health_registry.register(self.health_key, self._test_connection)
+    
+    def _create_session(self) -> requests.Session:
+        """Create a pooled keep-alive session sized for concurrent workers"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, pool_block=True)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Pooled asyncio client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            limits = httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+            client = httpx.AsyncClient(headers=self.headers, limits=limits, timeout=60)
+            self._async_clients[loop] = client
+        return client
+    
+    async def aclose(self):
+        """Close the async client of the running event loop (call before the loop ends)"""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+    
+    def close(self):
+        """Close pooled connections, including async clients of loops that are still open"""
+        self.session.close()
+        for loop, client in list(self._async_clients.items()):
+            if not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(client.aclose())
+        self._async_clients.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def _test_connection(self):
-        """Test the API connection with a simple request"""
-        try:
-            test_messages = [{"role": "user", "content": "Hello"}]
-            response = self.chat_completion(test_messages, max_tokens=5)
-            logger.info("✅ Euriai API connection successful")
-            logger.info(f"   Test response: {response[:50]}...")
-        except Exception as e:
-            logger.warning(f"⚠️ Euriai API test failed: {str(e)}")
-    
-    def chat_completion(self, messages, model=None, temperature=0.7, max_tokens=1000):
+        """Test the API connection with a simple request (raises on failure, no retries)"""
+        test_messages = [{"role": "user", "content": "Hello"}]
+        response = self._send(test_messages, None, 0.7, 5)
+        logger.info("✅ Euriai API connection successful")
+        logger.info(f"   Test response: {response[:50]}...")
+    
+    def health_status(self) -> Optional[ProviderHealth]:
+        """Cached connection status; never blocks (None until the first probe finishes)"""
+        return health_registry.status(self.health_key)
+    
+    def test_connection(self, timeout: float = None) -> bool:
+        """Check the connection, reusing a cached probe result while it is fresh"""
+        status = health_registry.check(self.health_key, timeout=timeout)
+        return bool(status and status.healthy)
+    
+    def chat_completion(self, messages, model=None, temperature=0.7, max_tokens=1000, use_cache=True, store=True):
         """
         Send a chat completion request to Euriai API
         
+        Transient failures (429, 5xx, timeouts, malformed bodies) are retried
+        according to self.retry_policy. Identical requests are answered from
+        the response cache unless use_cache is False.
+        
         Args:
             messages: List of message dictionaries with 'role' and 'content'
             model: Model to use (defaults to instance model)
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens to generate
+            use_cache: Read and write the response cache
+            store: Write the reply to the cache; callers that validate replies
+                pass False and call cache_response once the reply is usable
             
         Returns:
             String response from the API
+        
+        Raises:
+            ProviderError: subclass describing the final failure
         """
+        key = (model or self.model, messages, temperature, max_tokens)
+        if use_cache:
+            cached = self.cache.get_response("Euriai", *key)
+            if cached is not None:
+                return cached
+        content = self.retry_policy.call(self._send, messages, model, temperature, max_tokens)
+        if use_cache and store:
+            self.cache.put_response("Euriai", *key, content)
+        return content
+    
+    async def achat_completion(self, messages, model=None, temperature=0.7, max_tokens=1000, use_cache=True,
+                               store=True):
+        """Non-blocking version of chat_completion for use inside an event loop"""
+        key = (model or self.model, messages, temperature, max_tokens)
+        if use_cache:
+            cached = self.cache.get_response("Euriai", *key)
+            if cached is not None:
+                return cached
+        content = await self.retry_policy.acall(self._asend, messages, model, temperature, max_tokens)
+        if use_cache and store:
+            self.cache.put_response("Euriai", *key, content)
+        return content
+    
+    def cache_response(self, messages, content, model=None, temperature=0.7, max_tokens=1000):
+        """Store a reply the caller has validated (see store in chat_completion)"""
+        if isinstance(content, CachedResponse):
+            # Already cached; a hit is not written back
+            return
+        self.cache.put_response("Euriai", model or self.model, messages, temperature, max_tokens, content)
+    
+    def _send(self, messages, model, temperature, max_tokens) -> str:
+        """Single attempt over the pooled session"""
+        payload = self._build_payload(messages, model, temperature, max_tokens)
+        estimated = estimate_tokens(messages, max_tokens)
+        self.monitor.claim()
+        try:
+            self.rate_limiter.acquire(estimated)
+        except BaseException:
+            # The request was never sent; don't strand a half-open trial
+            self.monitor.breaker.release()
+            raise
+
+        with self.monitor.track():
+            try:
+                response = self.session.post(self.base_url, json=payload, timeout=60)
+            except requests.exceptions.Timeout as e:
+                raise ProviderTimeoutError(f"API request timed out: {str(e)}", "Euriai")
+            except requests.exceptions.RequestException as e:
+                raise ProviderConnectionError(f"API request failed: {str(e)}", "Euriai")
+
+            self._check_status(response.status_code, response.text, response.headers)
+            try:
+                response_data = response.json()
+            except ValueError as e:
+                raise MalformedResponseError(f"Error parsing API response: {str(e)}", "Euriai")
+            return self._parse_content(response_data, estimated)
+    
+    async def _asend(self, messages, model, temperature, max_tokens) -> str:
+        """Single non-blocking attempt"""
+        payload = self._build_payload(messages, model, temperature, max_tokens)
+        estimated = estimate_tokens(messages, max_tokens)
+        self.monitor.claim()
+        try:
+            await self.rate_limiter.acquire_async(estimated)
+        except BaseException:
+            # Cancelled (e.g. a losing hedge) before the request was sent
+            self.monitor.breaker.release()
+            raise
+
+        with self.monitor.track():
+            try:
+                response = await self._get_async_client().post(self.base_url, json=payload)
+            except httpx.TimeoutException as e:
+                raise ProviderTimeoutError(f"API request timed out: {str(e)}", "Euriai")
+            except httpx.HTTPError as e:
+                raise ProviderConnectionError(f"API request failed: {str(e)}", "Euriai")
+
+            self._check_status(response.status_code, response.text, response.headers)
+            try:
+                response_data = response.json()
+            except ValueError as e:
+                raise MalformedResponseError(f"Error parsing API response: {str(e)}", "Euriai")
+            return self._parse_content(response_data, estimated)
+    
+    def _check_status(self, status_code: int, body: str, headers) -> None:
+        if status_code >= 400:
+            raise error_for_status(status_code, f"HTTP {status_code}: {body[:200]}", "Euriai",
+                                   headers.get("Retry-After"))
+    
+    def _build_payload(self, messages, model, temperature, max_tokens) -> dict:
         if not self.api_key:
             raise Exception("EURI_API_KEY not found in environment variables.")
 
-        payload = {
+        return {
             "model": model or self.model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens
         }
-
+    
+    def _parse_content(self, response_data: dict, estimated_tokens: int) -> str:
         try:
-            response = requests.post(self.base_url, headers=self.headers, json=payload, timeout=60)
-            response.raise_for_status()
-
-            response_data = response.json()
-            if "choices" in response_data and len(response_data["choices"]) > 0:
-                return response_data["choices"][0]["message"]["content"]
-            else:
-                raise ValueError("Invalid response format from API")
-
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"API request failed: {str(e)}")
-        except (KeyError, IndexError) as e:
-            raise Exception(f"Error parsing API response: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Unexpected error: {str(e)}")
+            usage = response_data.get("usage") or {}
+            self.rate_limiter.record_usage(estimated_tokens, usage.get("total_tokens"))
+            return response_data["choices"][0]["message"]["content"]
+        except (AttributeError, KeyError, IndexError, TypeError) as e:
+            raise MalformedResponseError(f"Invalid response format from API: {str(e)}", "Euriai")
     
     def get_available_models(self):
         """Get list of available models"""
@@ -97,8 +267,8 @@ def euri_chat_completion(messages, model="gpt-4.1-nano", temperature=0.7, max_to
     """
     Convenience function for chat completion
     """
-    client = EuriClient(model=model)
-    return client.chat_completion(messages, model, temperature, max_tokens)
+    with EuriClient(model=model) as client:
+        return client.chat_completion(messages, model, temperature, max_tokens)
 
 # Test function
 def test_euri_client():
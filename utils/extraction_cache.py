@@ -0,0 +1,143 @@
+"""
+Persistent cache of extracted CV text
+
+Results of DocumentProcessor.process_single_file are stored under the SHA-256
+of the file's bytes, the extraction schema version and the PDF backend. A
+(path, size, mtime) index in the same database lets unchanged files skip even
+the hashing step; renamed or re-uploaded copies of a document are still hits
+through the content hash.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+
+from utils.response_cache import CACHE_DIR, SQLiteLRUCache
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump when the extracted text or result fields change (parsers, limits, metadata)
+EXTRACTION_SCHEMA_VERSION = 2
+
+def extraction_key(digest: str, backend: str = "") -> str:
+    """Cache key for content with this digest extracted by the current code and PDF backend"""
+    return hashlib.sha256(f"{EXTRACTION_SCHEMA_VERSION}:{backend}:{digest}".encode("utf-8")).hexdigest()
+
+def file_digest(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ExtractionCache(SQLiteLRUCache):
+    """Extraction results keyed by content hash, with a stat-based fast path"""
+
+    def __init__(self, path: str, max_bytes: int, enabled: bool = True):
+        super().__init__(path, max_bytes, enabled)
+        self.fast_hits = 0
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS file_index ("
+                "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, digest TEXT NOT NULL)"
+            )
+            self.conn.commit()
+
+    def _indexed_digest(self, file_path: str, stat: os.stat_result) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute("SELECT size, mtime_ns, digest FROM file_index WHERE path = ?",
+                                    (file_path,)).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        return None
+
+    def _index(self, file_path: str, stat: os.stat_result, digest: str) -> None:
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO file_index (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                              (file_path, stat.st_size, stat.st_mtime_ns, digest))
+            self.conn.commit()
+
+    def get_file(self, file_path: str, backend: str = "") -> Optional[Dict]:
+        """Cached extraction result for a file on disk, or None"""
+        if not self.enabled:
+            return None
+        display_path = file_path
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+
+        digest = self._indexed_digest(file_path, stat)
+        fast = digest is not None
+        if not fast:
+            digest = file_digest(file_path)
+        value = self.get(extraction_key(digest, backend))
+        if value is None:
+            return None
+
+        if fast:
+            with self.lock:
+                self.fast_hits += 1
+        else:
+            self._index(file_path, stat, digest)
+        result = json.loads(value)
+        # The same content may have been cached under another name or location
+        result.update(filename=os.path.basename(file_path), file_path=display_path)
+        return result
+
+    def put_file(self, file_path: str, result: Dict, backend: str = "") -> None:
+        """Store the extraction result for a file on disk"""
+        if not self.enabled:
+            return
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        digest = file_digest(file_path)
+        self.put(extraction_key(digest, backend), json.dumps(result, ensure_ascii=False).encode("utf-8"))
+        self._index(file_path, stat, digest)
+
+    def get_content(self, data: bytes, filename: str, file_path: str = None, backend: str = "") -> Optional[Dict]:
+        """Cached extraction result for in-memory file content (e.g. a zip member), or None"""
+        if not self.enabled:
+            return None
+        value = self.get(extraction_key(hashlib.sha256(data).hexdigest(), backend))
+        if value is None:
+            return None
+        result = json.loads(value)
+        result.update(filename=filename, file_path=file_path or filename)
+        return result
+
+    def put_content(self, data: bytes, result: Dict, backend: str = "") -> None:
+        if self.enabled:
+            self.put(extraction_key(hashlib.sha256(data).hexdigest(), backend),
+                     json.dumps(result, ensure_ascii=False).encode("utf-8"))
+
+    def clear(self) -> None:
+        super().clear()
+        with self.lock:
+            self.conn.execute("DELETE FROM file_index")
+            self.conn.commit()
+            self.fast_hits = 0
+
+    def stats(self) -> Dict[str, float]:
+        stats = super().stats()
+        stats["fast_hits"] = self.fast_hits
+        return stats
+
+_extraction_cache = None
+_extraction_cache_lock = threading.Lock()
+
+def get_extraction_cache() -> ExtractionCache:
+    """Process-wide extraction cache (EXTRACTION_CACHE_PATH, EXTRACTION_CACHE_MAX_MB, EXTRACTION_CACHE_DISABLED)"""
+    global _extraction_cache
+    with _extraction_cache_lock:
+        if _extraction_cache is None:
+            enabled = os.getenv("EXTRACTION_CACHE_DISABLED", "false").lower() not in ("1", "true", "yes")
+            path = os.getenv("EXTRACTION_CACHE_PATH", os.path.join(CACHE_DIR, "extraction.sqlite"))
+            _extraction_cache = ExtractionCache(
+                path if enabled else ":memory:",
+                max_bytes=int(float(os.getenv("EXTRACTION_CACHE_MAX_MB", "200")) * 1024 * 1024),
+                enabled=enabled
+            )
+        return _extraction_cache
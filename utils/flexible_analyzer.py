@@ -4,9 +4,16 @@ Flexible CV Analyzer that works with custom job descriptions
 
 import json
 import logging
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from utils.euri_client import EuriClient
+from utils.groq_client import GroqClient
+from utils.provider_router import ProviderRouter
+from utils.hedging import HEDGE_REQUESTS, HedgePolicy, hedge_metrics, hedged_call_sync
+from utils.analysis_cache import AnalysisCache, analysis_key, get_analysis_cache
+from utils.batch_runner import DEFAULT_MAX_WORKERS, CancellationToken, iter_concurrent
+from utils.pipeline import run_pipeline
+from utils.local_scorer import LOCAL_FALLBACK, LOCAL_PROVIDER, LOCAL_SUMMARY, LocalScore, get_local_scorer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,24 +32,30 @@ class FlexibleAnalysisResult:
     role_fit_summary: str
     provider_used: str
     analysis_time: float
+    duplicate_of: str = ""  # filename of the analyzed copy when this CV is a repeat submission
 
 class FlexibleCVAnalyzer:
     """Flexible CV analyzer that adapts to any job description"""
     
-    def __init__(self, euriai_api_key: str = None, groq_api_key: str = None):
+    def __init__(self, euriai_api_key: str = None, groq_api_key: str = None,
+                 hedge: bool = None, hedge_percentile: float = None, cache: AnalysisCache = None):
         """Initialize the flexible analyzer"""
         self.euriai_client = None
         self.groq_client = None
         
+        # Optional hedging: send the prompt to the second provider when the first is slow
+        self.hedge = HEDGE_REQUESTS if hedge is None else hedge
+        self.hedge_policy = HedgePolicy(hedge_percentile)
+        
         # Initialize Euriai client (primary)
         if euriai_api_key:
             try:
                 self.euriai_client = EuriClient(euriai_api_key)
-                if self.euriai_client.test_connection():
-                    logger.info("✅ Euriai client initialized (Primary Provider)")
-                else:
-                    logger.warning("⚠️ Euriai connection test failed")
-                    self.euriai_client = None
+                logger.info("✅ Euriai client initialized (Primary Provider)")
+                # A failed probe may be transient; the router and circuit breaker decide per request
+                status = self.euriai_client.health_status()
+                if status and not status.healthy:
+                    logger.warning(f"⚠️ Euriai last health check failed: {status.error}")
             except Exception as e:
                 logger.error(f"❌ Failed to initialize Euriai client: {str(e)}")
                 self.euriai_client = None
@@ -50,63 +63,84 @@ class FlexibleCVAnalyzer:
         # Initialize Groq client (fallback)
         if groq_api_key:
             try:
-                import groq
-                self.groq_client = groq.Groq(api_key=groq_api_key)
+                self.groq_client = GroqClient(groq_api_key)
                 logger.info("✅ Groq client initialized (Fallback Provider)")
+                status = self.groq_client.health_status()
+                if status and not status.healthy:
+                    logger.warning(f"⚠️ Groq last health check failed: {status.error}")
             except Exception as e:
                 logger.error(f"❌ Failed to initialize Groq client: {str(e)}")
                 self.groq_client = None
+        
+        self.router = ProviderRouter(
+            [name for name, client in (("Euriai", self.euriai_client), ("Groq", self.groq_client)) if client]
+        )
+        
+        # Parsed results keyed on CV text, JD, criteria and models
+        self.analysis_cache = cache or get_analysis_cache()
+        self.models = [f"{name}:{client.model}" for name, client in
+                       (("Euriai", self.euriai_client), ("Groq", self.groq_client)) if client]
     
-    def analyze_cv_with_jd(self, cv_text: str, job_description: str, filename: str) -> FlexibleAnalysisResult:
-        """Analyze CV against a custom job description"""
+    def analyze_cv_with_jd(self, cv_text: str, job_description: str, filename: str,
+                           local_fallback: bool = True) -> Optional[FlexibleAnalysisResult]:
+        """
+        Analyze CV against a custom job description
+        
+        local_fallback=False returns None instead of a local score when every
+        provider fails, for batch callers that score their failures in one pass.
+        """
         import time
         start_time = time.time()
         
         # Extract evaluation criteria from job description
         criteria = self._extract_criteria_from_jd(job_description)
         
+        key = analysis_key("flexible", cv_text, job_description, criteria, self.models)
+        cached = self.analysis_cache.get_result(key, filename, analysis_time=time.time() - start_time)
+        if cached:
+            logger.info(f"♻️ {filename} served from analysis cache - Score: {cached.overall_score}")
+            return cached
+        
         # Create analysis prompt
         prompt = self._create_flexible_analysis_prompt(cv_text, job_description, criteria)
         
-        # Try Euriai first, then Groq
+        # Healthiest provider first (Euriai preferred); open circuits are skipped
         analysis_result = None
         provider_used = "None"
+        order = self.router.order()
         
-        if self.euriai_client:
-            try:
-                response = self.euriai_client.chat_completion(
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.1,
-                    max_tokens=2000
-                )
-                analysis_result = self._parse_analysis_response(response)
-                provider_used = "Euriai"
-                logger.info(f"✅ {filename} analyzed with Euriai")
-            except Exception as e:
-                logger.warning(f"⚠️ Euriai analysis failed for {filename}: {str(e)}")
+        delay = self.hedge_policy.delay_for(order[0]) if self.hedge and len(order) >= 2 else None
+        if delay is not None:
+            primary, secondary = order[0], order[1]
+            outcome = hedged_call_sync(lambda: self._request_analysis(primary, prompt, filename),
+                                       lambda: self._request_analysis(secondary, prompt, filename), delay)
+            if outcome:
+                provider_used, analysis_result = outcome
+            order = order[2:]
         
-        if not analysis_result and self.groq_client:
-            try:
-                response = self.groq_client.chat.completions.create(
-                    model="llama3-70b-8192",
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.1,
-                    max_tokens=2000
-                )
-                analysis_result = self._parse_analysis_response(response.choices[0].message.content)
-                provider_used = "Groq"
-                logger.info(f"✅ {filename} analyzed with Groq")
-            except Exception as e:
-                logger.error(f"❌ Groq analysis failed for {filename}: {str(e)}")
+        for provider in order:
+            if analysis_result:
+                break
+            outcome = self._request_analysis(provider, prompt, filename)
+            if outcome:
+                provider_used, analysis_result = outcome
         
-        if not analysis_result:
+        if not analysis_result and LOCAL_FALLBACK:
+            if not local_fallback:
+                # The batch caller scores all of its failures locally in one pass
+                return None
+            # Every provider failed: deterministic local keyword score
+            analysis_result = self._create_local_result(get_local_scorer().score(cv_text, job_description))
+            provider_used = LOCAL_PROVIDER
+            logger.warning(f"🧮 {filename} scored locally - Score: {analysis_result['overall_score']}")
+        elif not analysis_result:
             # Fallback result
             analysis_result = self._create_fallback_result()
             provider_used = "Fallback"
         
         analysis_time = time.time() - start_time
         
-        return FlexibleAnalysisResult(
+        result = FlexibleAnalysisResult(
             filename=filename,
             overall_score=analysis_result.get('overall_score', 0),
             tier=analysis_result.get('tier', 'Unknown'),
@@ -118,6 +152,34 @@ class FlexibleCVAnalyzer:
             provider_used=provider_used,
             analysis_time=analysis_time
         )
+        # Local and fallback results are not cached so the CV is retried next run
+        if provider_used not in ("Fallback", LOCAL_PROVIDER):
+            self.analysis_cache.put_result(key, result)
+        return result
+    
+    def _request_analysis(self, provider: str, prompt: str, filename: str) -> Optional[Tuple[str, Dict]]:
+        """Ask one provider for an analysis; returns (provider, parsed result) or None"""
+        client = {"Euriai": self.euriai_client, "Groq": self.groq_client}[provider]
+        messages = [{"role": "user", "content": prompt}]
+        try:
+            response = client.chat_completion(
+                messages=messages,
+                temperature=0.1,
+                max_tokens=2000,
+                store=False
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ {provider} analysis failed for {filename}: {str(e)}")
+            return None
+        
+        analysis_result = self._try_parse_analysis_response(response)
+        if analysis_result is None:
+            logger.warning(f"⚠️ {provider} returned an unusable analysis for {filename}")
+            return None
+        # Only usable replies go into the response cache
+        client.cache_response(messages, response, temperature=0.1, max_tokens=2000)
+        logger.info(f"✅ {filename} analyzed with {provider}")
+        return provider, analysis_result
     
     def _extract_criteria_from_jd(self, job_description: str) -> Dict[str, str]:
         """Extract key evaluation criteria from job description"""
@@ -192,6 +254,10 @@ Provide specific, actionable insights based on the job description provided.
     
     def _parse_analysis_response(self, response: str) -> Dict:
         """Parse the AI analysis response"""
+        return self._try_parse_analysis_response(response) or self._create_fallback_result()
+    
+    def _try_parse_analysis_response(self, response: str) -> Optional[Dict]:
+        """Parse the AI analysis response, returning None if it is unusable"""
         try:
             # Extract JSON from response
             start_idx = response.find('{')
@@ -205,14 +271,14 @@ Provide specific, actionable insights based on the job description provided.
                 return self._validate_analysis_result(result)
             else:
                 logger.error("No valid JSON found in response")
-                return self._create_fallback_result()
+                return None
                 
         except json.JSONDecodeError as e:
             logger.error(f"JSON parsing error: {str(e)}")
-            return self._create_fallback_result()
+            return None
         except Exception as e:
             logger.error(f"Error parsing analysis response: {str(e)}")
-            return self._create_fallback_result()
+            return None
     
     def _validate_analysis_result(self, result: Dict) -> Dict:
         """Validate and clean analysis result"""
@@ -233,6 +299,28 @@ Provide specific, actionable insights based on the job description provided.
         
         return validated
     
+    def _create_local_result(self, local: LocalScore) -> Dict:
+        """Analysis fields from the local keyword scorer"""
+        return {
+            'overall_score': local.overall_score,
+            'tier': local.tier,
+            'category_scores': local.category_scores,
+            'strengths': local.strengths()[:5],
+            'weaknesses': local.weaknesses()[:3],
+            'years_experience': local.years_experience,
+            'role_fit_summary': LOCAL_SUMMARY
+        }
+    
+    def score_locally(self, cv_data: List[Dict], job_description: str) -> List[FlexibleAnalysisResult]:
+        """Score a whole batch with the local scorer, without calling any provider"""
+        valid = [cv for cv in cv_data if not cv.get('error')]
+        scores = get_local_scorer().score_batch([cv.get('text') or '' for cv in valid], job_description)
+        return [
+            FlexibleAnalysisResult(filename=cv['filename'], provider_used=LOCAL_PROVIDER, analysis_time=0.0,
+                                   **self._create_local_result(local))
+            for cv, local in zip(valid, scores)
+        ]
+    
     def _create_fallback_result(self) -> Dict:
         """Create fallback result when analysis fails"""
         return {
@@ -252,27 +340,71 @@ Provide specific, actionable insights based on the job description provided.
             'role_fit_summary': 'Analysis failed due to technical issues'
         }
     
-    def batch_analyze(self, cv_data: List[Dict], job_description: str) -> List[FlexibleAnalysisResult]:
-        """Analyze multiple CVs against a job description"""
-        results = []
-        
-        logger.info(f"Starting flexible analysis of {len(cv_data)} CVs")
-        
-        for i, cv in enumerate(cv_data, 1):
+    def iter_analyze(self, cv_data: List[Dict], job_description: str, max_workers: int = None,
+                     cancel_token: CancellationToken = None, local_fallback: bool = True
+                     ) -> Iterator[Tuple[int, Dict, Optional[FlexibleAnalysisResult]]]:
+        """Analyze CVs on worker threads, yielding (index, cv, result) as each completes"""
+        valid = []
+        for i, cv in enumerate(cv_data):
             if cv.get('error'):
                 # Skip CVs with processing errors
                 logger.warning(f"Skipping {cv['filename']} due to processing error")
+            else:
+                valid.append((i, cv))
+        
+        def analyze(entry: Tuple[int, Dict]) -> Optional[FlexibleAnalysisResult]:
+            cv = entry[1]
+            return self.analyze_cv_with_jd(cv['text'], job_description, cv['filename'], local_fallback)
+        
+        for _, (index, cv), result in iter_concurrent(analyze, valid, max_workers or DEFAULT_MAX_WORKERS,
+                                                      cancel_token):
+            yield index, cv, result
+    
+    def stream_analyze(self, documents: Iterable[Dict], job_description: str, max_workers: int = None,
+                       queue_size: int = None, cancel_token: CancellationToken = None
+                       ) -> Iterator[Tuple[Dict, Optional[FlexibleAnalysisResult]]]:
+        """Analyze documents while they are still being extracted, yielding (cv, result)"""
+        def analyze(cv: Dict) -> FlexibleAnalysisResult:
+            return self.analyze_cv_with_jd(cv['text'], job_description, cv['filename'])
+        
+        return run_pipeline(documents, analyze, max_workers or DEFAULT_MAX_WORKERS, queue_size, cancel_token)
+    
+    def batch_analyze(self, cv_data: List[Dict], job_description: str, max_workers: int = None,
+                      progress_callback: Callable[[int, int, Dict, Optional[FlexibleAnalysisResult]], None] = None,
+                      cancel_token: CancellationToken = None) -> List[FlexibleAnalysisResult]:
+        """
+        Analyze multiple CVs against a job description with max_workers concurrent requests
+        
+        progress_callback(completed, total, cv, result) runs in the calling
+        thread after each CV; CVs every provider failed on are scored locally
+        as one batch at the end. Results are returned in input order.
+        """
+        logger.info(f"Starting flexible analysis of {len(cv_data)} CVs")
+        total = sum(1 for cv in cv_data if not cv.get('error'))
+        
+        results: Dict[int, FlexibleAnalysisResult] = {}
+        failed: List[Tuple[int, Dict]] = []
+        completed = 0
+        for index, cv, result in self.iter_analyze(cv_data, job_description, max_workers, cancel_token,
+                                                   local_fallback=False):
+            if not result:
+                failed.append((index, cv))
                 continue
-            
-            logger.info(f"Analyzing CV {i}/{len(cv_data)}: {cv['filename']}")
-            
-            result = self.analyze_cv_with_jd(
-                cv_text=cv['text'],
-                job_description=job_description,
-                filename=cv['filename']
-            )
-            
-            results.append(result)
+            completed += 1
+            results[index] = result
+            if progress_callback:
+                progress_callback(completed, total, cv, result)
+        
+        if failed:
+            logger.warning(f"🧮 Scoring {len(failed)} CVs locally after provider failures")
+            local_results = self.score_locally([cv for _, cv in failed], job_description)
+            for (index, cv), result in zip(failed, local_results):
+                completed += 1
+                results[index] = result
+                if progress_callback:
+                    progress_callback(completed, total, cv, result)
         
         logger.info(f"🎉 Flexible analysis complete: {len(results)} CVs analyzed")
-        return results
+        if self.hedge:
+            logger.info(f"📊 Hedging metrics: {hedge_metrics.snapshot()}")
+        return [results[i] for i in sorted(results)]
@@ -0,0 +1,189 @@
+"""
+Groq API client with the same interface as EuriClient
+"""
+
+import os
+import hashlib
+import logging
+import asyncio
+import weakref
+from typing import Optional
+
+import httpx
+import groq
+from groq import Groq, AsyncGroq
+from utils.provider_health import health_registry, ProviderHealth
+from utils.rate_limiter import get_rate_limiter, estimate_tokens
+from utils.provider_router import get_provider_monitor
+from utils.response_cache import CachedResponse, ResponseCache, get_response_cache
+from utils.retry import (
+    DEFAULT_RETRY_POLICY, RetryPolicy, ProviderError, ProviderTimeoutError, ProviderConnectionError,
+    MalformedResponseError, error_for_status
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+
+class GroqClient:
+    """Groq client exposing blocking and asyncio chat completions"""
+
+    def __init__(self, api_key: str = None, model: str = "llama3-70b-8192", pool_size: int = None,
+                 retry_policy: RetryPolicy = None, cache: ResponseCache = None):
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        self.model = model
+        self.pool_size = pool_size or int(os.getenv("GROQ_POOL_SIZE", DEFAULT_POOL_SIZE))
+
+        if not self.api_key:
+            raise Exception("GROQ_API_KEY not found in environment variables or parameters.")
+
+        # Retries are handled by our shared policy, not the SDK's own loop
+        self.client = Groq(api_key=self.api_key, max_retries=0)
+        # httpx async clients are bound to the event loop that created them
+        self._async_clients = weakref.WeakKeyDictionary()
+        # Shared with every other Groq client in the process
+        self.rate_limiter = get_rate_limiter("Groq")
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        # Circuit breaker and latency/error statistics shared process-wide
+        self.monitor = get_provider_monitor("Groq")
+        # On-disk response cache shared by all clients (see utils/response_cache.py)
+        self.cache = cache or get_response_cache()
+
+        fingerprint = hashlib.sha256(self.api_key.encode()).hexdigest()[:12]
+        self.health_key = f"Groq:{fingerprint}"
+        health_registry.register(self.health_key, self._test_connection)
+
+    def _test_connection(self):
+        """Cheap connectivity probe (model listing, no completion tokens)"""
+        self.client.models.list()
+
+    def health_status(self) -> Optional[ProviderHealth]:
+        """Cached connection status; never blocks"""
+        return health_registry.status(self.health_key)
+
+    def test_connection(self, timeout: float = None) -> bool:
+        """Check the connection, reusing a cached probe result while it is fresh"""
+        status = health_registry.check(self.health_key, timeout=timeout)
+        return bool(status and status.healthy)
+
+    def _get_async_client(self) -> AsyncGroq:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            limits = httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+            client = AsyncGroq(api_key=self.api_key, max_retries=0,
+                               http_client=httpx.AsyncClient(limits=limits, timeout=60))
+            self._async_clients[loop] = client
+        return client
+
+    def chat_completion(self, messages, model=None, temperature=0.7, max_tokens=1000, use_cache=True,
+                        store=True) -> str:
+        """Send a chat completion request and return the message content (see EuriClient.chat_completion)"""
+        key = (model or self.model, messages, temperature, max_tokens)
+        if use_cache:
+            cached = self.cache.get_response("Groq", *key)
+            if cached is not None:
+                return cached
+        content = self.retry_policy.call(self._send, messages, model, temperature, max_tokens)
+        if use_cache and store:
+            self.cache.put_response("Groq", *key, content)
+        return content
+
+    async def achat_completion(self, messages, model=None, temperature=0.7, max_tokens=1000, use_cache=True,
+                               store=True) -> str:
+        """Non-blocking version of chat_completion"""
+        key = (model or self.model, messages, temperature, max_tokens)
+        if use_cache:
+            cached = self.cache.get_response("Groq", *key)
+            if cached is not None:
+                return cached
+        content = await self.retry_policy.acall(self._asend, messages, model, temperature, max_tokens)
+        if use_cache and store:
+            self.cache.put_response("Groq", *key, content)
+        return content
+
+    def cache_response(self, messages, content, model=None, temperature=0.7, max_tokens=1000) -> None:
+        """Store a reply the caller has validated"""
+        if isinstance(content, CachedResponse):
+            # Already cached; a hit is not written back
+            return
+        self.cache.put_response("Groq", model or self.model, messages, temperature, max_tokens, content)
+
+    def _send(self, messages, model, temperature, max_tokens) -> str:
+        estimated = estimate_tokens(messages, max_tokens)
+        self.monitor.claim()
+        try:
+            self.rate_limiter.acquire(estimated)
+        except BaseException:
+            # The request was never sent; don't strand a half-open trial
+            self.monitor.breaker.release()
+            raise
+        with self.monitor.track():
+            try:
+                response = self.client.chat.completions.create(
+                    model=model or self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+            except groq.GroqError as e:
+                raise self._translate_error(e)
+            return self._parse_content(response, estimated)
+
+    async def _asend(self, messages, model, temperature, max_tokens) -> str:
+        estimated = estimate_tokens(messages, max_tokens)
+        self.monitor.claim()
+        try:
+            await self.rate_limiter.acquire_async(estimated)
+        except BaseException:
+            # Cancelled (e.g. a losing hedge) before the request was sent
+            self.monitor.breaker.release()
+            raise
+        with self.monitor.track():
+            try:
+                response = await self._get_async_client().chat.completions.create(
+                    model=model or self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+            except groq.GroqError as e:
+                raise self._translate_error(e)
+            return self._parse_content(response, estimated)
+
+    def _translate_error(self, error: Exception) -> ProviderError:
+        """Map Groq SDK exceptions onto the shared ProviderError types"""
+        if isinstance(error, groq.APITimeoutError):
+            return ProviderTimeoutError(f"API request timed out: {str(error)}", "Groq")
+        if isinstance(error, groq.APIConnectionError):
+            return ProviderConnectionError(f"API request failed: {str(error)}", "Groq")
+        if isinstance(error, groq.APIStatusError):
+            return error_for_status(error.status_code, str(error), "Groq",
+                                    error.response.headers.get("retry-after"))
+        return MalformedResponseError(f"Invalid response from API: {str(error)}", "Groq")
+
+    def _parse_content(self, response, estimated_tokens: int) -> str:
+        usage = getattr(response, "usage", None)
+        self.rate_limiter.record_usage(estimated_tokens, getattr(usage, "total_tokens", None))
+        try:
+            content = response.choices[0].message.content
+        except (AttributeError, IndexError, TypeError) as e:
+            raise MalformedResponseError(f"Invalid response format from API: {str(e)}", "Groq")
+        if content is None:
+            raise MalformedResponseError("Empty message content in API response", "Groq")
+        return content
+
+    async def aclose(self):
+        """Close the async client of the running event loop (call before the loop ends)"""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    def close(self):
+        """Close pooled connections, including async clients of loops that are still open"""
+        self.client.close()
+        for loop, client in list(self._async_clients.items()):
+            if not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(client.close())
+        self._async_clients.clear()
@@ -0,0 +1,144 @@
+"""
+Hedged provider requests
+
+If the primary provider has not answered within a latency percentile of its
+recent calls, the same prompt is sent to the secondary provider and the first
+valid result wins. The losing call is cancelled (asyncio) or abandoned
+(threads, where an in-flight HTTP request cannot be interrupted).
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from utils.provider_router import get_provider_monitor
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Analyzers hedge only when enabled (constructor argument or HEDGE_REQUESTS=true)
+HEDGE_REQUESTS = os.getenv("HEDGE_REQUESTS", "false").lower() in ("1", "true", "yes")
+
+class HedgeMetrics:
+    """Process-wide counters for hedged requests"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.requests = 0          # calls eligible for hedging
+            self.hedges = 0            # secondary requests launched
+            self.hedge_wins = 0        # hedges whose secondary answered first
+            self.wasted_calls = 0      # launched calls whose result was discarded
+
+    def record(self, hedged: bool = False, hedge_won: bool = False, wasted: int = 0) -> None:
+        with self.lock:
+            self.requests += 1
+            self.hedges += int(hedged)
+            self.hedge_wins += int(hedge_won)
+            self.wasted_calls += wasted
+
+    def snapshot(self) -> Dict[str, float]:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "wasted_calls": self.wasted_calls,
+                "hedge_rate": self.hedges / self.requests if self.requests else 0.0
+            }
+
+hedge_metrics = HedgeMetrics()
+
+class HedgePolicy:
+    """Decide when to launch the secondary request"""
+
+    def __init__(self, percentile: float = None, min_samples: int = 10):
+        self.percentile = percentile if percentile is not None else float(os.getenv("HEDGE_PERCENTILE", "0.9"))
+        self.min_samples = min_samples
+
+    def delay_for(self, provider: str) -> Optional[float]:
+        """Seconds to wait on provider before hedging; None until enough latency samples exist"""
+        return get_provider_monitor(provider).latency_percentile(self.percentile, self.min_samples)
+
+async def hedged_call(primary: Callable[[], Awaitable[Optional[T]]],
+                      secondary: Callable[[], Awaitable[Optional[T]]],
+                      delay: float, metrics: HedgeMetrics = hedge_metrics) -> Optional[T]:
+    """Await primary; after `delay` seconds also start secondary. First non-None result wins."""
+    primary_task = asyncio.ensure_future(primary())
+    done, _ = await asyncio.wait({primary_task}, timeout=delay)
+    if done:
+        metrics.record()
+        result = primary_task.result()
+        # Primary failed before the hedge deadline: plain fallback
+        return result if result is not None else await secondary()
+
+    secondary_task = asyncio.ensure_future(secondary())
+    pending = {primary_task, secondary_task}
+    result = None
+    winner = None
+    try:
+        while pending and result is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.result() is not None and result is None:
+                    result = task.result()
+                    winner = task
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if result is None:
+        metrics.record(hedged=True)
+    else:
+        metrics.record(hedged=True, hedge_won=winner is secondary_task, wasted=len(pending))
+    return result
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=int(os.getenv("HEDGE_WORKERS", "16")),
+                                           thread_name_prefix="hedge")
+        return _executor
+
+def hedged_call_sync(primary: Callable[[], Optional[T]], secondary: Callable[[], Optional[T]],
+                     delay: float, metrics: HedgeMetrics = hedge_metrics) -> Optional[T]:
+    """Thread-based equivalent of hedged_call for the blocking clients"""
+    executor = _get_executor()
+    primary_future = executor.submit(primary)
+    done, _ = wait({primary_future}, timeout=delay)
+    if done:
+        result = primary_future.result()
+        metrics.record()
+        return result if result is not None else secondary()
+
+    secondary_future = executor.submit(secondary)
+    pending = {primary_future, secondary_future}
+    result = None
+    winner = None
+    while pending and result is None:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.result() is not None and result is None:
+                result = future.result()
+                winner = future
+
+    # Running threads cannot be interrupted; their results are discarded
+    for future in pending:
+        future.cancel()
+    if result is None:
+        metrics.record(hedged=True)
+    else:
+        metrics.record(hedged=True, hedge_won=winner is secondary_future, wasted=len(pending))
+    return result
@@ -0,0 +1,210 @@
+"""
+Process pool with per-task timeouts and memory caps
+
+Each worker is a separate process that runs one task at a time. A task that
+runs past its deadline gets its worker killed and replaced; a worker that
+dies (segfault, out-of-memory kill) is replaced too. Either way the task is
+reported as failed and the other workers keep going, so one pathological
+document cannot stall or crash a batch.
+"""
+
+import os
+import time
+import itertools
+import logging
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows: no address-space limits
+    resource = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASK_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "60"))
+DEFAULT_MEMORY_MB = int(os.getenv("EXTRACTION_MEMORY_MB", "1024"))
+# Workers start from a clean process rather than a fork of the caller, so they never
+# inherit its open SQLite connections, HTTP sessions or locks held by other threads
+DEFAULT_START_METHOD = os.getenv(
+    "EXTRACTION_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+def _address_space() -> Optional[int]:
+    """Current virtual memory size of this process in bytes (Linux only)"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmSize:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def _limit_memory(memory_mb: int) -> None:
+    """Let the worker allocate at most memory_mb beyond what it inherited"""
+    if not memory_mb or resource is None:
+        return
+    current = _address_space()
+    if current is None:
+        return
+    limit = current + memory_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as e:
+        logger.warning(f"⚠️ Could not cap worker memory: {str(e)}")
+
+def _worker_main(conn, memory_mb: int) -> None:
+    _limit_memory(memory_mb)
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        fn, args = task
+        try:
+            reply = (True, fn(*args))
+        except MemoryError:
+            reply = (False, f"exceeded the {memory_mb} MB memory cap")
+        except BaseException as e:
+            reply = (False, f"{type(e).__name__}: {str(e)}")
+        try:
+            conn.send(reply)
+        except MemoryError:
+            conn.send((False, f"exceeded the {memory_mb} MB memory cap"))
+
+class _Worker:
+    def __init__(self, context, memory_mb: int):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, memory_mb), daemon=True)
+        self.process.start()
+        child.close()
+        self.deadline = 0.0
+
+    def send(self, fn: Callable, args: tuple, timeout: float) -> None:
+        self.deadline = time.monotonic() + timeout if timeout else float("inf")
+        self.conn.send((fn, args))
+
+    def stop(self, kill: bool = False) -> None:
+        try:
+            if kill:
+                self.process.kill()
+            else:
+                self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=None if kill else 1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+class IsolatedPool:
+    """Runs fn(*args) in worker processes with a wall-clock timeout and memory cap per task"""
+
+    def __init__(self, workers: int, timeout: float = None, memory_mb: int = None, start_method: str = None):
+        self.workers = max(1, workers)
+        self.timeout = DEFAULT_TASK_TIMEOUT if timeout is None else timeout
+        self.memory_mb = DEFAULT_MEMORY_MB if memory_mb is None else memory_mb
+        self._context = multiprocessing.get_context(start_method or DEFAULT_START_METHOD)
+        self._idle: List[_Worker] = []
+        self._busy: Dict[int, _Worker] = {}
+        # Task ids are unique across imap calls so a call never collects another's results
+        self._ids = itertools.count()
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, self.memory_mb)
+
+    def imap(self, fn: Callable, tasks: Iterable[Tuple[Any, tuple]]) -> Iterator[Tuple[Any, bool, Any]]:
+        """
+        Yield (key, ok, value) for each (key, args) task, in input order
+
+        value is fn's return value, or an error message when ok is False.
+        Tasks whose args is None complete at once with value None, for items
+        the caller already has a result for (e.g. cache hits). Tasks are pulled
+        lazily and at most 2 * workers results are buffered.
+        """
+        tasks = iter(tasks)
+        window = self.workers * 2
+        order: Deque[int] = deque()      # task ids in input order, not yet yielded
+        keys: Dict[int, Any] = {}
+        done: Dict[int, Tuple[bool, Any]] = {}
+        busy: Dict[int, _Worker] = {}    # this call's running tasks
+        exhausted = False
+
+        try:
+            while True:
+                # Hand out work while a worker is free and the reorder window has room
+                while not exhausted and len(order) < window and len(busy) < self.workers:
+                    task = next(tasks, None)
+                    if task is None:
+                        exhausted = True
+                        break
+                    key, args = task
+                    task_id = next(self._ids)
+                    keys[task_id] = key
+                    order.append(task_id)
+                    if args is None:
+                        done[task_id] = (True, None)
+                    else:
+                        worker = self._idle.pop() if self._idle else self._spawn()
+                        worker.send(fn, args, self.timeout)
+                        busy[task_id] = self._busy[task_id] = worker
+
+                while order and order[0] in done:
+                    task_id = order.popleft()
+                    ok, value = done.pop(task_id)
+                    yield keys.pop(task_id), ok, value
+
+                if not busy:
+                    if exhausted and not order:
+                        return
+                    continue
+
+                deadline = min(worker.deadline for worker in busy.values())
+                timeout = max(0.0, deadline - time.monotonic()) if deadline != float("inf") else None
+                ready = wait([worker.conn for worker in busy.values()], timeout)
+                for task_id, worker in list(busy.items()):
+                    if worker.conn in ready:
+                        try:
+                            done[task_id] = worker.conn.recv()
+                            self._idle.append(worker)
+                        except (EOFError, OSError):
+                            worker.stop(kill=True)
+                            code = worker.process.exitcode
+                            logger.error(f"❌ Worker process died (exit code {code})")
+                            done[task_id] = (False, f"worker process crashed (exit code {code})")
+                    elif time.monotonic() >= worker.deadline:
+                        logger.error(f"❌ Task timed out after {self.timeout:.0f}s; restarting its worker")
+                        done[task_id] = (False, f"timed out after {self.timeout:.0f}s")
+                        worker.stop(kill=True)
+                    else:
+                        continue
+                    del busy[task_id], self._busy[task_id]
+        finally:
+            # Abandoned early (break, exception, dropped generator): kill the workers
+            # still running our tasks so their results can't reach a later call
+            for task_id, worker in busy.items():
+                worker.stop(kill=True)
+                self._busy.pop(task_id, None)
+
+    def close(self) -> None:
+        """Stop all workers; busy ones are killed"""
+        for worker in self._busy.values():
+            worker.stop(kill=True)
+        for worker in self._idle:
+            worker.stop()
+        self._busy.clear()
+        self._idle.clear()
+
+    def __enter__(self) -> "IsolatedPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
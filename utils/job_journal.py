@@ -0,0 +1,156 @@
+"""
+Append-only journal for long screening runs
+
+Every finished CV is appended to a JSON Lines file (flushed and fsynced) as
+soon as its result arrives. Re-running the same job reads the journal back,
+skips CVs whose content already has a result, retries the ones that failed,
+and can rebuild the final reports without calling the LLM again. Results from
+the local fallback scorer are kept as provisional: they appear in the reports
+but the CV is analyzed again on the next run.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from utils.local_scorer import LOCAL_PROVIDER
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+JOBS_DIR = os.path.join(os.getenv("RESULTS_DIRECTORY", "results"), "jobs")
+# Entries whose result appears in reports; "provisional" ones are retried
+RESULT_STATUSES = ("done", "provisional")
+
+def content_key(cv_item: Dict) -> str:
+    """Identify a CV by its extracted text, so renamed files resume correctly"""
+    if cv_item.get("content_key"):
+        # Precomputed for callers that do not keep the text around
+        return cv_item["content_key"]
+    return hashlib.sha256(cv_item.get("text", "").encode("utf-8")).hexdigest()
+
+def job_name_for(source: str, kind: str = "mel") -> str:
+    """Stable journal name for analyzing the given directory / upload set"""
+    return f"{kind}_{hashlib.sha256(os.path.abspath(source).encode('utf-8')).hexdigest()[:12]}"
+
+class JobJournal:
+    """Durable per-job record of completed and failed CVs"""
+
+    def __init__(self, name: str, result_type: Type, jobs_dir: str = JOBS_DIR):
+        self.name = name
+        self.result_type = result_type
+        self.path = os.path.join(jobs_dir, f"{name}.jsonl")
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+        os.makedirs(jobs_dir, exist_ok=True)
+        self._load()
+        self.file = open(self.path, "a", encoding="utf-8")
+        if self.file.tell() and not self._ends_with_newline():
+            # Terminate a torn final line so the next entry starts cleanly
+            self.file.write("\n")
+            self.file.flush()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a torn final line
+                    logger.warning(f"⚠️ Ignoring unreadable journal line {line_number} in {self.path}")
+                    continue
+                self.entries[entry["key"]] = entry
+        done = sum(1 for entry in self.entries.values() if entry["status"] == "done")
+        provisional = sum(1 for entry in self.entries.values() if entry["status"] == "provisional")
+        logger.info(f"📒 Journal {self.name}: {done} completed, {provisional} scored locally, "
+                    f"{len(self.entries) - done - provisional} failed")
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with self.lock:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.entries[entry["key"]] = entry
+
+    def record_success(self, cv_item: Dict, result: Any) -> None:
+        local = getattr(result, "provider_used", None) == LOCAL_PROVIDER
+        if local and self.is_done(cv_item):
+            # Never replace an AI analysis with a local score
+            return
+        self._append({"key": content_key(cv_item), "filename": cv_item["filename"],
+                      "status": "provisional" if local else "done",
+                      "recorded_at": time.time(), "result": asdict(result)})
+
+    def record_failure(self, cv_item: Dict, error: str = "Analysis failed") -> None:
+        if self._has_result(cv_item):
+            # A duplicate of an already analyzed CV keeps its result
+            return
+        self._append({"key": content_key(cv_item), "filename": cv_item["filename"], "status": "failed",
+                      "recorded_at": time.time(), "error": error})
+
+    def record(self, cv_item: Dict, result: Optional[Any]) -> None:
+        """Record an analyzer outcome (None = failure)"""
+        if result is None:
+            self.record_failure(cv_item)
+        else:
+            self.record_success(cv_item, result)
+
+    def is_done(self, cv_item: Dict) -> bool:
+        entry = self.entries.get(content_key(cv_item))
+        return bool(entry and entry["status"] == "done")
+
+    def _has_result(self, cv_item: Dict) -> bool:
+        entry = self.entries.get(content_key(cv_item))
+        return bool(entry and entry["status"] in RESULT_STATUSES)
+
+    def pending(self, cv_data: List[Dict]) -> List[Dict]:
+        """CVs still to analyze: never seen, previously failed or only scored locally"""
+        return [cv_item for cv_item in cv_data if not self.is_done(cv_item)]
+
+    def results(self, cv_data: List[Dict] = None) -> List[Any]:
+        """Completed results rebuilt from the journal, in cv_data order when given"""
+        if cv_data is None:
+            entries = [entry for entry in self.entries.values() if entry["status"] in RESULT_STATUSES]
+            return [self.result_type(**entry["result"]) for entry in entries]
+        return [result for _, result in self.analyzed(cv_data)]
+
+    def analyzed(self, cv_data: List[Dict]) -> List[Tuple[Dict, Any]]:
+        """(cv_item, result) for the CVs of cv_data that have a result, in cv_data order"""
+        pairs = []
+        for cv_item in cv_data:
+            entry = self.entries.get(content_key(cv_item))
+            if entry and entry["status"] in RESULT_STATUSES:
+                pairs.append((cv_item, self.result_type(**{**entry["result"], "filename": cv_item["filename"]})))
+        return pairs
+
+    def reset(self) -> None:
+        """Start the job over, discarding its journal"""
+        with self.lock:
+            self.file.close()
+            self.file = open(self.path, "w", encoding="utf-8")
+            self.entries.clear()
+
+    def close(self) -> None:
+        with self.lock:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,192 @@
+"""
+Local keyword pre-screen for large applicant pools
+
+Every CV is matched against the MEL keyword lists in config.job_description
+in a single pass with an Aho-Corasick automaton over word tokens, giving a
+provisional 0-100 ranking at no API cost. Only the top K CVs (or those above
+a minimum score) are then sent to the AI analyzers.
+"""
+
+import os
+import re
+import heapq
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from config.job_description import (
+    EDUCATION_KEYWORDS, EXPERIENCE_KEYWORDS, TECHNICAL_KEYWORDS, SECTOR_KEYWORDS, SCORING_CRITERIA
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+KEYWORD_TOP_K = int(os.getenv("KEYWORD_TOP_K", "0"))
+KEYWORD_MIN_SCORE = float(os.getenv("KEYWORD_MIN_SCORE", "0"))
+# Distinct keywords a category needs for full marks
+KEYWORD_SATURATION = int(os.getenv("KEYWORD_SATURATION", "5"))
+
+CATEGORY_KEYWORDS = {
+    "education": EDUCATION_KEYWORDS,
+    "experience": EXPERIENCE_KEYWORDS,
+    "technical_skills": TECHNICAL_KEYWORDS,
+    "sector_knowledge": SECTOR_KEYWORDS
+}
+
+# Tokens keep '&' so "M&E" stays one word
+_TOKENS = re.compile(r"[a-z0-9&]+")
+
+def tokenize(text: str) -> List[str]:
+    return _TOKENS.findall(text.lower())
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher over word tokens
+
+    Patterns are phrases; matching whole tokens means "ma" or "eu" never
+    fire inside longer words. All patterns are found in one pass over the text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+        for pattern in patterns:
+            self._insert(pattern)
+        self._link()
+
+    def _insert(self, pattern: str) -> None:
+        tokens = tokenize(pattern)
+        if not tokens or pattern in self.patterns:
+            return
+        state = 0
+        for token in tokens:
+            if token not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][token] = len(self.goto) - 1
+            state = self.goto[state][token]
+        self.output[state].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _link(self) -> None:
+        """Breadth-first failure links; each state inherits the outputs of its suffix state"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0) if state else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text: str) -> Iterator[str]:
+        """Yield every pattern occurrence in text"""
+        state = 0
+        for token in tokenize(text):
+            while state and token not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(token, 0)
+            for index in self.output[state]:
+                yield self.patterns[index]
+
+@dataclass
+class KeywordScore:
+    """Provisional keyword score for one CV"""
+    score: float
+    category_scores: Dict[str, float] = field(default_factory=dict)
+    matched: Dict[str, List[str]] = field(default_factory=dict)
+
+class KeywordScorer:
+    """Scores CVs by the distinct job keywords they mention, weighted like SCORING_CRITERIA"""
+
+    def __init__(self, categories: Dict[str, Sequence[str]] = None, saturation: int = None):
+        self.categories = categories or CATEGORY_KEYWORDS
+        self.saturation = max(1, saturation or KEYWORD_SATURATION)
+        self.weights = {name: SCORING_CRITERIA.get(name, {}).get("weight", 10) for name in self.categories}
+        self.keyword_categories: Dict[str, List[str]] = {}
+        for name, keywords in self.categories.items():
+            for keyword in keywords:
+                self.keyword_categories.setdefault(keyword, []).append(name)
+        self.matcher = AhoCorasick(self.keyword_categories)
+
+    def score(self, text: str) -> KeywordScore:
+        matched = {name: set() for name in self.categories}
+        for keyword in self.matcher.find(text):
+            for name in self.keyword_categories[keyword]:
+                matched[name].add(keyword)
+        category_scores = {
+            name: round(100 * min(len(found) / self.saturation, 1.0), 1) for name, found in matched.items()
+        }
+        total_weight = sum(self.weights.values())
+        score = sum(category_scores[name] * self.weights[name] for name in self.categories) / total_weight
+        return KeywordScore(round(score, 1), category_scores, {name: sorted(found) for name, found in matched.items()})
+
+class KeywordPrescreen:
+    """
+    Shortlists documents by keyword score before they reach the analyzers
+
+    With only min_score, documents stream straight through; with top_k the
+    best K are kept in a bounded heap and released once the input is
+    exhausted, best first. ranking has one row per scored document.
+    """
+
+    def __init__(self, top_k: int = None, min_score: float = None, scorer: KeywordScorer = None):
+        self.top_k = KEYWORD_TOP_K if top_k is None else top_k
+        self.min_score = KEYWORD_MIN_SCORE if min_score is None else min_score
+        self.scorer = scorer or KeywordScorer()
+        self.ranking: List[Dict] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.top_k or self.min_score)
+
+    def _row(self, cv_item: Dict, result: KeywordScore) -> Dict:
+        row = {"filename": cv_item.get("filename", ""), "keyword_score": result.score}
+        row.update({f"{name}_score": value for name, value in result.category_scores.items()})
+        row["keywords_matched"] = sum(len(found) for found in result.matched.values())
+        row["shortlisted"] = False
+        self.ranking.append(row)
+        return row
+
+    def filter(self, cv_data: Iterable[Dict]) -> Iterator[Dict]:
+        """Yield the shortlisted documents"""
+        heap: List[Tuple[float, int, Dict, Dict]] = []
+        for position, cv_item in enumerate(cv_data):
+            result = self.scorer.score(cv_item.get("text", ""))
+            row = self._row(cv_item, result)
+            if result.score < self.min_score:
+                continue
+            if not self.top_k:
+                row["shortlisted"] = True
+                yield cv_item
+            # Earlier documents win ties
+            elif len(heap) < self.top_k:
+                heapq.heappush(heap, (result.score, -position, row, cv_item))
+            elif (result.score, -position) > heap[0][:2]:
+                heapq.heapreplace(heap, (result.score, -position, row, cv_item))
+
+        if self.top_k:
+            for _, _, row, cv_item in sorted(heap, key=lambda entry: entry[:2], reverse=True):
+                row["shortlisted"] = True
+                yield cv_item
+        shortlisted = sum(row["shortlisted"] for row in self.ranking)
+        logger.info(f"🔎 Keyword pre-screen: {shortlisted}/{len(self.ranking)} CVs shortlisted for AI analysis")
+
+    def ranked(self) -> List[Dict]:
+        """Ranking rows, best keyword score first"""
+        return sorted(self.ranking, key=lambda row: row["keyword_score"], reverse=True)
+
+def prescreen_documents(cv_data: List[Dict], top_k: int = None,
+                        min_score: float = None) -> Tuple[List[Dict], List[Dict]]:
+    """(shortlisted, ranking); everything is shortlisted when neither limit is set"""
+    prescreen = KeywordPrescreen(top_k, min_score)
+    if not prescreen.enabled:
+        return list(cv_data), []
+    shortlisted = list(prescreen.filter(cv_data))
+    return shortlisted, prescreen.ranked()
@@ -0,0 +1,220 @@
+"""
+Deterministic local CV scorer used when every AI provider fails
+
+A batch of CVs becomes one NumPy term-frequency matrix over the keyword
+lists in config.job_description (plus the job description's own terms for
+custom roles). Category scores for the whole batch are then a handful of
+matrix operations on the 0-30 scale of the scoring guides, so a provider
+outage degrades to a provisional keyword-based ranking instead of stalling
+the run. Results are tagged with the "Local" provider.
+"""
+
+import os
+import re
+import logging
+from functools import lru_cache
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from config.job_description import (
+    EDUCATION_KEYWORDS, EXPERIENCE_KEYWORDS, TECHNICAL_KEYWORDS, SECTOR_KEYWORDS, SCORING_CRITERIA,
+    COMMUNICATION_KEYWORDS, REGIONAL_KEYWORDS, LEADERSHIP_KEYWORDS, DEGREE_LEVELS
+)
+from utils.keyword_screen import AhoCorasick, tokenize
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+LOCAL_PROVIDER = "Local"
+LOCAL_FALLBACK = os.getenv("LOCAL_FALLBACK", "true").lower() in ("1", "true", "yes")
+# Distinct keywords a category needs for full marks
+LOCAL_SATURATION = int(os.getenv("LOCAL_SATURATION", "6"))
+
+MEL_CATEGORIES = {
+    "education": EDUCATION_KEYWORDS,
+    "experience": EXPERIENCE_KEYWORDS,
+    "technical_skills": TECHNICAL_KEYWORDS,
+    "sector_knowledge": SECTOR_KEYWORDS,
+    "communication": COMMUNICATION_KEYWORDS,
+    "regional_experience": REGIONAL_KEYWORDS
+}
+MEL_WEIGHTS = {name: SCORING_CRITERIA[name]["weight"] for name in MEL_CATEGORIES}
+
+# Custom roles: the JD's own terms stand in for the MEL lists
+JOB_WEIGHTS = {"education": 15, "experience": 20, "technical_skills": 20, "domain_knowledge": 30,
+               "communication": 10, "leadership": 5}
+
+# Years of experience -> experience points, following the scoring guide bands
+YEARS_BANDS = ([0, 1, 3, 5, 7, 10], [4, 10, 15, 20, 25, 30])
+
+_STATED_YEARS = re.compile(r"(\d{1,2})\s*\+?\s*(?:years|yrs)", re.IGNORECASE)
+_DATE_RANGE = re.compile(r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|date|now)\b",
+                         re.IGNORECASE)
+_STOPWORDS = {
+    "the", "and", "of", "to", "in", "for", "with", "on", "at", "by", "a", "an", "as", "from", "is", "are",
+    "be", "or", "will", "this", "that", "our", "we", "you", "your", "their", "role", "position", "candidate",
+    "candidates", "ability", "able", "strong", "excellent", "good", "including", "etc", "years", "year",
+    "experience", "work", "working", "required", "requirements", "preferred", "must", "should", "responsible",
+    "responsibilities", "key", "skills", "knowledge", "job", "description", "team", "other", "related", "field"
+}
+
+@dataclass
+class LocalScore:
+    """Local scores for one CV; category scores are on the 0-30 scale"""
+    overall_score: float
+    tier: str
+    category_scores: Dict[str, float]
+    years_experience: int
+    highest_degree: str
+    matched: Dict[str, List[str]] = field(default_factory=dict)
+
+    def strengths(self) -> List[str]:
+        return [f"{name.replace('_', ' ').capitalize()}: {', '.join(self.matched.get(name, [])[:5]) or 'strong match'}"
+                for name, score in self.category_scores.items() if score >= 20] or ["No category scored strongly"]
+
+    def weaknesses(self) -> List[str]:
+        return [f"Little evidence of {name.replace('_', ' ')}"
+                for name, score in self.category_scores.items() if score < 10]
+
+LOCAL_SUMMARY = ("Provisional keyword-based score computed locally because no AI provider was available; "
+                 "re-run the analysis for a full assessment.")
+
+def score_tier(score: float) -> str:
+    if score >= 90:
+        return "Excellent"
+    if score >= 80:
+        return "Very Good"
+    if score >= 70:
+        return "Good"
+    if score >= 60:
+        return "Fair"
+    return "Poor"
+
+def years_of_experience(text: str) -> int:
+    """Stated years ("7+ years"), else the span of the date ranges in the CV"""
+    stated = [int(n) for n in _STATED_YEARS.findall(text) if int(n) <= 45]
+    if stated:
+        return max(stated)
+    current = datetime.now().year
+    starts, ends = [], []
+    for start, end in _DATE_RANGE.findall(text):
+        starts.append(int(start))
+        ends.append(current if not end[0].isdigit() else int(end))
+    if not starts:
+        return 0
+    return max(0, min(max(ends), current) - min(starts))
+
+def job_terms(job_description: str, limit: int = 60) -> List[str]:
+    """Most frequent content words of a job description"""
+    counts: Dict[str, int] = {}
+    for token in tokenize(job_description):
+        if len(token) > 2 and token not in _STOPWORDS and not token.isdigit():
+            counts[token] = counts.get(token, 0) + 1
+    return [term for term, _ in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]]
+
+@lru_cache(maxsize=8)
+def _matcher(vocabulary: Tuple[str, ...]) -> AhoCorasick:
+    """Automaton for a vocabulary; only the MEL lists and a few recent job descriptions are kept"""
+    return AhoCorasick(vocabulary)
+
+class LocalScorer:
+    """Scores a batch of CVs from one term-frequency matrix"""
+
+    def __init__(self, saturation: int = None):
+        self.saturation = max(1, saturation or LOCAL_SATURATION)
+
+    def _term_matrix(self, texts: Sequence[str], categories: Dict[str, Sequence[str]]):
+        """(tf matrix docs x terms, category membership terms x categories, vocabulary)"""
+        vocabulary = list(dict.fromkeys(term for terms in categories.values() for term in terms))
+        vocabulary += [degree for degree in DEGREE_LEVELS if degree not in vocabulary]
+        index = {term: i for i, term in enumerate(vocabulary)}
+        matcher = _matcher(tuple(vocabulary))
+
+        tf = np.zeros((len(texts), len(vocabulary)), dtype=np.float64)
+        for row, text in enumerate(texts):
+            hits = [index[term] for term in matcher.find(text)]
+            if hits:
+                np.add.at(tf[row], hits, 1)
+
+        membership = np.zeros((len(vocabulary), len(categories)))
+        for column, terms in enumerate(categories.values()):
+            membership[[index[term] for term in terms if term in index], column] = 1
+        return tf, membership, vocabulary
+
+    def score_batch(self, texts: Sequence[str], job_description: str = None) -> List[LocalScore]:
+        """
+        Score every CV at once
+
+        Without a job description the six MEL categories of SCORING_CRITERIA
+        are scored; with one, the JD's frequent terms measure domain fit.
+        """
+        if not texts:
+            return []
+        if job_description:
+            categories = {"education": EDUCATION_KEYWORDS, "experience": [], "technical_skills": TECHNICAL_KEYWORDS,
+                          "domain_knowledge": job_terms(job_description),
+                          "communication": COMMUNICATION_KEYWORDS, "leadership": LEADERSHIP_KEYWORDS}
+            weights = JOB_WEIGHTS
+        else:
+            categories, weights = MEL_CATEGORIES, MEL_WEIGHTS
+        names = list(categories)
+        tf, membership, vocabulary = self._term_matrix(texts, categories)
+        present = tf > 0
+
+        # Coverage: distinct keywords found per category, saturating at full marks
+        distinct = present @ membership
+        saturation = np.minimum(membership.sum(axis=0), self.saturation)
+        if job_description:
+            # A CV covering a third of the JD's vocabulary is a full match
+            saturation[names.index("domain_knowledge")] = max(1.0, len(categories["domain_knowledge"]) / 3)
+        coverage = np.clip(distinct / np.maximum(saturation, 1), 0, 1) * 30
+
+        # Education: highest degree mentioned, blended with subject relevance
+        degree_points = np.array([DEGREE_LEVELS.get(term, 0) for term in vocabulary], dtype=np.float64)
+        level = (present * degree_points).max(axis=1)
+        education = names.index("education")
+        coverage[:, education] = 0.6 * level + 0.4 * coverage[:, education]
+
+        # Experience: years in the scoring guide bands, blended with role keywords
+        years = np.array([years_of_experience(text) for text in texts], dtype=np.float64)
+        years_points = np.interp(years, *YEARS_BANDS)
+        experience = names.index("experience")
+        coverage[:, experience] = (years_points if job_description
+                                   else 0.6 * years_points + 0.4 * coverage[:, experience])
+
+        scores = np.round(coverage, 1)
+        weight_vector = np.array([weights[name] for name in names], dtype=np.float64)
+        overall = np.round(scores @ weight_vector / weight_vector.sum() * 100 / 30, 1)
+
+        degree_names = np.array([term if DEGREE_LEVELS.get(term) else "" for term in vocabulary])
+        results = []
+        for row in range(len(texts)):
+            found = np.flatnonzero(present[row])
+            matched = {name: [vocabulary[i] for i in found if membership[i, column]]
+                       for column, name in enumerate(names)}
+            degrees = [term for term in degree_names[found] if term]
+            highest = max(degrees, key=DEGREE_LEVELS.get) if degrees else ""
+            results.append(LocalScore(
+                overall_score=float(overall[row]),
+                tier=score_tier(float(overall[row])),
+                category_scores={name: float(scores[row, column]) for column, name in enumerate(names)},
+                years_experience=int(years[row]),
+                highest_degree=highest,
+                matched=matched
+            ))
+        return results
+
+    def score(self, text: str, job_description: str = None) -> LocalScore:
+        return self.score_batch([text], job_description)[0]
+
+_local_scorer = None
+
+def get_local_scorer() -> LocalScorer:
+    """Process-wide local scorer"""
+    global _local_scorer
+    if _local_scorer is None:
+        _local_scorer = LocalScorer()
+    return _local_scorer
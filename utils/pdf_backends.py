@@ -0,0 +1,186 @@
+"""
+Pluggable PDF text extraction backends
+
+PyPDF2 is always available and is the default. pypdf, PyMuPDF (fitz) and
+pdfminer.six are used when installed. benchmark_backends measures pages per
+second and the empty-text rate of each backend on a sample of CVs, and
+select_backend picks the fastest one within a quality threshold; the choice
+can be saved so PDF_BACKEND=auto uses it in later runs.
+"""
+
+import os
+import io
+import json
+import time
+import logging
+import importlib.util
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from utils.response_cache import CACHE_DIR
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PdfSource = Union[str, BinaryIO]
+
+DEFAULT_BACKEND = "PyPDF2"
+PDF_BACKEND = os.getenv("PDF_BACKEND", DEFAULT_BACKEND)
+SELECTION_PATH = os.getenv("PDF_BACKEND_SELECTION_PATH", os.path.join(CACHE_DIR, "pdf_backend.json"))
+
+class PDFBackend:
+    """Opens a PDF and yields the text of its pages lazily"""
+    name = ""
+    module = ""
+
+    def available(self) -> bool:
+        return importlib.util.find_spec(self.module) is not None
+
+    def pages(self, source: PdfSource) -> Tuple[int, Iterator[str]]:
+        """(page_count, iterator of page texts); pages are only parsed when iterated"""
+        raise NotImplementedError
+
+class PyPDF2Backend(PDFBackend):
+    name = "PyPDF2"
+    module = "PyPDF2"
+
+    def pages(self, source: PdfSource) -> Tuple[int, Iterator[str]]:
+        import PyPDF2
+        reader = PyPDF2.PdfReader(source)
+        return len(reader.pages), (page.extract_text() or "" for page in reader.pages)
+
+class PypdfBackend(PDFBackend):
+    name = "pypdf"
+    module = "pypdf"
+
+    def pages(self, source: PdfSource) -> Tuple[int, Iterator[str]]:
+        import pypdf
+        reader = pypdf.PdfReader(source)
+        return len(reader.pages), (page.extract_text() or "" for page in reader.pages)
+
+class PyMuPDFBackend(PDFBackend):
+    name = "pymupdf"
+    module = "fitz"
+
+    def pages(self, source: PdfSource) -> Tuple[int, Iterator[str]]:
+        import fitz
+        document = fitz.open(source) if isinstance(source, str) else fitz.open(stream=source.read(), filetype="pdf")
+
+        def texts() -> Iterator[str]:
+            try:
+                for page in document:
+                    yield page.get_text()
+            finally:
+                document.close()
+        return document.page_count, texts()
+
+class PdfminerBackend(PDFBackend):
+    name = "pdfminer"
+    module = "pdfminer"
+
+    def pages(self, source: PdfSource) -> Tuple[int, Iterator[str]]:
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+        from pdfminer.pdfpage import PDFPage
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                data = f.read()
+        else:
+            data = source.read()
+        page_count = sum(1 for _ in PDFPage.get_pages(io.BytesIO(data)))
+
+        def texts() -> Iterator[str]:
+            for layout in extract_pages(io.BytesIO(data)):
+                yield "".join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+        return page_count, texts()
+
+BACKENDS: Dict[str, PDFBackend] = {
+    backend.name: backend for backend in (PyPDF2Backend(), PypdfBackend(), PyMuPDFBackend(), PdfminerBackend())
+}
+
+def available_backends() -> List[str]:
+    """Names of the installed backends, default first"""
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+def load_selection(path: str = None) -> Optional[str]:
+    """Backend saved by the last benchmark, if it is still installed"""
+    try:
+        with open(path or SELECTION_PATH, "r", encoding="utf-8") as f:
+            name = json.load(f).get("backend")
+    except (OSError, ValueError):
+        return None
+    return name if name in available_backends() else None
+
+def save_selection(name: str, results: List[Dict], path: str = None) -> str:
+    path = path or SELECTION_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"backend": name, "benchmark": results, "saved_at": time.time()}, f, indent=2)
+    return path
+
+def get_backend(name: str = None) -> PDFBackend:
+    """
+    Resolve a backend name; "auto" means the saved benchmark choice
+
+    Unknown or uninstalled backends fall back to PyPDF2 with a warning.
+    """
+    name = name or PDF_BACKEND
+    if name == "auto":
+        name = load_selection() or DEFAULT_BACKEND
+    backend = BACKENDS.get(name)
+    if backend is None or not backend.available():
+        logger.warning(f"⚠️ PDF backend '{name}' is not available, using {DEFAULT_BACKEND}")
+        backend = BACKENDS[DEFAULT_BACKEND]
+    return backend
+
+def benchmark_backends(sample: Sequence[str], backends: Sequence[str] = None,
+                       max_pages: int = None) -> List[Dict]:
+    """
+    Time each backend over a sample of PDF files
+
+    Returns one row per backend with pages_per_second, empty_rate (share of
+    files that yielded no text) and error count.
+    """
+    rows = []
+    for name in backends or available_backends():
+        backend = BACKENDS[name]
+        pages = empty = errors = 0
+        start = time.perf_counter()
+        for path in sample:
+            try:
+                page_count, texts = backend.pages(path)
+                limit = min(page_count, max_pages) if max_pages else page_count
+                has_text = False
+                for i, page_text in enumerate(texts):
+                    if i >= limit:
+                        break
+                    has_text = has_text or bool(page_text.strip())
+                    pages += 1
+                empty += not has_text
+            except Exception as e:
+                logger.debug(f"{name} failed on {path}: {str(e)}")
+                errors += 1
+                empty += 1
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "backend": name,
+            "files": len(sample),
+            "pages": pages,
+            "seconds": round(elapsed, 3),
+            "pages_per_second": round(pages / elapsed, 1) if elapsed else 0.0,
+            "empty_rate": round(empty / len(sample), 4) if sample else 0.0,
+            "errors": errors
+        })
+    return rows
+
+def select_backend(results: List[Dict], max_empty_rate: float = None) -> str:
+    """
+    Fastest backend whose empty-text rate is within max_empty_rate of the best
+
+    A backend that reads fewer documents than the others is not worth its speed.
+    """
+    if not results:
+        return DEFAULT_BACKEND
+    best_rate = min(row["empty_rate"] for row in results)
+    tolerance = float(os.getenv("PDF_BACKEND_MAX_EMPTY_RATE", "0.01")) if max_empty_rate is None else max_empty_rate
+    eligible = [row for row in results if row["empty_rate"] <= best_rate + tolerance]
+    return max(eligible, key=lambda row: row["pages_per_second"])["backend"]
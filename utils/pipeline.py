@@ -0,0 +1,109 @@
+"""
+Streaming extraction -> analysis pipeline
+
+Documents flow from a producer (usually DocumentProcessor.iter_directory)
+through a bounded queue to a pool of analysis threads, and results flow back
+to the caller through a second bounded queue. Parsing and LLM calls overlap,
+and a slow stage applies backpressure to the one before it, so only about
+queue_size + max_workers documents are in memory at any time.
+"""
+
+import os
+import queue
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from utils.batch_runner import DEFAULT_MAX_WORKERS, CancellationToken
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+DEFAULT_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "16"))
+
+_DONE = object()
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocking put that gives up when the pipeline is stopped"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.2)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def run_pipeline(documents: Iterable[Dict], analyze: Callable[[Dict], Optional[R]],
+                 max_workers: int = None, queue_size: int = None,
+                 cancel_token: CancellationToken = None) -> Iterator[Tuple[Dict, Optional[R]]]:
+    """
+    Yield (document, result) pairs as analyses complete
+
+    Documents with an extraction error or no text are passed through with a
+    None result, without calling analyze. Closing the iterator or cancelling
+    the token stops both stages; documents not yet analyzed are dropped.
+    """
+    max_workers = max(1, max_workers or DEFAULT_MAX_WORKERS)
+    queue_size = max(1, queue_size or DEFAULT_QUEUE_SIZE)
+    inbox: queue.Queue = queue.Queue(maxsize=queue_size)
+    outbox: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def cancelled() -> bool:
+        return stop.is_set() or bool(cancel_token and cancel_token.cancelled)
+
+    def produce() -> None:
+        source = iter(documents)
+        try:
+            for document in source:
+                if cancelled() or not _put(inbox, document, stop):
+                    break
+        except Exception as e:
+            logger.error(f"❌ Document producer failed: {str(e)}")
+        finally:
+            # Lets a generator source (e.g. a process pool) clean up promptly
+            close = getattr(source, "close", None)
+            if close:
+                close()
+            for _ in range(max_workers):
+                _put(inbox, _DONE, stop)
+
+    def consume() -> None:
+        while not stop.is_set():
+            try:
+                document = inbox.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if document is _DONE:
+                break
+            if cancelled():
+                # Drain queued documents without analyzing or reporting them
+                continue
+            result = None
+            if not document.get("error") and document.get("text"):
+                try:
+                    result = analyze(document)
+                except Exception as e:
+                    logger.error(f"❌ Analysis failed for {document.get('filename')}: {str(e)}")
+            if not _put(outbox, (document, result), stop):
+                break
+        _put(outbox, _DONE, stop)
+
+    threads = [threading.Thread(target=produce, name="pipeline-extract", daemon=True)]
+    threads += [threading.Thread(target=consume, name=f"pipeline-analyze-{i}", daemon=True)
+                for i in range(max_workers)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        finished = 0
+        while finished < max_workers:
+            item = outbox.get()
+            if item is _DONE:
+                finished += 1
+                continue
+            yield item
+    finally:
+        stop.set()
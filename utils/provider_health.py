@@ -0,0 +1,120 @@
+"""
+Shared, cached health checks for AI providers
+
+Probes run lazily in a background thread and their results are cached with a
+TTL, so analyzers can read provider status at construction time without
+paying for a live API round trip.
+"""
+
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ProviderHealth:
+    """Result of the most recent health probe for a provider"""
+    provider: str
+    healthy: bool
+    checked_at: float
+    latency: float = 0.0
+    error: str = ""
+
+    @property
+    def age(self) -> float:
+        """Seconds since the probe finished"""
+        return time.time() - self.checked_at
+
+class ProviderHealthRegistry:
+    """Process-wide cache of provider health probes"""
+
+    def __init__(self, ttl: float = 300.0, failure_ttl: float = 30.0):
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._probes: Dict[str, Callable[[], None]] = {}
+        self._status: Dict[str, ProviderHealth] = {}
+        self._in_flight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def register(self, key: str, probe: Callable[[], None]) -> None:
+        """Register a probe; it should raise on failure"""
+        with self._lock:
+            self._probes[key] = probe
+
+    def _is_fresh(self, status: Optional[ProviderHealth]) -> bool:
+        if status is None:
+            return False
+        ttl = self.ttl if status.healthy else self.failure_ttl
+        return status.age < ttl
+
+    def status(self, key: str) -> Optional[ProviderHealth]:
+        """Return the cached status without blocking, refreshing it in the background if stale"""
+        with self._lock:
+            status = self._status.get(key)
+        if not self._is_fresh(status):
+            self.refresh(key, background=True)
+        return status
+
+    def check(self, key: str, timeout: float = None) -> Optional[ProviderHealth]:
+        """Return a fresh status, waiting for a probe if the cached one is stale"""
+        with self._lock:
+            status = self._status.get(key)
+        if self._is_fresh(status):
+            return status
+        done = self.refresh(key, background=True)
+        if done is not None:
+            done.wait(timeout)
+        with self._lock:
+            return self._status.get(key)
+
+    def refresh(self, key: str, background: bool = True) -> Optional[threading.Event]:
+        """Start a probe for key unless one is already running; returns its completion event"""
+        with self._lock:
+            probe = self._probes.get(key)
+            if probe is None:
+                return None
+            done = self._in_flight.get(key)
+            if done is not None:
+                return done
+            done = threading.Event()
+            self._in_flight[key] = done
+
+        if background:
+            threading.Thread(target=self._run_probe, args=(key, probe, done),
+                             name=f"health-probe-{key}", daemon=True).start()
+        else:
+            self._run_probe(key, probe, done)
+        return done
+
+    def _run_probe(self, key: str, probe: Callable[[], None], done: threading.Event) -> None:
+        start = time.time()
+        try:
+            probe()
+            status = ProviderHealth(key, True, time.time(), latency=time.time() - start)
+            logger.info(f"✅ {key} health probe succeeded ({status.latency:.2f}s)")
+        except Exception as e:
+            status = ProviderHealth(key, False, time.time(), latency=time.time() - start, error=str(e))
+            logger.warning(f"⚠️ {key} health probe failed: {str(e)}")
+        with self._lock:
+            self._status[key] = status
+            self._in_flight.pop(key, None)
+        done.set()
+
+    def invalidate(self, key: str = None) -> None:
+        """Drop cached results for key (or all providers)"""
+        with self._lock:
+            if key is None:
+                self._status.clear()
+            else:
+                self._status.pop(key, None)
+
+# Shared by every analyzer, thread and Streamlit session in this process
+health_registry = ProviderHealthRegistry(
+    ttl=float(os.getenv("PROVIDER_HEALTH_TTL", "300")),
+    failure_ttl=float(os.getenv("PROVIDER_HEALTH_FAILURE_TTL", "30"))
+)
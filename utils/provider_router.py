@@ -0,0 +1,224 @@
+"""
+Circuit breakers, latency/error tracking and routing between AI providers
+
+Each provider has a process-wide ProviderMonitor holding a circuit breaker and
+EWMA latency / error-rate estimates. The clients record every attempt; the
+analyzers ask a ProviderRouter for the order in which to try providers.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from utils.retry import ProviderError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class ProviderUnavailableError(ProviderError):
+    """The provider's circuit is open; the call was not attempted"""
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open trial after a cool-down"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Whether a request would currently be allowed (does not claim the half-open trial)"""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                return time.monotonic() - self.opened_at >= self.cooldown
+            return not self.trial_in_flight
+
+    def allow_request(self) -> bool:
+        """Claim permission for one request"""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self.trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self.trial_in_flight:
+                # A single real request probes the provider after the cool-down
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """Give back a half-open trial whose outcome says nothing about provider health"""
+        with self.lock:
+            self.trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns True when this trips the breaker open"""
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                tripped = self.state != self.OPEN
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                return tripped
+            return False
+
+class ProviderMonitor:
+    """Circuit breaker plus EWMA latency and error-rate tracking for one provider"""
+
+    def __init__(self, name: str, alpha: float = 0.2, failure_threshold: int = 5,
+                 cooldown: float = 30.0, window: int = 200):
+        self.name = name
+        self.alpha = alpha
+        self.breaker = CircuitBreaker(failure_threshold, cooldown)
+        self.ewma_latency: Optional[float] = None
+        self.ewma_error_rate = 0.0
+        self.latencies = deque(maxlen=window)
+        self.last_update = 0.0
+        self.lock = threading.Lock()
+
+    def _update(self, latency: float, failed: bool) -> None:
+        with self.lock:
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency = self.alpha * latency + (1 - self.alpha) * self.ewma_latency
+            self.ewma_error_rate = self.alpha * (1.0 if failed else 0.0) + (1 - self.alpha) * self.ewma_error_rate
+            if not failed:
+                self.latencies.append(latency)
+            self.last_update = time.monotonic()
+
+    def record_success(self, latency: float) -> None:
+        self._update(latency, failed=False)
+        self.breaker.record_success()
+
+    def record_failure(self, latency: float) -> None:
+        self._update(latency, failed=True)
+        if self.breaker.record_failure():
+            logger.warning(f"🔌 {self.name} circuit opened; retrying after {self.breaker.cooldown:.0f}s cool-down")
+
+    def claim(self) -> None:
+        """Ask the breaker for permission to call; raises ProviderUnavailableError if open"""
+        if not self.breaker.allow_request():
+            raise ProviderUnavailableError(f"{self.name} circuit is open", self.name)
+
+    @contextmanager
+    def track(self):
+        """Time one claimed provider attempt and record its outcome"""
+        start = time.monotonic()
+        try:
+            yield
+        except ProviderError as e:
+            if e.retryable:
+                self.record_failure(time.monotonic() - start)
+            else:
+                # Client errors (bad request/key) say nothing about provider health
+                self.breaker.release()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        else:
+            self.record_success(time.monotonic() - start)
+
+    def latency_percentile(self, percentile: float, min_samples: int = 10) -> Optional[float]:
+        """Latency at the given percentile (0-1) of recent successful calls"""
+        with self.lock:
+            if len(self.latencies) < min_samples:
+                return None
+            ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(percentile * len(ordered)))
+        return ordered[index]
+
+    def expected_cost(self, failure_penalty: float) -> Optional[float]:
+        """Expected seconds per call including the cost of failures; None if unknown"""
+        with self.lock:
+            if self.ewma_latency is None:
+                return None
+            return self.ewma_latency + self.ewma_error_rate * failure_penalty
+
+    def snapshot(self) -> Dict[str, object]:
+        """Current state for logging / display"""
+        with self.lock:
+            return {
+                "provider": self.name,
+                "circuit": self.breaker.state,
+                "ewma_latency": self.ewma_latency,
+                "ewma_error_rate": self.ewma_error_rate,
+                "samples": len(self.latencies)
+            }
+
+_monitors: Dict[str, ProviderMonitor] = {}
+_monitors_lock = threading.Lock()
+
+def get_provider_monitor(name: str) -> ProviderMonitor:
+    """Return the process-wide monitor for a provider"""
+    with _monitors_lock:
+        monitor = _monitors.get(name)
+        if monitor is None:
+            monitor = ProviderMonitor(
+                name,
+                failure_threshold=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")),
+                cooldown=float(os.getenv("CIRCUIT_COOLDOWN", "30"))
+            )
+            _monitors[name] = monitor
+        return monitor
+
+class ProviderRouter:
+    """Order providers by health, keeping the configured preference unless another is clearly better"""
+
+    def __init__(self, providers: List[str], failure_penalty: float = 60.0,
+                 switch_ratio: float = 1.5, stale_after: float = 300.0):
+        self.providers = list(providers)
+        self.failure_penalty = failure_penalty
+        self.switch_ratio = switch_ratio
+        self.stale_after = stale_after
+
+    def _cost(self, monitor: ProviderMonitor) -> Optional[float]:
+        # Stale statistics are treated as unknown so the provider gets re-explored
+        if time.monotonic() - monitor.last_update > self.stale_after:
+            return None
+        return monitor.expected_cost(self.failure_penalty)
+
+    def order(self) -> List[str]:
+        """Providers to try, best first; providers with an open circuit are left out"""
+        candidates = [name for name in self.providers if get_provider_monitor(name).breaker.available()]
+        if len(candidates) < 2:
+            return candidates
+
+        costs = {name: self._cost(get_provider_monitor(name)) for name in candidates}
+        preferred = candidates[0]
+        preferred_cost = costs[preferred]
+
+        def rank(item):
+            position, name = item
+            cost = costs[name]
+            if name == preferred or cost is None or preferred_cost is None:
+                return (0, position)
+            # Only jump ahead of the preferred provider when clearly cheaper
+            if cost * self.switch_ratio < preferred_cost:
+                return (-1, cost)
+            return (0, position)
+
+        return [name for _, name in sorted(enumerate(candidates), key=rank)]
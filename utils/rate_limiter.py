@@ -0,0 +1,114 @@
+"""
+Token-bucket rate limiting for AI provider calls
+
+One limiter per provider is shared by every thread, asyncio task and
+Streamlit session in the process, so batches run at the provider's allowed
+requests-per-minute and tokens-per-minute rather than at a fixed sleep.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Per-provider defaults; 0 disables a limit. Override with EURI_RPM / EURI_TPM / GROQ_RPM / GROQ_TPM.
+DEFAULT_LIMITS = {
+    "Euriai": {"requests_per_minute": 60, "tokens_per_minute": 0},
+    "Groq": {"requests_per_minute": 30, "tokens_per_minute": 0},
+}
+ENV_PREFIXES = {"Euriai": "EURI", "Groq": "GROQ"}
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int = 0) -> int:
+    """Estimate the tokens a chat call will consume (prompt + completion budget)"""
+    words = sum(len(str(m.get("content", "")).split()) for m in messages)
+    return int(words * 1.33) + max_tokens
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations instead of blocking"""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take amount now (the balance may go negative) and return the seconds to wait"""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        """Return unused tokens (or charge more with a negative amount)"""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+class ProviderRateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one provider"""
+
+    def __init__(self, provider: str, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        self.provider = provider
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        # Both buckets are reserved together so concurrent callers queue fairly
+        with self.lock:
+            wait = 0.0
+            if self.requests:
+                wait = max(wait, self.requests.reserve(1))
+            if self.tokens and tokens:
+                wait = max(wait, self.tokens.reserve(tokens))
+        if wait > 0:
+            logger.debug(f"{self.provider} rate limit: waiting {wait:.2f}s")
+        return wait
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block the calling thread until a request of this size is allowed"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """Wait without blocking the event loop until a request of this size is allowed"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record_usage(self, estimated: int, actual: Optional[int]) -> None:
+        """Reconcile the token estimate with the provider-reported usage"""
+        if self.tokens and actual is not None:
+            self.tokens.refund(estimated - actual)
+
+_limiters: Dict[str, ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    """Return the process-wide limiter for a provider, configured from the environment"""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            defaults = DEFAULT_LIMITS.get(provider, {"requests_per_minute": 0, "tokens_per_minute": 0})
+            prefix = ENV_PREFIXES.get(provider, provider.upper())
+            limiter = ProviderRateLimiter(
+                provider,
+                requests_per_minute=float(os.getenv(f"{prefix}_RPM", defaults["requests_per_minute"])),
+                tokens_per_minute=float(os.getenv(f"{prefix}_TPM", defaults["tokens_per_minute"]))
+            )
+            _limiters[provider] = limiter
+        return limiter
@@ -0,0 +1,174 @@
+"""
+Persistent, size-bounded caches backed by SQLite
+
+SQLiteLRUCache is a small thread-safe key/value store with least-recently-used
+eviction by total byte size. ResponseCache builds on it to store raw LLM
+completions keyed by a hash of the request (provider, model, messages,
+temperature, max_tokens), so re-running an analysis never re-bills the API.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+
+class SQLiteLRUCache:
+    """Thread-safe on-disk key/value cache with LRU eviction by total size"""
+
+    def __init__(self, path: str, max_bytes: int, enabled: bool = True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored value (refreshing its LRU position) or None"""
+        if not self.enabled:
+            return None
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: bytes) -> None:
+        """Store value under key, evicting least-recently-used entries over max_bytes"""
+        if not self.enabled:
+            return
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self.total_bytes += size - (old[0] if old else 0)
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes:
+            rows = self.conn.execute(
+                "SELECT key, size FROM entries ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self.total_bytes = 0
+                return
+            for key, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.total_bytes -= size
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            row = self.conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.conn.commit()
+                self.total_bytes -= row[0]
+
+    def clear(self) -> None:
+        """Remove every entry and reset statistics"""
+        with self.lock:
+            self.conn.execute("DELETE FROM entries")
+            self.conn.commit()
+            self.total_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current size"""
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+class CachedResponse(str):
+    """Completion text served from the cache, so callers know not to store it again"""
+
+class ResponseCache(SQLiteLRUCache):
+    """Cache of raw LLM completions keyed by the full request"""
+
+    @staticmethod
+    def make_key(provider: str, model: str, messages: List[Dict[str, str]],
+                 temperature: float, max_tokens: int) -> str:
+        request = json.dumps({
+            "provider": provider,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def get_response(self, provider: str, model: str, messages: List[Dict[str, str]],
+                     temperature: float, max_tokens: int) -> Optional[str]:
+        value = self.get(self.make_key(provider, model, messages, temperature, max_tokens))
+        return CachedResponse(value.decode("utf-8")) if value is not None else None
+
+    def put_response(self, provider: str, model: str, messages: List[Dict[str, str]],
+                     temperature: float, max_tokens: int, content: str) -> None:
+        self.put(self.make_key(provider, model, messages, temperature, max_tokens), content.encode("utf-8"))
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache (LLM_CACHE_PATH, LLM_CACHE_MAX_MB, LLM_CACHE_DISABLED)"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            enabled = os.getenv("LLM_CACHE_DISABLED", "false").lower() not in ("1", "true", "yes")
+            path = os.getenv("LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_responses.sqlite"))
+            _response_cache = ResponseCache(
+                path if enabled else ":memory:",
+                max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "200")) * 1024 * 1024),
+                enabled=enabled
+            )
+        return _response_cache
@@ -58,6 +58,7 @@ class ResultsTable:
                 'Years Experience': years_exp,
                 'Role Fit Summary': role_fit,
                 'Filename': result.filename,
+                'Duplicate Of': getattr(result, 'duplicate_of', ''),
                 'Provider': provider,
                 'Analysis Time': f"{analysis_time:.2f}s"
             }
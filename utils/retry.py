@@ -0,0 +1,132 @@
+"""
+Typed provider errors and a shared retry policy for AI provider calls
+
+Transient failures (429, 5xx, timeouts, dropped connections, malformed
+bodies) are retried with capped exponential backoff and full jitter, and a
+server-supplied Retry-After always takes precedence over the computed delay.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class ProviderError(Exception):
+    """Base class for failures raised by the provider clients"""
+    retryable = False
+
+    def __init__(self, message: str, provider: str = "", status_code: int = None, retry_after: float = None):
+        super().__init__(message)
+        self.provider = provider
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+class RateLimitError(ProviderError):
+    """HTTP 429 - the provider asked us to slow down"""
+    retryable = True
+
+class ProviderServerError(ProviderError):
+    """HTTP 5xx from the provider"""
+    retryable = True
+
+class ProviderTimeoutError(ProviderError):
+    """The request timed out"""
+    retryable = True
+
+class ProviderConnectionError(ProviderError):
+    """The connection could not be established or was dropped"""
+    retryable = True
+
+class MalformedResponseError(ProviderError):
+    """The provider answered 2xx with a body we could not read"""
+    retryable = True
+
+class ProviderRequestError(ProviderError):
+    """Non-retryable client error (bad key, bad request, ...)"""
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def error_for_status(status_code: int, message: str, provider: str, retry_after: Optional[str] = None) -> ProviderError:
+    """Map an HTTP status code onto the matching ProviderError subclass"""
+    delay = parse_retry_after(retry_after)
+    if status_code == 429:
+        return RateLimitError(message, provider, status_code, delay)
+    if status_code >= 500:
+        return ProviderServerError(message, provider, status_code, delay)
+    return ProviderRequestError(message, provider, status_code)
+
+@dataclass
+class RetryPolicy:
+    """Capped exponential backoff with full jitter"""
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    max_retry_after: float = 120.0
+
+    def delay_for(self, attempt: int, error: ProviderError) -> float:
+        """Seconds to wait before retry number `attempt` (1-based)"""
+        if error.retry_after is not None:
+            return min(error.retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def _should_retry(self, attempt: int, error: Exception) -> bool:
+        return isinstance(error, ProviderError) and error.retryable and attempt < self.max_attempts
+
+    def _log_retry(self, attempt: int, error: ProviderError, delay: float) -> None:
+        logger.warning(f"⚠️ {error.provider or 'Provider'} {type(error).__name__}: {str(error)} - "
+                       f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_attempts})")
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call fn, retrying transient provider errors"""
+        attempt = 1
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                delay = self.delay_for(attempt, e)
+                self._log_retry(attempt, e, delay)
+                time.sleep(delay)
+                attempt += 1
+
+    async def acall(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs), retrying transient provider errors"""
+        attempt = 1
+        while True:
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                delay = self.delay_for(attempt, e)
+                self._log_retry(attempt, e, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+# Shared by the Euriai and Groq clients
+DEFAULT_RETRY_POLICY = RetryPolicy(
+    max_attempts=int(os.getenv("PROVIDER_MAX_ATTEMPTS", "4")),
+    base_delay=float(os.getenv("PROVIDER_RETRY_BASE_DELAY", "1.0")),
+    max_delay=float(os.getenv("PROVIDER_RETRY_MAX_DELAY", "30.0"))
+)